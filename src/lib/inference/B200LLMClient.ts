@@ -15,6 +15,10 @@ export interface B200InferenceRequest {
   stream?: boolean;
   executive_role: string;
   request_id?: string;
+  cache?: boolean; // Unset: reuse answers only to temperature 0 requests, not the 0.7 default; true: opt in; false: bypass
+  priority?: 'live' | 'normal' | 'batch'; // live (voice, interactive) is admitted ahead of queued work
+  conversation_id?: string; // Keeps a conversation's turns on one replica, whose prefix cache holds the history
+  deadline_ms?: number; // Answer needed within this long; generation stops there and the partial text is returned
 }
 
 export interface B200InferenceResponse {
@@ -26,6 +30,51 @@ export interface B200InferenceResponse {
   tokens_per_second: number;
   gpu_utilization: Record<string, number>;
   memory_usage_gb: number;
+  cached: boolean;
+  queue_time_ms: number; // Waiting for an engine slot; inference_time_ms is engine time only
+  replica: string | null; // Engine replica that generated the text; null when served from cache
+  truncated: boolean; // Cut off at deadline_ms
+}
+
+export interface B200BatchItemResult {
+  index: number;
+  status_code: number;
+  response: B200InferenceResponse | null;
+  error: string | null;
+}
+
+export interface B200BatchResponse {
+  results: B200BatchItemResult[];
+  succeeded: number;
+  failed: number;
+  batch_time_ms: number;
+}
+
+export interface B200StreamDelta {
+  request_id: string;
+  delta: string;
+  tokens_generated: number;
+}
+
+export interface B200StreamSummary {
+  request_id: string;
+  executive_role: string;
+  finish_reason: string | null;
+  usage: {
+    prompt_tokens: number;
+    completion_tokens: number;
+    total_tokens: number;
+  };
+  tokens_generated: number;
+  time_to_first_token_ms: number | null;
+  inference_time_ms: number;
+  tokens_per_second: number;
+  gpu_utilization: Record<string, number>;
+  memory_usage_gb: number;
+  cached: boolean;
+  queue_time_ms: number; // Waiting for an engine slot; inference_time_ms is engine time only
+  replica: string | null; // Engine replica that generated the text; null when served from cache
+  truncated: boolean; // Cut off at deadline_ms
 }
 
 export interface B200ModelInfo {
@@ -58,9 +107,19 @@ export class B200LLMClient {
   private connectionRetries: number = 0;
   private maxRetries: number = 5;
   private retryDelay: number = 2000; // 2 seconds
+  private apiKey?: string; // Identifies this tenant for the server's token-rate quotas
 
-  constructor(vllmServerUrl: string = 'http://localhost:8001') {
+  constructor(vllmServerUrl: string = 'http://localhost:8001', apiKey?: string) {
     this.vllmServerUrl = vllmServerUrl;
+    this.apiKey = apiKey;
+  }
+
+  private requestHeaders(extra: Record<string, string> = {}): Record<string, string> {
+    return {
+      'Content-Type': 'application/json',
+      ...(this.apiKey ? { 'X-API-Key': this.apiKey } : {}),
+      ...extra,
+    };
   }
 
   /**
@@ -97,20 +156,22 @@ export class B200LLMClient {
       
       const response = await fetch(`${this.vllmServerUrl}/v1/completions`, {
         method: 'POST',
-        headers: {
-          'Content-Type': 'application/json',
-        },
+        headers: this.requestHeaders(),
         body: JSON.stringify({
           prompt: request.prompt,
           max_tokens: request.max_tokens || 1024,
-          temperature: request.temperature || 0.7,
+          temperature: request.temperature ?? 0.7,
           top_p: request.top_p || 0.9,
           top_k: request.top_k || 50,
           repetition_penalty: request.repetition_penalty || 1.1,
           stop_sequences: request.stop_sequences || [],
-          stream: request.stream || false,
+          stream: false,
           executive_role: request.executive_role,
-          request_id: request.request_id
+          request_id: request.request_id,
+          cache: request.cache,
+          priority: request.priority,
+          conversation_id: request.conversation_id,
+          deadline_ms: request.deadline_ms
         })
       });
 
@@ -131,6 +192,136 @@ export class B200LLMClient {
     }
   }
 
+  /**
+   * Generate several completions in one call; results come back in request order
+   * and a failed item carries its own status_code and error
+   */
+  public async generateBatch(requests: B200InferenceRequest[]): Promise<B200BatchResponse> {
+    if (!this.isConnected) {
+      throw new Error('B200 LLM Client not connected');
+    }
+
+    const response = await fetch(`${this.vllmServerUrl}/v1/completions/batch`, {
+      method: 'POST',
+      headers: this.requestHeaders(),
+      body: JSON.stringify({
+        requests: requests.map(request => ({
+          prompt: request.prompt,
+          max_tokens: request.max_tokens || 1024,
+          temperature: request.temperature ?? 0.7,
+          top_p: request.top_p || 0.9,
+          top_k: request.top_k || 50,
+          repetition_penalty: request.repetition_penalty || 1.1,
+          stop_sequences: request.stop_sequences || [],
+          executive_role: request.executive_role,
+          request_id: request.request_id,
+          cache: request.cache,
+          priority: request.priority,
+          conversation_id: request.conversation_id,
+          deadline_ms: request.deadline_ms
+        }))
+      })
+    });
+
+    if (!response.ok) {
+      throw new Error(`VLLM server error: ${response.status} ${response.statusText}`);
+    }
+
+    const result: B200BatchResponse = await response.json();
+    console.log(`✅ Batch of ${requests.length}: ${result.succeeded} succeeded, ${result.failed} failed in ${result.batch_time_ms.toFixed(0)}ms`);
+    return result;
+  }
+
+  /**
+   * Stream a completion as it is generated: yields text deltas, returns the usage summary
+   */
+  public async *streamCompletion(request: B200InferenceRequest): AsyncGenerator<B200StreamDelta, B200StreamSummary> {
+    if (!this.isConnected) {
+      throw new Error('B200 LLM Client not connected');
+    }
+
+    const response = await fetch(`${this.vllmServerUrl}/v1/completions`, {
+      method: 'POST',
+      headers: this.requestHeaders({ 'Accept': 'text/event-stream' }),
+      body: JSON.stringify({
+        prompt: request.prompt,
+        max_tokens: request.max_tokens || 1024,
+        temperature: request.temperature ?? 0.7,
+        top_p: request.top_p || 0.9,
+        top_k: request.top_k || 50,
+        repetition_penalty: request.repetition_penalty || 1.1,
+        stop_sequences: request.stop_sequences || [],
+        stream: true,
+        executive_role: request.executive_role,
+        request_id: request.request_id,
+        cache: request.cache,
+        priority: request.priority,
+        conversation_id: request.conversation_id,
+        deadline_ms: request.deadline_ms
+      })
+    });
+
+    if (!response.ok || !response.body) {
+      throw new Error(`VLLM server error: ${response.status} ${response.statusText}`);
+    }
+
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+    let summary: B200StreamSummary | null = null;
+
+    // Cancelling closes the HTTP body, which the server sees as a disconnect and aborts the generation:
+    // needed when the caller stops iterating early or an error frame is thrown
+    try {
+      while (true) {
+        const { done, value } = await reader.read();
+        if (done) {
+          break;
+        }
+        buffer += decoder.decode(value, { stream: true });
+
+        // Frames are separated by a blank line
+        let boundary: number;
+        while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+          const frame = buffer.slice(0, boundary);
+          buffer = buffer.slice(boundary + 2);
+
+          let event = 'message';
+          const data: string[] = [];
+          for (const line of frame.split('\n')) {
+            if (line.startsWith('event:')) {
+              event = line.slice(6).trim();
+            } else if (line.startsWith('data:')) {
+              data.push(line.slice(5).trim());
+            }
+          }
+          const payload = data.join('\n');
+
+          if (event === 'error') {
+            throw new Error(`VLLM stream error: ${JSON.parse(payload).detail}`);
+          }
+          if (payload === '[DONE]') {
+            if (!summary) {
+              throw new Error('VLLM stream ended without a usage summary');
+            }
+            return summary;
+          }
+
+          const parsed = JSON.parse(payload);
+          if ('usage' in parsed) {
+            summary = parsed as B200StreamSummary;
+          } else {
+            yield parsed as B200StreamDelta;
+          }
+        }
+      }
+
+      throw new Error('VLLM stream closed before completion');
+    } finally {
+      reader.cancel().catch(() => {});
+    }
+  }
+
   /**
    * Generate financial analysis using CFO-optimized prompts
    */
@@ -9,24 +9,51 @@ import asyncio
 import json
 import logging
 import os
+import sys
 import time
-from typing import Dict, List, Optional, Any, Union
+import uuid
+from typing import TYPE_CHECKING, AsyncIterator, Dict, List, Literal, Optional, Any, Union
 from dataclasses import dataclass
 from datetime import datetime
+from pathlib import Path
 
 import uvicorn
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field, ValidationError
 
-# VLLM imports for B200 optimization - PRODUCTION ONLY
-# This server requires VLLM to be installed - no fallbacks, no stubs
-from vllm import AsyncLLMEngine, AsyncEngineArgs, SamplingParams
+# VLLM for B200 optimization - PRODUCTION ONLY, no fallbacks, no stubs
+# Imported when real engines start, so --simulate runs on machines without vLLM
+if TYPE_CHECKING:
+    from vllm import SamplingParams
+
+from admission import AdmissionQueue, AdmissionRejected
+from quotas import QuotaExceeded, QuotaManager
+from replicas import Replica, ReplicaPool, pinned_to_gpus
+from response_cache import ResponseCache, completion_cache_key, is_deterministic
+from role_prefixes import RolePrefixRegistry
+from routing import ModelState, RouteDecision, RoutingTable
+from single_flight import SingleFlight
+from token_counter import PromptTokenCounter
+
+# Live GPU telemetry published by the SOVREN MCP server (optional)
+sys.path.append(str(Path(__file__).resolve().parents[2] / "mcp"))
+try:
+    from telemetry_shm import TelemetryReader
+except ImportError:
+    TelemetryReader = None
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# How often a non-streaming request checks whether its client is still connected
+DISCONNECT_POLL_SECONDS = 0.25
+
+# nginx's status for a request the client abandoned; never reaches the client
+STATUS_CLIENT_CLOSED_REQUEST = 499
+
 @dataclass
 class B200ModelConfig:
     """B200 Blackwell optimized model configuration"""
@@ -41,19 +68,25 @@ class B200ModelConfig:
     max_num_seqs: int
     max_num_batched_tokens: int
     enable_chunked_prefill: bool
+    enable_prefix_caching: bool  # Reuse KV blocks of shared prompt prefixes (role personas)
 
 class InferenceRequest(BaseModel):
     """Inference request model"""
     prompt: str
-    max_tokens: int = 1024
-    temperature: float = 0.7
-    top_p: float = 0.9
-    top_k: int = 50
-    repetition_penalty: float = 1.1
+    max_tokens: int = Field(1024, ge=1)
+    temperature: float = Field(0.7, ge=0.0, le=2.0)
+    top_p: float = Field(0.9, gt=0.0, le=1.0)
+    top_k: int = Field(50, ge=-1)  # -1 disables top-k
+    repetition_penalty: float = Field(1.1, gt=0.0)
     stop_sequences: List[str] = []
     stream: bool = False
     executive_role: str = "unknown"
     request_id: Optional[str] = None
+    cache: Optional[bool] = None  # None: reuse answers only at temperature 0, so not at the 0.7 default; True: opt in; False: bypass
+    role_prefix: bool = True  # Prepend the executive role's canonical prefix unless the prompt starts with it
+    priority: Literal["live", "normal", "batch"] = "normal"  # live: voice calls and interactive UI
+    conversation_id: Optional[str] = None  # Turns of a conversation share a replica and its prefix cache
+    deadline_ms: Optional[float] = Field(None, gt=0)  # Answer needed within this long; the text so far is returned at the deadline
 
 class InferenceResponse(BaseModel):
     """Inference response model"""
@@ -65,20 +98,89 @@ class InferenceResponse(BaseModel):
     tokens_per_second: float
     gpu_utilization: Dict[str, float]
     memory_usage_gb: float
+    cached: bool = False
+    queue_time_ms: float = 0.0  # Waiting for an engine slot; inference_time_ms excludes it
+    replica: Optional[str] = None  # Engine replica that generated the text; None when served from cache
+    truncated: bool = False  # Generation was cut off at deadline_ms
+
+class BatchInferenceRequest(BaseModel):
+    """Inference requests submitted together, e.g. one question to every executive"""
+    requests: List[Dict[str, Any]]  # InferenceRequest each, validated per item so a bad one fails alone
+    stream: bool = False  # Emit each result as it finishes rather than all at the end
+
+class BatchItemResult(BaseModel):
+    """Outcome of one batch item; a failed item does not fail the batch"""
+    index: int
+    status_code: int
+    response: Optional[InferenceResponse] = None
+    error: Optional[str] = None
+
+class BatchInferenceResponse(BaseModel):
+    """Batch results in request order"""
+    results: List[BatchItemResult]
+    succeeded: int
+    failed: int
+    batch_time_ms: float
 
 class B200VLLMInferenceServer:
     """Production VLLM inference server optimized for B200 Blackwell GPUs"""
     
     def __init__(self):
         self.app = FastAPI(title="B200 VLLM Inference Server", version="1.0.0")
-        self.engines: Dict[str, Any] = {}  # Can be AsyncLLMEngine or MockAsyncLLMEngine
+        self.replica_pools: Dict[str, ReplicaPool] = {}  # Engines (AsyncLLMEngine or simulated) per model
         self.model_configs: Dict[str, B200ModelConfig] = {}
         self.request_stats: Dict[str, Any] = {}
         self.is_initialized = False
+        self.engine_backend: Optional[str] = None  # "vllm", or "simulated" under --simulate
+        self.sampling_params_class = None  # vllm.SamplingParams, or its simulated stand-in
         
         # B200 GPU tracking
         self.gpu_allocations: Dict[str, List[int]] = {}
         self.active_requests: Dict[str, InferenceRequest] = {}
+        self.telemetry_reader = None
+        self._telemetry_retry_at = 0.0
+
+        # Abandoned requests are aborted so their sequence slot and KV blocks free at once
+        self.request_timeout_seconds = 300.0
+        self.aborted_requests: Dict[str, int] = {"disconnect": 0, "timeout": 0, "deadline": 0}
+        # Requests whose deadline_ms passed: answered with partial text, or dropped while still queued
+        self.deadline_stats: Dict[str, int] = {"truncated": 0, "expired_in_queue": 0}
+        self._abort_tasks: set = set()
+        self.max_batch_size = 64
+
+        # Exact-match cache of finished completions; None disables it
+        self.response_cache: Optional[ResponseCache] = ResponseCache()
+        # Identical concurrent requests share one generation
+        self.single_flight = SingleFlight()
+
+        # Canonical per-role prompt prefixes, and how much of each prompt the prefix cache served
+        self.role_prefixes = RolePrefixRegistry()
+        self.prefix_cache_stats: Dict[str, Dict[str, int]] = {}
+
+        # Engine slots (max_num_seqs per model) are granted by priority and role
+        self.admission_config = {
+            "max_queue_depth": 256,
+            "priority_weights": {"live": 1.0, "normal": 4.0, "batch": 1.0},
+            "role_weights": {}
+        }
+        self.admission: Dict[str, AdmissionQueue] = {}
+        # Token-rate budgets per executive role and API key, checked before a slot is requested
+        self.quotas = QuotaManager()
+        # Which model serves each role, given what is loaded, healthy and backed up
+        self.routing = RoutingTable()
+        # Prompt lengths, measured before admission; estimated until the engines' tokenizer is loaded
+        self.token_counter = PromptTokenCounter()
+
+        # Replicas per model, each on its own slice of the model's GPUs; failed replicas leave the rotation
+        self.replica_counts: Dict[str, int] = {}
+        self.model_gpu_pools: Dict[str, List[int]] = {
+            "qwen2.5-70b-fp8": [0, 1, 2, 3],
+            "qwen2.5-405b-fp8": [4, 5, 6, 7]
+        }
+        self.replica_health_interval_seconds = 10.0
+        self.replica_health_timeout_seconds = 5.0
+        self._replica_monitor: Optional[asyncio.Task] = None
+        self._replica_check: Optional[asyncio.Task] = None
         
         self.setup_routes()
         self.setup_middleware()
@@ -99,93 +201,68 @@ class B200VLLMInferenceServer:
         @self.app.get("/health")
         async def health_check():
             """Health check endpoint"""
+            if not self.is_initialized:
+                status = "initializing"
+            elif all(pool.healthy_replicas for pool in self.replica_pools.values()):
+                status = "healthy"
+            else:
+                status = "degraded"  # Some model has no healthy replica left
             return {
-                "status": "healthy" if self.is_initialized else "initializing",
-                "models_loaded": list(self.engines.keys()),
-                "vllm_available": True,  # Always true since VLLM is required
+                "status": status,
+                "models_loaded": list(self.replica_pools.keys()),
+                "replicas": {
+                    model_name: {"healthy": len(pool.healthy_replicas), "total": len(pool.replicas)}
+                    for model_name, pool in self.replica_pools.items()
+                },
+                "vllm_available": self.engine_backend == "vllm",
+                "engine_backend": self.engine_backend,
                 "gpu_count": len(self.gpu_allocations),
                 "timestamp": datetime.now().isoformat()
             }
         
         @self.app.post("/v1/completions", response_model=InferenceResponse)
-        async def generate_completion(request: InferenceRequest):
+        async def generate_completion(request: InferenceRequest, http_request: Request):
             """Generate text completion using VLLM"""
             if not self.is_initialized:
                 raise HTTPException(status_code=503, detail="Server not initialized")
             
             start_time = time.time()
-            request_id = request.request_id or f"req_{int(time.time() * 1000)}"
+            request_id = request.request_id or f"req_{uuid.uuid4().hex}"
             
-            try:
-                # Select appropriate model based on executive role
-                model_name = self.select_model_for_executive(request.executive_role)
-                engine = self.engines.get(model_name)
-                
-                if not engine:
-                    raise HTTPException(status_code=404, detail=f"Model {model_name} not available")
-                
-                # Track active request
-                self.active_requests[request_id] = request
-                
-                # Configure sampling parameters
-                sampling_params = SamplingParams(
-                    temperature=request.temperature,
-                    top_p=request.top_p,
-                    top_k=request.top_k,
-                    max_tokens=request.max_tokens,
-                    repetition_penalty=request.repetition_penalty,
-                    stop=request.stop_sequences if request.stop_sequences else None
-                )
-                
-                # Generate completion
-                logger.info(f"🧠 Generating completion for {request.executive_role} using {model_name}")
-                
-                results = await engine.generate(
-                    request.prompt,
-                    sampling_params,
-                    request_id=request_id
+            return await self.run_completion(request, request_id, http_request, start_time)
+        
+        @self.app.post("/v1/completions/batch", response_model=BatchInferenceResponse)
+        async def generate_batch(batch: BatchInferenceRequest, http_request: Request):
+            """Generate many completions concurrently so vLLM's continuous batching can merge them"""
+            if not self.is_initialized:
+                raise HTTPException(status_code=503, detail="Server not initialized")
+            if not batch.requests:
+                raise HTTPException(status_code=400, detail="Batch contains no requests")
+            if len(batch.requests) > self.max_batch_size:
+                raise HTTPException(
+                    status_code=413,
+                    detail=f"Batch of {len(batch.requests)} exceeds the limit of {self.max_batch_size} requests"
                 )
-                
-                # Process results
-                if results:
-                    output = results[0].outputs[0]
-                    generated_text = output.text
-                    tokens_generated = len(output.token_ids)
-                else:
-                    generated_text = ""
-                    tokens_generated = 0
-                
-                # Calculate metrics
-                inference_time_ms = (time.time() - start_time) * 1000
-                tokens_per_second = tokens_generated / (inference_time_ms / 1000) if inference_time_ms > 0 else 0
-                
-                # Get GPU utilization (placeholder - would integrate with nvidia-ml-py)
-                gpu_utilization = await self.get_gpu_utilization(model_name)
-                memory_usage = await self.get_memory_usage(model_name)
-                
-                # Clean up
-                self.active_requests.pop(request_id, None)
-                
-                # Update stats
-                self.update_request_stats(request.executive_role, inference_time_ms, tokens_generated)
-                
-                logger.info(f"✅ Completed {request.executive_role} inference: {tokens_generated} tokens in {inference_time_ms:.1f}ms ({tokens_per_second:.1f} tok/s)")
-                
-                return InferenceResponse(
-                    text=generated_text,
-                    request_id=request_id,
-                    executive_role=request.executive_role,
-                    tokens_generated=tokens_generated,
-                    inference_time_ms=inference_time_ms,
-                    tokens_per_second=tokens_per_second,
-                    gpu_utilization=gpu_utilization,
-                    memory_usage_gb=memory_usage
+            
+            request_ids = [item.get("request_id") or f"req_{uuid.uuid4().hex}" for item in batch.requests]
+            if len({str(request_id) for request_id in request_ids}) != len(request_ids):
+                raise HTTPException(status_code=400, detail="Batch request_ids must be unique")
+            
+            start_time = time.time()
+            items = [
+                self.run_batch_item(index, item, request_id, http_request)
+                for index, (item, request_id) in enumerate(zip(batch.requests, request_ids))
+            ]
+            
+            if batch.stream:
+                return StreamingResponse(
+                    self.stream_batch(items, start_time),
+                    media_type="text/event-stream",
+                    headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
                 )
-                
-            except Exception as e:
-                self.active_requests.pop(request_id, None)
-                logger.error(f"❌ Inference failed for {request.executive_role}: {e}")
-                raise HTTPException(status_code=500, detail=str(e))
+            
+            results = await asyncio.gather(*items)
+            return self.summarize_batch(results, start_time)
         
         @self.app.get("/v1/models")
         async def list_models():
@@ -198,10 +275,15 @@ class B200VLLMInferenceServer:
                             "tensor_parallel_size": config.tensor_parallel_size,
                             "quantization": config.quantization,
                             "max_model_len": config.max_model_len,
+                            "enable_prefix_caching": config.enable_prefix_caching,
                             "gpu_memory_utilization": config.gpu_memory_utilization
                         },
                         "gpu_allocation": self.gpu_allocations.get(model_name, []),
-                        "status": "loaded" if model_name in self.engines else "not_loaded"
+                        "replicas": [
+                            {"name": replica.name, "gpu_ids": replica.gpu_ids, "healthy": replica.healthy}
+                            for replica in self.replica_pools[model_name].replicas
+                        ] if model_name in self.replica_pools else [],
+                        "status": "loaded" if model_name in self.replica_pools else "not_loaded"
                     }
                     for model_name, config in self.model_configs.items()
                 ]
@@ -213,14 +295,578 @@ class B200VLLMInferenceServer:
             return {
                 "request_stats": self.request_stats,
                 "active_requests": len(self.active_requests),
-                "models_loaded": len(self.engines),
+                "aborted_requests": self.aborted_requests,
+                "deadlines": self.deadline_stats,
+                "response_cache": self.response_cache.get_stats() if self.response_cache else None,
+                "single_flight": self.single_flight.get_stats(),
+                "prefix_cache": self.get_prefix_cache_stats(),
+                "admission": {model_name: queue.get_stats() for model_name, queue in self.admission.items()},
+                "quotas": self.quotas.get_stats(),
+                "routing": self.routing.get_stats(),
+                "token_counter": self.token_counter.get_stats(),
+                "replicas": {model_name: pool.get_stats() for model_name, pool in self.replica_pools.items()},
+                "models_loaded": len(self.replica_pools),
                 "gpu_allocations": self.gpu_allocations
             }
     
-    async def initialize_models(self):
-        """Initialize VLLM models with B200 optimization"""
+    async def run_completion(self, request: InferenceRequest, request_id: str, http_request: Request,
+                             start_time: float, log_level: int = logging.INFO):
+        """Run one completion to an InferenceResponse, or a StreamingResponse when request.stream
+
+        Failures surface as HTTPException, so batch items can report them individually.
+        """
+        # Past the deadline the answer is no use: generation stops and returns what it has
+        answer_by = time.monotonic() + request.deadline_ms / 1000 if request.deadline_ms is not None else None
+        try:
+            # Byte-identical role prefixes let the engine's prefix cache skip their prefill
+            if request.role_prefix:
+                request = request.model_copy(
+                    update={"prompt": self.role_prefixes.apply(request.executive_role, request.prompt)}
+                )
+
+            # Select appropriate model based on executive role, context length and live load
+            prompt_tokens = await self.token_counter.count(request.prompt)
+            decision = self.select_model_for_executive(request.executive_role, prompt_tokens, request.max_tokens)
+            if decision is None:
+                longest = self.routing.longest_context(request.executive_role, self.model_state)
+                if longest is not None:
+                    raise HTTPException(status_code=400,
+                                        detail=f"Prompt is {prompt_tokens} tokens; the longest context available "
+                                               f"to {request.executive_role} is {longest} tokens")
+                raise HTTPException(status_code=503,
+                                    detail=f"No model available for {request.executive_role} requests")
+            model_name = decision.model
+            pool = self.replica_pools[model_name]
+
+            # Only the prompt fits in full: generate what the rest of the context holds
+            if prompt_tokens + request.max_tokens > decision.max_context_tokens:
+                max_tokens = decision.max_context_tokens - prompt_tokens
+                logger.info(f"✂️ Clamped {request.executive_role} max_tokens {request.max_tokens} -> {max_tokens} "
+                            f"to fit a {prompt_tokens}-token prompt in {model_name}'s context")
+                request = request.model_copy(update={"max_tokens": max_tokens})
+
+            # Repeat of a cacheable request: answer without touching the GPU
+            cache_key = self.completion_key(model_name, request)
+            if cache_key is not None and self.response_cache is not None:
+                cached = self.response_cache.get(cache_key)
+                if cached is not None:
+                    return self.cached_response(cached, request, request_id, start_time)
+
+            # Track active request
+            self.active_requests[request_id] = request
+
+            # Configure sampling parameters
+            sampling_params = self.sampling_params_class(
+                temperature=request.temperature,
+                top_p=request.top_p,
+                top_k=request.top_k,
+                max_tokens=request.max_tokens,
+                repetition_penalty=request.repetition_penalty,
+                stop=request.stop_sequences if request.stop_sequences else None
+            )
+
+            # Wait for quota and an engine slot (or an identical generation to join); the timeout covers both
+            deadline = time.monotonic() + self.request_timeout_seconds
+            flight, queue_time_ms = await self.admit_watched(
+                model_name, cache_key, pool, request, sampling_params, request_id, http_request, deadline,
+                prompt_tokens, api_key_from(http_request), answer_by
+            )
+            engine_start_time = time.time()
+
+            # Stream token deltas as Server-Sent Events when asked to
+            if request.stream:
+                logger.info(f"🧠 Streaming completion for {request.executive_role} using {model_name}")
+                return StreamingResponse(
+                    self.stream_completion(flight, model_name, request, request_id, engine_start_time,
+                                           queue_time_ms, deadline, cache_key, answer_by),
+                    media_type="text/event-stream",
+                    headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+                )
+
+            # Generate completion
+            logger.log(log_level, f"🧠 Generating completion for {request.executive_role} using {model_name}")
+
+            final_output, truncated = await self.collect_final_output(flight, request_id, http_request, deadline,
+                                                                      answer_by)
+
+            # Process results
+            if final_output is not None:
+                if flight.request_id == request_id:
+                    self.record_prefix_cache(model_name, final_output)
+                output = final_output.outputs[0]
+                generated_text = output.text
+                tokens_generated = len(output.token_ids)
+                if cache_key is not None and self.response_cache is not None and output.finish_reason is not None:
+                    self.response_cache.put(cache_key, generated_text, tokens_generated,
+                                            len(final_output.prompt_token_ids or []), output.finish_reason)
+            else:
+                generated_text = ""
+                tokens_generated = 0
+
+            # Calculate metrics
+            inference_time_ms = (time.time() - engine_start_time) * 1000
+            tokens_per_second = tokens_generated / (inference_time_ms / 1000) if inference_time_ms > 0 else 0
+
+            # Get live GPU utilization from the MCP telemetry segment
+            gpu_utilization = await self.get_gpu_utilization(model_name)
+            memory_usage = await self.get_memory_usage(model_name)
+
+            # Clean up
+            self.active_requests.pop(request_id, None)
+
+            # Update stats
+            self.update_request_stats(request.executive_role, inference_time_ms, tokens_generated, queue_time_ms)
+
+            logger.log(log_level, f"✅ Completed {request.executive_role} inference: {tokens_generated} tokens in {inference_time_ms:.1f}ms ({tokens_per_second:.1f} tok/s, queued {queue_time_ms:.1f}ms)"
+                                  f"{', truncated at deadline' if truncated else ''}")
+
+            return InferenceResponse(
+                text=generated_text,
+                request_id=request_id,
+                executive_role=request.executive_role,
+                tokens_generated=tokens_generated,
+                inference_time_ms=inference_time_ms,
+                tokens_per_second=tokens_per_second,
+                gpu_utilization=gpu_utilization,
+                memory_usage_gb=memory_usage,
+                queue_time_ms=queue_time_ms,
+                replica=pool.replica_for(flight.engine),
+                truncated=truncated
+            )
+
+        except HTTPException:
+            self.active_requests.pop(request_id, None)
+            raise
+        except ValueError as e:
+            # vLLM rejects requests it cannot run (bad sampling parameters, too long a context) with ValueError
+            self.active_requests.pop(request_id, None)
+            logger.warning(f"⚠️ Rejected {request.executive_role} request: {e}")
+            raise HTTPException(status_code=400, detail=str(e))
+        except Exception as e:
+            self.active_requests.pop(request_id, None)
+            logger.error(f"❌ Inference failed for {request.executive_role}: {e}")
+            raise HTTPException(status_code=500, detail=str(e))
+
+    def completion_key(self, model_name: str, request: InferenceRequest) -> Optional[str]:
+        """Key under which identical requests share an answer, or None when this one must be generated afresh
+
+        Used for both the response cache and single-flight coalescing.
+        """
+        if request.cache is False:
+            return None
+        if request.cache is None and not is_deterministic(request.temperature):
+            return None
+        return completion_cache_key(
+            model_name, request.prompt, request.temperature, request.top_p, request.top_k,
+            request.max_tokens, request.repetition_penalty, request.stop_sequences
+        )
+
+    def cached_response(self, cached, request: InferenceRequest, request_id: str, start_time: float):
+        """Answer from the response cache, in the shape the request asked for"""
+        if request.stream:
+            return StreamingResponse(
+                self.stream_cached(cached, request, request_id, start_time),
+                media_type="text/event-stream",
+                headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+            )
+        return InferenceResponse(
+            text=cached.text,
+            request_id=request_id,
+            executive_role=request.executive_role,
+            tokens_generated=cached.tokens_generated,
+            inference_time_ms=(time.time() - start_time) * 1000,
+            tokens_per_second=0.0,
+            gpu_utilization={},
+            memory_usage_gb=0.0,
+            cached=True
+        )
+
+    async def stream_cached(self, cached, request: InferenceRequest, request_id: str,
+                            start_time: float) -> AsyncIterator[bytes]:
+        """A cached completion as a stream: the whole text in one delta, then usage and [DONE]"""
+        if cached.text:
+            yield sse_frame({"request_id": request_id, "delta": cached.text, "tokens_generated": cached.tokens_generated})
+        elapsed_ms = (time.time() - start_time) * 1000
+        yield sse_frame({
+            "request_id": request_id,
+            "executive_role": request.executive_role,
+            "finish_reason": cached.finish_reason,
+            "usage": {
+                "prompt_tokens": cached.prompt_tokens,
+                "completion_tokens": cached.tokens_generated,
+                "total_tokens": cached.prompt_tokens + cached.tokens_generated
+            },
+            "tokens_generated": cached.tokens_generated,
+            "time_to_first_token_ms": elapsed_ms,
+            "inference_time_ms": elapsed_ms,
+            "tokens_per_second": 0.0,
+            "gpu_utilization": {},
+            "memory_usage_gb": 0.0,
+            "cached": True,
+            "queue_time_ms": 0.0,
+            "replica": None,
+            "truncated": False
+        })
+        yield b"data: [DONE]\n\n"
+
+    async def run_batch_item(self, index: int, item: Dict[str, Any], request_id: str,
+                             http_request: Request) -> BatchItemResult:
+        """One batch item run as an ordinary completion, its failure captured rather than raised"""
+        try:
+            request = InferenceRequest.model_validate({**item, "stream": False, "request_id": request_id})
+        except ValidationError as e:
+            return BatchItemResult(index=index, status_code=422, error=validation_detail(e))
+        try:
+            response = await self.run_completion(request, request_id, http_request, time.time(),
+                                                 log_level=logging.DEBUG)
+            return BatchItemResult(index=index, status_code=200, response=response)
+        except HTTPException as e:
+            return BatchItemResult(index=index, status_code=e.status_code, error=str(e.detail))
+
+    def summarize_batch(self, results: List[BatchItemResult], start_time: float) -> BatchInferenceResponse:
+        results = sorted(results, key=lambda result: result.index)
+        succeeded = sum(1 for result in results if result.status_code == 200)
+        batch_time_ms = (time.time() - start_time) * 1000
+        logger.info(f"📦 Completed batch of {len(results)}: {succeeded} succeeded, "
+                    f"{len(results) - succeeded} failed in {batch_time_ms:.1f}ms")
+        return BatchInferenceResponse(
+            results=results,
+            succeeded=succeeded,
+            failed=len(results) - succeeded,
+            batch_time_ms=batch_time_ms
+        )
+
+    async def stream_batch(self, items: List[Any], start_time: float) -> AsyncIterator[bytes]:
+        """SSE frames: one BatchItemResult per item as it finishes, then a summary and [DONE]"""
+        tasks = [asyncio.ensure_future(item) for item in items]
+        results = []
+        try:
+            for next_result in asyncio.as_completed(tasks):
+                result = await next_result
+                results.append(result)
+                yield sse_frame(result.model_dump())
+            summary = self.summarize_batch(results, start_time)
+            yield sse_frame({
+                "succeeded": summary.succeeded,
+                "failed": summary.failed,
+                "batch_time_ms": summary.batch_time_ms
+            })
+            yield b"data: [DONE]\n\n"
+        finally:
+            # A client that hangs up abandons the whole batch; cancelling aborts each item
+            for task in tasks:
+                task.cancel()
+
+    async def stream_completion(self, flight, model_name: str, request: InferenceRequest, request_id: str,
+                                start_time: float, queue_time_ms: float, deadline: float,
+                                cache_key: Optional[str] = None,
+                                answer_by: Optional[float] = None) -> AsyncIterator[bytes]:
+        """SSE frames: one per token delta as vLLM produces it, then a usage frame and [DONE]
+
+        vLLM yields cumulative outputs, so each frame carries only the text added
+        since the previous one. At answer_by the stream ends early, its usage
+        frame marked truncated.
+        """
+        text_sent = 0
+        tokens_generated = 0
+        prompt_tokens = 0
+        finish_reason = None
+        first_token_time = None
+        finished = False
+        truncated = False
+        abort_reason = "disconnect"
+        generation = flight.outputs()
+        stop_at = min(deadline, answer_by) if answer_by is not None else deadline
+        try:
+            while True:
+                try:
+                    output = await asyncio.wait_for(
+                        generation.__anext__(), timeout=max(stop_at - time.monotonic(), 0)
+                    )
+                except StopAsyncIteration:
+                    break
+                except asyncio.TimeoutError:
+                    if stop_at == deadline:
+                        raise
+                    truncated = True
+                    abort_reason = "deadline"
+                    self.deadline_stats["truncated"] += 1
+                    break
+                completion = output.outputs[0]
+                delta = completion.text[text_sent:]
+                text_sent = len(completion.text)
+                tokens_generated = len(completion.token_ids)
+                prompt_tokens = len(output.prompt_token_ids or [])
+                finish_reason = completion.finish_reason
+                if delta:
+                    if first_token_time is None:
+                        first_token_time = time.time()
+                    yield sse_frame({
+                        "request_id": request_id,
+                        "delta": delta,
+                        "tokens_generated": tokens_generated
+                    })
+            finished = True
+            if tokens_generated and flight.request_id == request_id:
+                self.record_prefix_cache(model_name, output)
+            if cache_key is not None and self.response_cache is not None and finish_reason is not None:
+                self.response_cache.put(cache_key, completion.text, tokens_generated,
+                                        prompt_tokens, finish_reason)
+
+            inference_time_ms = (time.time() - start_time) * 1000
+            tokens_per_second = tokens_generated / (inference_time_ms / 1000) if inference_time_ms > 0 else 0
+            self.update_request_stats(request.executive_role, inference_time_ms, tokens_generated, queue_time_ms)
+            logger.info(f"✅ Streamed {request.executive_role} inference: {tokens_generated} tokens in "
+                        f"{inference_time_ms:.1f}ms ({tokens_per_second:.1f} tok/s)"
+                        f"{', truncated at deadline' if truncated else ''}")
+
+            yield sse_frame({
+                "request_id": request_id,
+                "executive_role": request.executive_role,
+                "finish_reason": finish_reason,
+                "usage": {
+                    "prompt_tokens": prompt_tokens,
+                    "completion_tokens": tokens_generated,
+                    "total_tokens": prompt_tokens + tokens_generated
+                },
+                "tokens_generated": tokens_generated,
+                "time_to_first_token_ms": (first_token_time - start_time) * 1000 if first_token_time else None,
+                "inference_time_ms": inference_time_ms,
+                "queue_time_ms": queue_time_ms,
+                "replica": self.replica_pools[model_name].replica_for(flight.engine),
+                "tokens_per_second": tokens_per_second,
+                "gpu_utilization": await self.get_gpu_utilization(model_name),
+                "memory_usage_gb": await self.get_memory_usage(model_name),
+                "cached": False,
+                "truncated": truncated
+            })
+            yield b"data: [DONE]\n\n"
+
+        except asyncio.TimeoutError:
+            abort_reason = "timeout"
+            logger.warning(f"⏱️ Streaming inference for {request.executive_role} timed out after "
+                           f"{self.request_timeout_seconds:.0f}s ({request_id})")
+            yield sse_frame({"request_id": request_id, "detail": "Inference timed out"}, event="error")
+        except Exception as e:
+            abort_reason = "error"
+            logger.error(f"❌ Streaming inference failed for {request.executive_role}: {e}")
+            yield sse_frame({"request_id": request_id, "detail": str(e)}, event="error")
+        finally:
+            # Starlette cancels this generator when the client goes away
+            self.leave_flight(flight, abort_reason)
+            self.active_requests.pop(request_id, None)
+
+    def record_prefix_cache(self, model_name: str, output):
+        """Count how many prompt tokens the engine's prefix cache served for one generation"""
+        stats = self.prefix_cache_stats.setdefault(
+            model_name, {"requests": 0, "prompt_tokens": 0, "cached_prompt_tokens": 0}
+        )
+        stats["requests"] += 1
+        stats["prompt_tokens"] += len(output.prompt_token_ids or [])
+        stats["cached_prompt_tokens"] += getattr(output, "num_cached_tokens", None) or 0
+
+    def get_prefix_cache_stats(self) -> Dict[str, Any]:
+        return {
+            "roles_with_prefix": sorted(self.role_prefixes.prefixes),
+            "models": {
+                model_name: {
+                    **stats,
+                    "hit_rate": stats["cached_prompt_tokens"] / stats["prompt_tokens"] if stats["prompt_tokens"] else 0.0
+                }
+                for model_name, stats in self.prefix_cache_stats.items()
+            }
+        }
+
+    def join_flight(self, key: Optional[str], engine, request: InferenceRequest,
+                    sampling_params: "SamplingParams", request_id: str):
+        """Attach to an identical in-flight generation, or start one"""
+        flight = self.single_flight.join(key, engine, request.prompt, sampling_params, request_id)
+        if flight.request_id != request_id:
+            logger.info(f"🔗 Coalesced {request_id} ({request.executive_role}) onto in-flight {flight.request_id}")
+        return flight
+
+    def leave_flight(self, flight, reason: str):
+        """Detach from a flight, aborting its generation if no other request still wants it"""
+        if self.single_flight.leave(flight):
+            self.abort_request(flight.engine, flight.request_id, reason)
+
+    async def admit(self, model_name: str, cache_key: Optional[str], pool: ReplicaPool, request: InferenceRequest,
+                    sampling_params: "SamplingParams", request_id: str, prompt_tokens: int,
+                    api_key: Optional[str] = None, answer_by: Optional[float] = None):
+        """Join an identical in-flight generation, or wait for token quota and an engine slot and start one
+
+        Returns (flight, queue_time_ms), the wait covering both. Only a request
+        that starts a generation is charged quota, takes a slot and is placed on
+        a replica (its conversation's, else the least-loaded); when the
+        generation ends, however it ends, the slot is released and the quota
+        settled to the tokens actually processed. answer_by puts the request
+        ahead of queued work due later.
+        """
+        queue = self.admission.get(model_name)
+        waiting_since = time.monotonic()
+        reservation = None
+        holds_slot = False
+        # Worst case until the engine reports what was used
+        cost = prompt_tokens + request.max_tokens
+        if self.single_flight.running(cache_key) is None:
+            try:
+                reservation = await self.quotas.reserve(request.executive_role, api_key, cost)
+            except QuotaExceeded as e:
+                logger.warning(f"🪣 Rejected {request.executive_role} request over token quota: {e}")
+                raise HTTPException(status_code=429, detail=str(e),
+                                    headers={"Retry-After": str(e.retry_after_seconds)})
+            try:
+                if queue is not None:
+                    await queue.acquire(request.priority, request.executive_role, cost, answer_by)
+                    holds_slot = True
+            except AdmissionRejected as e:
+                reservation.cancel()
+                logger.warning(f"🚦 Rejected {request.priority} {request.executive_role} request: {e}")
+                raise HTTPException(status_code=429, detail=str(e),
+                                    headers={"Retry-After": str(e.retry_after_seconds)})
+            except asyncio.CancelledError:
+                reservation.cancel()
+                raise
+        queue_seconds = time.monotonic() - waiting_since
+
+        replica = pool.pick(request.conversation_id)
+        if replica is None:
+            # Every replica failed while this request waited
+            if holds_slot:
+                queue.release()
+            if reservation is not None:
+                reservation.cancel()
+            raise HTTPException(status_code=503, detail=f"No healthy replica of {model_name}")
+
+        flight = self.join_flight(cache_key, replica.engine, request, sampling_params, request_id)
+        if flight.request_id == request_id:
+            started = time.monotonic()
+            pool.track(replica, request_id, flight, cost)
+
+            def generation_done(task):
+                if holds_slot:
+                    queue.release(time.monotonic() - started)
+                if reservation is not None:
+                    reservation.settle(tokens_processed(flight.latest))
+                if not task.cancelled() and flight.error is not None and not isinstance(flight.error, ValueError):
+                    # A dead engine fails every generation; find out now rather than at the next health check
+                    # (ValueError is the engine rejecting this request, not the engine failing)
+                    replica.suspect = True
+                    self.schedule_replica_check()
+
+            flight.task.add_done_callback(generation_done)
+        else:
+            # An identical request started generating while this one waited
+            if holds_slot:
+                queue.release()
+            if reservation is not None:
+                reservation.cancel()
+        return flight, queue_seconds * 1000
+
+    async def admit_watched(self, model_name: str, cache_key: Optional[str], pool: ReplicaPool,
+                            request: InferenceRequest, sampling_params: "SamplingParams", request_id: str,
+                            http_request: Request, deadline: float, prompt_tokens: int,
+                            api_key: Optional[str] = None, answer_by: Optional[float] = None):
+        """admit(), given up on if the client leaves or the timeout or answer_by passes while queued"""
+        admission = asyncio.ensure_future(
+            self.admit(model_name, cache_key, pool, request, sampling_params, request_id, prompt_tokens, api_key,
+                       answer_by)
+        )
+        missed_deadline = answer_by is not None and answer_by < deadline
+        try:
+            return await self.watch_client(
+                admission, request_id, http_request, answer_by if missed_deadline else deadline,
+                "Deadline passed before generation started" if missed_deadline else "Inference timed out"
+            )
+        except HTTPException as e:
+            reason = "disconnect"
+            if e.status_code == 504:
+                reason = "deadline" if missed_deadline else "timeout"
+            if reason == "deadline":
+                self.deadline_stats["expired_in_queue"] += 1
+            if admission.done() and not admission.cancelled() and admission.exception() is None:
+                # Admitted in the same instant the client gave up
+                self.leave_flight(admission.result()[0], reason)
+            raise
+
+    async def watch_client(self, task: asyncio.Future, request_id: str, http_request: Request, deadline: float,
+                           timeout_detail: str = "Inference timed out"):
+        """Await task, cancelling it with a 504 once the deadline passes or a 499 if the client disconnects"""
+        try:
+            while True:
+                remaining = deadline - time.monotonic()
+                done, _ = await asyncio.wait({task}, timeout=max(min(DISCONNECT_POLL_SECONDS, remaining), 0))
+                if task in done:
+                    return task.result()
+                if remaining <= 0:
+                    raise HTTPException(status_code=504, detail=timeout_detail)
+                if await http_request.is_disconnected():
+                    logger.info(f"🔌 Client disconnected, aborting {request_id}")
+                    raise HTTPException(status_code=STATUS_CLIENT_CLOSED_REQUEST, detail="Client disconnected")
+        finally:
+            if not task.done():
+                task.cancel()
+
+    async def collect_final_output(self, flight, request_id: str, http_request: Request, deadline: float,
+                                   answer_by: Optional[float] = None):
+        """Wait for a flight's final output, leaving it if the client goes away or time runs out
+
+        AsyncLLMEngine.generate is an async generator of cumulative outputs; the
+        last one holds the whole completion. Returns (output, truncated): the
+        output is None if it yields nothing, and at answer_by it is whatever
+        has been generated so far, with truncated set.
+        """
+        async def last_output():
+            final = None
+            async for output in flight.outputs():
+                final = output
+            return final
+
+        abort_reason = "disconnect"
+        stop_at = min(deadline, answer_by) if answer_by is not None else deadline
+        try:
+            return await self.watch_client(asyncio.ensure_future(last_output()), request_id, http_request,
+                                           stop_at), False
+        except HTTPException as e:
+            if e.status_code == 504:
+                if stop_at != deadline:
+                    abort_reason = "deadline"
+                    self.deadline_stats["truncated"] += 1
+                    return flight.latest, True
+                abort_reason = "timeout"
+            raise
+        finally:
+            self.leave_flight(flight, abort_reason)
+
+    def abort_request(self, engine, request_id: str, reason: str):
+        """Tell the engine to drop a request now rather than generate into the void
+
+        Runs as its own task: this is called from code being cancelled, where
+        an await would be cancelled too.
+        """
+        if reason in self.aborted_requests:
+            self.aborted_requests[reason] += 1
+        task = asyncio.get_running_loop().create_task(engine.abort(request_id))
+        self._abort_tasks.add(task)
+        task.add_done_callback(self._abort_tasks.discard)
+
+    async def initialize_models(self, simulate: Optional[Dict[str, Any]] = None):
+        """Initialize VLLM models with B200 optimization
+
+        With simulate, each replica is a scripted SimulatedAsyncLLMEngine (options:
+        script, time_to_first_token_ms, inter_token_ms, fail_replicas) instead of vLLM.
+        """
         logger.info("🚀 Initializing B200-optimized VLLM models...")
         
+        if simulate is None:
+            from vllm import AsyncLLMEngine, AsyncEngineArgs, SamplingParams
+            self.engine_backend = "vllm"
+            self.sampling_params_class = SamplingParams
+        else:
+            from simulated_engine import SimulatedSamplingParams
+            self.engine_backend = "simulated"
+            self.sampling_params_class = SimulatedSamplingParams
+        
         # Define B200-optimized model configurations
         model_configs = {
             "qwen2.5-70b-fp8": B200ModelConfig(
@@ -234,7 +880,8 @@ class B200VLLMInferenceServer:
                 trust_remote_code=True,
                 max_num_seqs=16,
                 max_num_batched_tokens=8192,
-                enable_chunked_prefill=True
+                enable_chunked_prefill=True,
+                enable_prefix_caching=True
             ),
             "qwen2.5-405b-fp8": B200ModelConfig(
                 model_name="qwen2.5-405b-fp8",
@@ -247,16 +894,17 @@ class B200VLLMInferenceServer:
                 trust_remote_code=True,
                 max_num_seqs=8,
                 max_num_batched_tokens=16384,
-                enable_chunked_prefill=True
+                enable_chunked_prefill=True,
+                enable_prefix_caching=True
             )
         }
         
         # Load models
         for model_name, config in model_configs.items():
-            try:
-                logger.info(f"📥 Loading {model_name} with FP8 optimization...")
-                
-                # Configure engine arguments for B200
+            logger.info(f"📥 Loading {model_name} with FP8 optimization...")
+            
+            # Configure engine arguments for B200
+            if simulate is None:
                 engine_args = AsyncEngineArgs(
                     model=config.model_path,
                     tensor_parallel_size=config.tensor_parallel_size,
@@ -268,52 +916,156 @@ class B200VLLMInferenceServer:
                     max_num_seqs=config.max_num_seqs,
                     max_num_batched_tokens=config.max_num_batched_tokens,
                     enable_chunked_prefill=config.enable_chunked_prefill,
+                    enable_prefix_caching=config.enable_prefix_caching,
                     # B200 specific optimizations
                     enforce_eager=False,  # Use CUDA graphs for better performance
                     disable_custom_all_reduce=False,  # Use NVLink for multi-GPU
                 )
-                
-                # Create async engine
-                engine = AsyncLLMEngine.from_engine_args(engine_args)
-                
-                self.engines[model_name] = engine
-                self.model_configs[model_name] = config
-                
-                # Track GPU allocation
-                if config.tensor_parallel_size == 1:
-                    # Single GPU models - assign to specific GPUs
-                    if model_name == "qwen2.5-70b-fp8":
-                        self.gpu_allocations[model_name] = [0]  # CFO on GPU 0
-                else:
-                    # Multi-GPU models
-                    self.gpu_allocations[model_name] = list(range(4, 4 + config.tensor_parallel_size))  # GPUs 4-7 for 405B
-                
-                logger.info(f"✅ {model_name} loaded successfully on GPUs {self.gpu_allocations[model_name]}")
-                
-            except Exception as e:
-                logger.error(f"❌ Failed to load {model_name}: {e}")
+            
+            # Each replica takes the next tensor_parallel_size GPUs of the model's pool
+            gpu_pool = self.model_gpu_pools[model_name]
+            max_replicas = len(gpu_pool) // config.tensor_parallel_size
+            replica_count = self.replica_counts.get(model_name, 1)
+            if replica_count > max_replicas:
+                logger.warning(f"⚠️ {model_name} fits {max_replicas} replicas on GPUs {gpu_pool}, "
+                               f"not {replica_count}")
+                replica_count = max_replicas
+            
+            pool = ReplicaPool(model_name, tokens_processed)
+            for index in range(replica_count):
+                gpu_ids = gpu_pool[index * config.tensor_parallel_size:(index + 1) * config.tensor_parallel_size]
+                replica_name = f"{model_name}/{index}"
+                try:
+                    # Create async engine
+                    if simulate is not None:
+                        engine = create_simulated_engine(replica_name, simulate, config)
+                    else:
+                        with pinned_to_gpus(gpu_ids):
+                            engine = AsyncLLMEngine.from_engine_args(engine_args)
+                    pool.add(Replica(replica_name, model_name, engine, gpu_ids, config.max_num_seqs))
+                    logger.info(f"✅ {replica_name} loaded successfully on GPUs {gpu_ids}")
+                except Exception as e:
+                    logger.error(f"❌ Failed to load {replica_name}: {e}")
+            
+            if not pool.replicas:
                 continue
+            self.replica_pools[model_name] = pool
+            self.model_configs[model_name] = config
+            self.gpu_allocations[model_name] = [gpu_id for replica in pool.replicas for gpu_id in replica.gpu_ids]
+            self.admission[model_name] = AdmissionQueue(
+                model_name,
+                capacity=pool.capacity,
+                max_queue_depth=self.admission_config["max_queue_depth"],
+                priority_weights=self.admission_config["priority_weights"],
+                role_weights=self.admission_config["role_weights"]
+            )
         
-        if not self.engines:
+        if not self.replica_pools:
             raise RuntimeError("No models loaded successfully")
         
+        self.token_counter = PromptTokenCounter(await self.load_tokenizer())
+        
+        if self._replica_monitor is None:
+            self._replica_monitor = asyncio.ensure_future(self.monitor_replicas())
         self.is_initialized = True
-        logger.info(f"🎯 B200 VLLM server initialized with {len(self.engines)} models")
+        logger.info(f"🎯 B200 VLLM server initialized with {len(self.replica_pools)} models")
     
-    def select_model_for_executive(self, executive_role: str) -> str:
-        """Select appropriate model based on executive role"""
-        if executive_role.upper() == "SOVREN-AI":
-            return "qwen2.5-405b-fp8"  # Use 405B for SOVREN-AI
-        else:
-            return "qwen2.5-70b-fp8"   # Use 70B for other executives
+    async def load_tokenizer(self):
+        """The engines' tokenizer, which every Qwen2.5 model here shares; None to estimate token counts"""
+        for pool in self.replica_pools.values():
+            for replica in pool.healthy_replicas:
+                try:
+                    return await replica.engine.get_tokenizer()
+                except Exception as e:
+                    logger.warning(f"⚠️ Could not get the tokenizer from {replica.name}: {e}")
+        logger.warning("⚠️ No tokenizer available, estimating prompt token counts")
+        return None
+    
+    async def monitor_replicas(self):
+        """Health-check every replica periodically for as long as the server runs"""
+        while True:
+            await asyncio.sleep(self.replica_health_interval_seconds)
+            try:
+                await self.check_replicas()
+            except Exception as e:
+                logger.error(f"❌ Replica health check failed: {e}")
+    
+    async def check_replicas(self):
+        """Take failed replicas out of rotation and recovered ones back in, resizing admission to match"""
+        for model_name, pool in self.replica_pools.items():
+            changed = await pool.check_health(self.replica_health_timeout_seconds)
+            for replica in changed:
+                if replica.healthy:
+                    logger.info(f"🩺 {replica.name} is healthy again, back in rotation")
+                else:
+                    logger.error(f"🩺 {replica.name} failed its health check ({replica.last_error}), "
+                                 f"removed from rotation")
+            if changed and model_name in self.admission:
+                self.admission[model_name].resize(pool.capacity)
+    
+    def schedule_replica_check(self):
+        """Run a health check now, unless one is already running"""
+        if self._replica_check is None or self._replica_check.done():
+            self._replica_check = asyncio.get_running_loop().create_task(self.check_replicas())
+    
+    def select_model_for_executive(self, executive_role: str, prompt_tokens: int,
+                                   max_tokens: int) -> Optional[RouteDecision]:
+        """Select a model for the role from the routing table; None if none can serve the request
+
+        The role's candidates are tried in order, skipping models without a
+        healthy replica, too short a context, or an admission queue deeper than
+        the candidate allows. A model with room for the prompt and max_tokens
+        is preferred; failing that, one with room for the prompt, whose
+        remaining context then caps max_tokens.
+        """
+        decision = (self.routing.route(executive_role, prompt_tokens + max_tokens, self.model_state)
+                    or self.routing.route(executive_role, prompt_tokens + 1, self.model_state))
+        if decision is not None and decision.reason != "primary":
+            logger.info(f"🔀 Routed {executive_role} request to {decision.model} ({decision.reason})")
+        return decision
+    
+    def model_state(self, model_name: str) -> Optional[ModelState]:
+        """Live load of a model for routing; None if it is not loaded or has no healthy replica"""
+        pool = self.replica_pools.get(model_name)
+        if not pool or not pool.healthy_replicas:
+            return None
+        queue = self.admission.get(model_name)
+        return ModelState(queued=queue.queued if queue else 0,
+                          max_model_len=self.model_configs[model_name].max_model_len)
     
+    def _get_telemetry_reader(self):
+        """Attach to the MCP telemetry segment, retrying at most every 5 seconds"""
+        if self.telemetry_reader is None and TelemetryReader is not None and time.time() >= self._telemetry_retry_at:
+            self.telemetry_reader = TelemetryReader.open()
+            if self.telemetry_reader is None:
+                self._telemetry_retry_at = time.time() + 5.0
+        return self.telemetry_reader
+
+    def _read_gpu_telemetry(self, model_name: str) -> Optional[List[Any]]:
+        """Live telemetry records for the model's GPUs, None if unavailable"""
+        reader = self._get_telemetry_reader()
+        if reader is None:
+            return None
+        try:
+            records = [reader.read_gpu(gpu_id) for gpu_id in self.gpu_allocations.get(model_name, [])]
+        except (IndexError, TimeoutError) as e:
+            logger.warning(f"Telemetry read failed: {e}")
+            return None
+        return [record for record in records if not record.lost]
+
     async def get_gpu_utilization(self, model_name: str) -> Dict[str, float]:
-        """Get GPU utilization for model (placeholder)"""
-        gpu_ids = self.gpu_allocations.get(model_name, [])
-        return {f"gpu_{gpu_id}": 75.0 for gpu_id in gpu_ids}  # Placeholder
+        """Get GPU utilization for model from MCP telemetry"""
+        records = self._read_gpu_telemetry(model_name)
+        if records is None:
+            return {}
+        return {f"gpu_{record.gpu_id}": record.utilization for record in records}
     
     async def get_memory_usage(self, model_name: str) -> float:
-        """Get memory usage for model (placeholder)"""
+        """Get memory usage for model in GB, estimated when telemetry is unavailable"""
+        records = self._read_gpu_telemetry(model_name)
+        if records is not None:
+            return sum(record.memory_used for record in records) / 1024
+
         config = self.model_configs.get(model_name)
         if config:
             if "405b" in model_name:
@@ -322,13 +1074,15 @@ class B200VLLMInferenceServer:
                 return 45.0   # 70B model uses ~45GB on single GPU
         return 0.0
     
-    def update_request_stats(self, executive_role: str, inference_time_ms: float, tokens_generated: int):
-        """Update request statistics"""
+    def update_request_stats(self, executive_role: str, inference_time_ms: float, tokens_generated: int,
+                             queue_time_ms: float = 0.0):
+        """Update request statistics; latency is engine time, queueing is tracked apart"""
         if executive_role not in self.request_stats:
             self.request_stats[executive_role] = {
                 "total_requests": 0,
                 "total_tokens": 0,
                 "avg_latency_ms": 0.0,
+                "avg_queue_ms": 0.0,
                 "avg_tokens_per_second": 0.0
             }
         
@@ -339,32 +1093,140 @@ class B200VLLMInferenceServer:
         # Update averages
         total_requests = stats["total_requests"]
         stats["avg_latency_ms"] = (stats["avg_latency_ms"] * (total_requests - 1) + inference_time_ms) / total_requests
+        stats["avg_queue_ms"] = (stats["avg_queue_ms"] * (total_requests - 1) + queue_time_ms) / total_requests
         
         tokens_per_second = tokens_generated / (inference_time_ms / 1000) if inference_time_ms > 0 else 0
         stats["avg_tokens_per_second"] = (stats["avg_tokens_per_second"] * (total_requests - 1) + tokens_per_second) / total_requests
 
+def api_key_from(http_request: Request) -> Optional[str]:
+    """The caller's API key, from X-API-Key or an Authorization bearer token"""
+    api_key = http_request.headers.get("x-api-key")
+    if api_key:
+        return api_key
+    scheme, _, token = http_request.headers.get("authorization", "").partition(" ")
+    return (token.strip() or None) if scheme.lower() == "bearer" else None
+
+def tokens_processed(output) -> int:
+    """Prompt plus generated tokens of a (cumulative) request output"""
+    if output is None:
+        return 0
+    return len(output.prompt_token_ids or []) + len(output.outputs[0].token_ids)
+
+def validation_detail(error: ValidationError) -> str:
+    """A pydantic validation error as one line, e.g. 'max_tokens: Input should be greater than or equal to 1'"""
+    return "; ".join(f"{'.'.join(str(part) for part in detail['loc'])}: {detail['msg']}" for detail in error.errors())
+
+def sse_frame(payload: Dict[str, Any], event: Optional[str] = None) -> bytes:
+    """One Server-Sent Events frame carrying a JSON payload"""
+    data = json.dumps(payload, separators=(",", ":"))
+    return (f"event: {event}\ndata: {data}\n\n" if event else f"data: {data}\n\n").encode()
+
+def create_simulated_engine(replica_name: str, options: Dict[str, Any], config: B200ModelConfig):
+    """Scripted engine standing in for vLLM, for tests and benchmarks without GPUs"""
+    from simulated_engine import SimulatedAsyncLLMEngine
+
+    settings = {
+        "time_to_first_token_ms": options.get("time_to_first_token_ms", 50.0),
+        "inter_token_ms": options.get("inter_token_ms", 10.0),
+        "prefill_ms_per_token": options.get("prefill_ms_per_token", 0.05),
+        "enable_prefix_caching": config.enable_prefix_caching,
+        "max_model_len": config.max_model_len,
+        "fail_after_seconds": (options.get("fail_replicas") or {}).get(replica_name)
+    }
+    if options.get("script"):
+        return SimulatedAsyncLLMEngine.from_script_file(replica_name, options["script"], **settings)
+    return SimulatedAsyncLLMEngine(replica_name, **settings)
+
 # Global server instance
 vllm_server = B200VLLMInferenceServer()
 
 async def main():
     """Main server startup"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="B200 VLLM Inference Server")
+    parser.add_argument("--host", default="0.0.0.0", help="Bind address (default: 0.0.0.0)")
+    parser.add_argument("--port", type=int, default=8001, help="HTTP port (default: 8001)")
+    parser.add_argument("--simulate", action="store_true",
+                        help="Serve scripted completions from simulated engines instead of vLLM")
+    parser.add_argument("--request-timeout", type=float, default=300.0,
+                        help="Abort inference requests running longer than this many seconds (default: 300)")
+    parser.add_argument("--response-cache-size", type=int, default=1024,
+                        help="Completions kept in the exact-match response cache, 0 to disable (default: 1024)")
+    parser.add_argument("--response-cache-ttl", type=float, default=300.0,
+                        help="Seconds a cached completion stays valid (default: 300)")
+    parser.add_argument("--no-single-flight", action="store_true",
+                        help="Generate identical concurrent requests separately instead of sharing one generation")
+    parser.add_argument("--role-prefixes", default=None,
+                        help="JSON file mapping executive roles to canonical prompt prefixes (default: built-in personas)")
+    parser.add_argument("--admission-config", default=None,
+                        help="JSON overriding admission settings: max_queue_depth, priority_weights, role_weights")
+    parser.add_argument("--quota-config", default=None,
+                        help="JSON of token-rate quotas: roles, default_role, api_keys, default_api_key, "
+                             "max_wait_seconds (default: unmetered)")
+    parser.add_argument("--routing-table", default=None,
+                        help="JSON file mapping executive roles (or \"*\") to ordered candidate models with "
+                             "max_queue_depth and max_context_tokens (default: built-in table)")
+    parser.add_argument("--replicas", action="append", default=[], metavar="MODEL=N",
+                        help="Engine replicas of a model, each on its own GPUs (default: 1 per model; repeatable)")
+    parser.add_argument("--replica-health-interval", type=float, default=10.0,
+                        help="Seconds between replica health checks (default: 10)")
+    parser.add_argument("--sim-fail-replica", action="append", default=[], metavar="REPLICA[@SECONDS]",
+                        help="Make a simulated replica, e.g. qwen2.5-70b-fp8/1, fail SECONDS after start (repeatable)")
+    parser.add_argument("--sim-script", default=None,
+                        help="JSON file mapping prompts to completions for the simulated engines")
+    parser.add_argument("--sim-ttft-ms", type=float, default=50.0,
+                        help="Simulated time to first token (default: 50)")
+    parser.add_argument("--sim-inter-token-ms", type=float, default=10.0,
+                        help="Simulated time between tokens (default: 10)")
+    args = parser.parse_args()
+
     try:
         logger.info("🚀 Starting B200 VLLM Inference Server...")
         
+        vllm_server.request_timeout_seconds = args.request_timeout
+        vllm_server.replica_health_interval_seconds = args.replica_health_interval
+        for replicas in args.replicas:
+            model_name, _, count = replicas.partition("=")
+            vllm_server.replica_counts[model_name] = int(count)
+        if args.admission_config:
+            with open(args.admission_config) as f:
+                vllm_server.admission_config.update(json.load(f))
+        if args.quota_config:
+            with open(args.quota_config) as f:
+                vllm_server.quotas = QuotaManager(json.load(f))
+        if args.routing_table:
+            vllm_server.routing = RoutingTable.from_file(args.routing_table)
+        if args.role_prefixes:
+            vllm_server.role_prefixes = RolePrefixRegistry.from_file(args.role_prefixes)
+        vllm_server.single_flight = SingleFlight(enabled=not args.no_single_flight)
+        vllm_server.response_cache = (
+            ResponseCache(args.response_cache_size, args.response_cache_ttl) if args.response_cache_size > 0 else None
+        )
+
         # Initialize models
-        await vllm_server.initialize_models()
+        simulate = {
+            "script": args.sim_script,
+            "time_to_first_token_ms": args.sim_ttft_ms,
+            "inter_token_ms": args.sim_inter_token_ms,
+            "fail_replicas": {
+                replica: float(seconds or 0)
+                for replica, _, seconds in (failure.partition("@") for failure in args.sim_fail_replica)
+            }
+        } if args.simulate else None
+        await vllm_server.initialize_models(simulate)
         
         # Start server
         config = uvicorn.Config(
             app=vllm_server.app,
-            host="0.0.0.0",
-            port=8001,
+            host=args.host,
+            port=args.port,
             log_level="info",
             access_log=True
         )
         
         server = uvicorn.Server(config)
-        logger.info("🎯 B200 VLLM server ready on http://0.0.0.0:8001")
+        logger.info(f"🎯 B200 VLLM server ready on http://{args.host}:{args.port}")
         await server.serve()
         
     except Exception as e:
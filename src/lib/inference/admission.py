@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+ADMISSION QUEUE
+Server-side scheduling of engine sequence slots by priority and executive role
+Live traffic first, weighted fairness for the rest, bounded depth with back-pressure
+Requests with a deadline are dispatched earliest-deadline-first
+"""
+
+import asyncio
+import math
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, Optional, Tuple
+
+# Highest first. "live" (voice calls, interactive UI) is always dispatched before the rest
+PRIORITIES = ("live", "normal", "batch")
+STRICT_PRIORITY = "live"
+
+DEFAULT_PRIORITY_WEIGHTS = {"live": 1.0, "normal": 4.0, "batch": 1.0}
+
+
+class AdmissionRejected(Exception):
+    """The queue is full; the client should retry after retry_after_seconds"""
+
+    def __init__(self, message: str, retry_after_seconds: int):
+        super().__init__(message)
+        self.retry_after_seconds = retry_after_seconds
+
+
+@dataclass
+class Waiter:
+    priority: str
+    role: str
+    cost: float
+    enqueued_at: float
+    future: asyncio.Future = field(repr=False)
+    deadline: Optional[float] = None  # time.monotonic() by which the caller needs its answer
+
+
+class AdmissionQueue:
+    """Grants up to capacity concurrent engine slots; everyone else waits in a (priority, role) queue
+
+    Dispatch order: any waiting live request first, then stride scheduling
+    over the other queues with weight priority_weight x role_weight, so a
+    burst from one role or of batch work cannot starve the others. Each
+    dispatch advances its queue by the request's cost (its token estimate),
+    so fair shares are of engine work rather than of request count.
+
+    Deadlines are served earliest first: live requests in deadline order,
+    and any other request with a deadline ahead of stride order. It is still
+    charged to its queue, which therefore waits longer for its next turn, so
+    deadlines reorder a role's work without enlarging its share. When
+    max_queue_depth requests are waiting, a new request is rejected unless it
+    outranks a queued one, in which case the newest lowest-priority waiter is
+    rejected in its place.
+    """
+
+    def __init__(self, name: str, capacity: int, max_queue_depth: int = 256,
+                 priority_weights: Optional[Dict[str, float]] = None,
+                 role_weights: Optional[Dict[str, float]] = None):
+        self.name = name
+        self.capacity = capacity
+        self.max_queue_depth = max_queue_depth
+        self.priority_weights = {**DEFAULT_PRIORITY_WEIGHTS, **(priority_weights or {})}
+        self.role_weights = {role.upper(): weight for role, weight in (role_weights or {}).items()}
+        self.in_use = 0
+        self.queues: Dict[Tuple[str, str], Deque[Waiter]] = {}
+        self.passes: Dict[Tuple[str, str], float] = {}
+        self.virtual_time = 0.0
+        self.queued = 0
+        self.avg_service_seconds = 2.0
+        self.stats = {
+            priority: {"admitted": 0, "rejected": 0, "total_queue_ms": 0.0, "max_queue_ms": 0.0}
+            for priority in PRIORITIES
+        }
+        self.deadline_dispatches = 0
+
+    def _weight(self, key: Tuple[str, str]) -> float:
+        priority, role = key
+        return self.priority_weights.get(priority, 1.0) * self.role_weights.get(role, 1.0)
+
+    def retry_after_seconds(self) -> int:
+        """Rough time for the current queue to drain through the engine's slots"""
+        return max(1, math.ceil(self.avg_service_seconds * (self.queued + 1) / max(self.capacity, 1)))
+
+    async def acquire(self, priority: str, role: str, cost: float = 1.0, deadline: Optional[float] = None) -> float:
+        """Wait for a slot; returns the seconds spent queued. Raises AdmissionRejected when full
+
+        cost is the request's expected engine work, typically prompt + max_tokens.
+        deadline (time.monotonic()) moves the request ahead of those due later.
+        """
+        if priority not in PRIORITIES:
+            raise ValueError(f"Unknown priority {priority!r}; expected one of {', '.join(PRIORITIES)}")
+
+        if self.in_use < self.capacity and self.queued == 0:
+            self.in_use += 1
+            self._record_admission(priority, 0.0)
+            return 0.0
+
+        if self.queued >= self.max_queue_depth and not self._evict_below(priority):
+            self.stats[priority]["rejected"] += 1
+            raise AdmissionRejected(
+                f"{self.name} admission queue is full ({self.queued} waiting)", self.retry_after_seconds()
+            )
+
+        key = (priority, role.upper())
+        waiter = Waiter(priority, key[1], max(cost, 1.0), time.monotonic(),
+                        asyncio.get_running_loop().create_future(), deadline)
+        queue = self.queues.setdefault(key, deque())
+        if not queue:
+            # A queue that was idle re-enters at the current virtual time, with no saved-up credit
+            self.passes[key] = max(self.passes.get(key, 0.0), self.virtual_time)
+        queue.append(waiter)
+        self.queued += 1
+
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            if waiter.future.done() and not waiter.future.cancelled() and waiter.future.exception() is None:
+                # Granted a slot just as the caller gave up: hand it on
+                self.release()
+            else:
+                # Still queued; a displaced waiter was already removed and never held a slot
+                self._remove(key, waiter)
+            raise
+
+        queue_seconds = time.monotonic() - waiter.enqueued_at
+        self._record_admission(priority, queue_seconds * 1000)
+        return queue_seconds
+
+    def release(self, service_seconds: Optional[float] = None) -> None:
+        """Return a slot, and hand it to the next waiter if there is one"""
+        self.in_use -= 1
+        if service_seconds is not None:
+            self.avg_service_seconds = 0.9 * self.avg_service_seconds + 0.1 * service_seconds
+        self._dispatch()
+
+    def resize(self, capacity: int) -> None:
+        """Change the number of slots, e.g. as engine replicas fail or recover"""
+        self.capacity = capacity
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        while self.in_use < self.capacity and self.queued:
+            key, waiter, by_deadline = self._next_waiter()
+            self.queues[key].remove(waiter)
+            self.queued -= 1
+            if key[0] != STRICT_PRIORITY:
+                if by_deadline:
+                    self.deadline_dispatches += 1
+                else:
+                    self.virtual_time = self.passes[key]
+                self.passes[key] += waiter.cost / self._weight(key)
+            self.in_use += 1
+            waiter.future.set_result(True)
+
+    def _next_waiter(self) -> Tuple[Tuple[str, str], Waiter, bool]:
+        """(queue, waiter, whether it jumped stride order for its deadline) to dispatch next"""
+        def by_deadline(entry):
+            _, waiter = entry
+            return (waiter.deadline if waiter.deadline is not None else math.inf, waiter.enqueued_at)
+
+        live = [(key, waiter) for key, queue in self.queues.items() if key[0] == STRICT_PRIORITY
+                for waiter in queue]
+        if live:
+            return (*min(live, key=by_deadline), False)
+        due = [(key, waiter) for key, queue in self.queues.items() for waiter in queue if waiter.deadline is not None]
+        if due:
+            return (*min(due, key=by_deadline), True)
+        candidates = [key for key, queue in self.queues.items() if queue]
+        key = min(candidates, key=lambda key: (self.passes[key], self.queues[key][0].enqueued_at))
+        return key, self.queues[key][0], False
+
+    def _evict_below(self, priority: str) -> bool:
+        """Make room for priority by rejecting the newest waiter of the lowest queued priority below it"""
+        rank = PRIORITIES.index(priority)
+        for lower in reversed(PRIORITIES[rank + 1:]):
+            newest = None
+            for key, queue in self.queues.items():
+                if key[0] == lower and queue and (newest is None or queue[-1].enqueued_at > newest[1].enqueued_at):
+                    newest = (key, queue[-1])
+            if newest is not None:
+                key, waiter = newest
+                self._remove(key, waiter)
+                self.stats[lower]["rejected"] += 1
+                waiter.future.set_exception(AdmissionRejected(
+                    f"{self.name} admission queue is full; displaced by {priority} traffic",
+                    self.retry_after_seconds()
+                ))
+                return True
+        return False
+
+    def _remove(self, key: Tuple[str, str], waiter: Waiter) -> None:
+        try:
+            self.queues[key].remove(waiter)
+            self.queued -= 1
+        except ValueError:
+            pass
+
+    def _record_admission(self, priority: str, queue_ms: float) -> None:
+        stats = self.stats[priority]
+        stats["admitted"] += 1
+        stats["total_queue_ms"] += queue_ms
+        stats["max_queue_ms"] = max(stats["max_queue_ms"], queue_ms)
+
+    def get_stats(self) -> Dict[str, Any]:
+        waiting = {priority: 0 for priority in PRIORITIES}
+        for (priority, _), queue in self.queues.items():
+            waiting[priority] += len(queue)
+        return {
+            "capacity": self.capacity,
+            "in_use": self.in_use,
+            "queued": self.queued,
+            "max_queue_depth": self.max_queue_depth,
+            "avg_service_seconds": self.avg_service_seconds,
+            "deadline_dispatches": self.deadline_dispatches,
+            "priorities": {
+                priority: {
+                    "waiting": waiting[priority],
+                    "admitted": stats["admitted"],
+                    "rejected": stats["rejected"],
+                    "avg_queue_ms": stats["total_queue_ms"] / stats["admitted"] if stats["admitted"] else 0.0,
+                    "max_queue_ms": stats["max_queue_ms"]
+                }
+                for priority, stats in self.stats.items()
+            }
+        }
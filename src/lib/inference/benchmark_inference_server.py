@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+"""
+SOVREN Inference Server Replica Benchmark
+Closed-loop completion load against simulated engines at increasing 70B replica counts
+Measures throughput scaling, that traffic survives a replica failing mid-run,
+and what conversation affinity saves in prefill on multi-turn conversations
+"""
+
+import asyncio
+import json
+import logging
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+logging.getLogger("httpx").setLevel(logging.WARNING)
+
+MODEL = "qwen2.5-70b-fp8"
+
+
+def percentile(sorted_values: List[float], p: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(p / 100 * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[index]
+
+
+def summarize_latencies(latencies_ms: List[float]) -> Dict[str, float]:
+    """p50/p95/p99/mean of a latency sample"""
+    values = sorted(latencies_ms)
+    return {
+        'p50': percentile(values, 50),
+        'p95': percentile(values, 95),
+        'p99': percentile(values, 99),
+        'mean': sum(values) / len(values) if values else 0.0
+    }
+
+
+class CompletionLoad:
+    """Concurrent workers each sending one 70B completion after another until the duration is up"""
+
+    def __init__(self, server_url: str, concurrency: int = 64, duration: float = 20.0, max_tokens: int = 64):
+        self.server_url = server_url
+        self.concurrency = concurrency
+        self.duration = duration
+        self.max_tokens = max_tokens
+        self.latencies_ms: List[float] = []
+        self.queue_ms: List[float] = []
+        self.tokens = 0
+        self.errors: Dict[str, int] = {}
+        self.placements: Dict[str, int] = {}
+        self._deadline = 0.0
+
+    async def _worker(self, client: httpx.AsyncClient, worker_id: int) -> None:
+        sequence = 0
+        while time.perf_counter() < self._deadline:
+            sequence += 1
+            request = {
+                "prompt": f"Benchmark worker {worker_id} request {sequence}",
+                "executive_role": "CHRO",
+                "max_tokens": self.max_tokens,
+                "cache": False  # Every request is a distinct generation
+            }
+            start = time.perf_counter()
+            try:
+                response = await client.post("/v1/completions", json=request)
+            except httpx.HTTPError as e:
+                self.errors[type(e).__name__] = self.errors.get(type(e).__name__, 0) + 1
+                continue
+            if response.status_code != 200:
+                self.errors[str(response.status_code)] = self.errors.get(str(response.status_code), 0) + 1
+                continue
+            data = response.json()
+            self.latencies_ms.append((time.perf_counter() - start) * 1000)
+            self.queue_ms.append(data['queue_time_ms'])
+            self.tokens += data['tokens_generated']
+            self.placements[data['replica']] = self.placements.get(data['replica'], 0) + 1
+
+    async def run(self) -> Dict[str, Any]:
+        limits = httpx.Limits(max_connections=self.concurrency, max_keepalive_connections=self.concurrency)
+        async with httpx.AsyncClient(base_url=self.server_url, timeout=120, limits=limits) as client:
+            start = time.perf_counter()
+            self._deadline = start + self.duration
+            await asyncio.gather(*(self._worker(client, worker_id) for worker_id in range(self.concurrency)))
+            elapsed = time.perf_counter() - start
+            replicas = (await client.get("/v1/stats")).json()['replicas'][MODEL]
+
+        return {
+            'requests': len(self.latencies_ms),
+            'errors': self.errors,
+            'throughput_rps': len(self.latencies_ms) / elapsed,
+            'tokens_per_second': self.tokens / elapsed,
+            'latency_ms': summarize_latencies(self.latencies_ms),
+            'queue_ms': summarize_latencies(self.queue_ms),
+            'placements': self.placements,
+            'healthy_replicas': replicas['healthy']
+        }
+
+
+class ConversationLoad:
+    """Concurrent multi-turn conversations, each turn resending the whole history"""
+
+    def __init__(self, server_url: str, conversations: int = 16, turns: int = 4, history_words: int = 8000,
+                 affinity: bool = True):
+        self.server_url = server_url
+        self.conversations = conversations
+        self.turns = turns
+        self.history_words = history_words
+        self.affinity = affinity
+        self.first_turn_ms: List[float] = []
+        self.follow_up_ms: List[float] = []
+        self.errors = 0
+
+    async def _converse(self, client: httpx.AsyncClient, index: int) -> None:
+        conversation_id = f"{'affine' if self.affinity else 'free'}-{index}"
+        rng = random.Random(index)
+        history = " ".join(f"{conversation_id}-note-{word}" for word in range(self.history_words))
+        for turn in range(self.turns):
+            if turn:
+                await asyncio.sleep(rng.uniform(0.0, 0.5))  # The executive reads the answer
+            history += f" Question {turn}: what should the board decide?"
+            request = {"prompt": history, "executive_role": "CHRO", "max_tokens": 16, "cache": False}
+            if self.affinity:
+                request["conversation_id"] = conversation_id
+            response = await client.post("/v1/completions", json=request)
+            if response.status_code != 200:
+                self.errors += 1
+                return
+            data = response.json()
+            history += data['text']
+            # Engine time: mostly prefill of whatever part of the history the replica has not cached
+            (self.follow_up_ms if turn else self.first_turn_ms).append(data['inference_time_ms'])
+
+    async def run(self) -> Dict[str, Any]:
+        async with httpx.AsyncClient(base_url=self.server_url, timeout=120) as client:
+            await asyncio.gather(*(self._converse(client, index) for index in range(self.conversations)))
+            stats = (await client.get("/v1/stats")).json()
+        return {
+            'affinity': self.affinity,
+            'errors': self.errors,
+            'first_turn_ms': summarize_latencies(self.first_turn_ms),
+            'follow_up_ms': summarize_latencies(self.follow_up_ms),
+            'prefix_cache_hit_rate': stats['prefix_cache']['models'][MODEL]['hit_rate'],
+            'placements': stats['replicas'][MODEL]['affinity']
+        }
+
+
+def spawn_simulated_server(port: int, replicas: int, extra_args: Optional[List[str]] = None) -> subprocess.Popen:
+    """Start the inference server on simulated engines and wait until it is healthy
+
+    Every role is routed to MODEL alone, so overflow cannot spill onto the
+    other model and blur the replica count being measured.
+    """
+    server_path = Path(__file__).parent / "VLLMInferenceServer.py"
+    routing_table = Path(tempfile.gettempdir()) / f"benchmark-routing-{port}.json"
+    routing_table.write_text(json.dumps({"*": [{"model": MODEL}]}))
+    command = [
+        sys.executable, str(server_path), '--simulate', '--host', '127.0.0.1', '--port', str(port),
+        '--replicas', f'{MODEL}={replicas}', '--response-cache-size', '0', '--routing-table', str(routing_table)
+    ] + (extra_args or [])
+    process = subprocess.Popen(command, cwd=server_path.parent, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+    deadline = time.time() + 30
+    with httpx.Client(timeout=1) as client:
+        while time.time() < deadline:
+            if process.poll() is not None:
+                raise RuntimeError(f"Simulated inference server exited with code {process.returncode}")
+            try:
+                if client.get(f"http://127.0.0.1:{port}/health").status_code == 200:
+                    return process
+            except httpx.HTTPError:
+                pass
+            time.sleep(0.2)
+
+    process.terminate()
+    raise RuntimeError("Simulated inference server did not become healthy within 30s")
+
+
+async def run_against_simulated_server(port: int, replicas: int, load: CompletionLoad,
+                                       extra_args: Optional[List[str]] = None) -> Dict[str, Any]:
+    process = spawn_simulated_server(port, replicas, extra_args)
+    try:
+        return await load.run()
+    finally:
+        process.terminate()
+        process.wait(timeout=10)
+
+
+def log_scaling(results: Dict[int, Dict[str, Any]]) -> None:
+    logger.info("🏁 REPLICA SCALING")
+    baseline = next(iter(results.values()))['tokens_per_second']
+    for replicas, stats in results.items():
+        logger.info(f"  {replicas} replica{'s' if replicas > 1 else ' '}  {stats['throughput_rps']:>7.1f} req/s  "
+                    f"{stats['tokens_per_second']:>8.0f} tok/s  ({stats['tokens_per_second'] / baseline:.2f}x)  "
+                    f"p50 {stats['latency_ms']['p50']:.0f}ms  p95 {stats['latency_ms']['p95']:.0f}ms  "
+                    f"queue p50 {stats['queue_ms']['p50']:.0f}ms  errors {sum(stats['errors'].values())}")
+
+
+async def main():
+    """Main benchmark function"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Replica scaling benchmark for the inference server")
+    parser.add_argument("--port", type=int, default=8301, help="Port for the spawned simulated server")
+    parser.add_argument("--replica-counts", default="1,2,4",
+                        help="Comma-separated 70B replica counts to measure (default: 1,2,4)")
+    parser.add_argument("--concurrency", type=int, default=64, help="Concurrent requests in flight")
+    parser.add_argument("--duration", type=float, default=20.0, help="Seconds of load per replica count")
+    parser.add_argument("--max-tokens", type=int, default=64, help="Tokens generated per request")
+    parser.add_argument("--failover", action="store_true",
+                        help="Instead, fail one of two replicas a third of the way in and measure the impact")
+    parser.add_argument("--affinity", action="store_true",
+                        help="Instead, compare multi-turn conversations with and without conversation_id")
+    parser.add_argument("--conversations", type=int, default=16, help="Concurrent conversations for --affinity")
+    parser.add_argument("--turns", type=int, default=4, help="Turns per conversation for --affinity")
+    parser.add_argument("--output-file", help="Save benchmark results to JSON file")
+    args = parser.parse_args()
+
+    def new_load() -> CompletionLoad:
+        return CompletionLoad(f"http://127.0.0.1:{args.port}", args.concurrency, args.duration, args.max_tokens)
+
+    if args.affinity:
+        replicas = int(args.replica_counts.split(',')[-1])
+        results = {}
+        for affinity in (False, True):
+            load = ConversationLoad(f"http://127.0.0.1:{args.port}", args.conversations, args.turns,
+                                    affinity=affinity)
+            results['with_affinity' if affinity else 'without_affinity'] = await run_against_simulated_server(
+                args.port, replicas, load
+            )
+        logger.info(f"🏁 CONVERSATION AFFINITY ({args.conversations} conversations x {args.turns} turns, "
+                    f"{replicas} replicas)")
+        for name, stats in results.items():
+            logger.info(f"  {name:<17} follow-up engine time p50 {stats['follow_up_ms']['p50']:.0f}ms "
+                        f"p95 {stats['follow_up_ms']['p95']:.0f}ms  (first turn p50 "
+                        f"{stats['first_turn_ms']['p50']:.0f}ms)  prefix cache hit rate "
+                        f"{stats['prefix_cache_hit_rate']:.0%}  errors {stats['errors']}")
+        if args.output_file:
+            with open(args.output_file, 'w') as f:
+                json.dump({'affinity': results}, f, indent=2)
+            logger.info(f"Benchmark results saved to {args.output_file}")
+        return
+
+    if args.failover:
+        fail_at = args.duration / 3
+        results = await run_against_simulated_server(args.port, 2, new_load(), [
+            '--sim-fail-replica', f'{MODEL}/1@{fail_at}', '--replica-health-interval', '1'
+        ])
+        logger.info("🏁 FAILOVER")
+        logger.info(f"  {MODEL}/1 failed at {fail_at:.1f}s; {results['healthy_replicas']}/2 replicas healthy at the end")
+        logger.info(f"  {results['requests']} completed, errors {results['errors'] or 'none'}, "
+                    f"placements {results['placements']}")
+        if args.output_file:
+            with open(args.output_file, 'w') as f:
+                json.dump({'failover': results}, f, indent=2)
+            logger.info(f"Benchmark results saved to {args.output_file}")
+        return
+
+    results = {}
+    for replicas in (int(count) for count in args.replica_counts.split(',')):
+        logger.info(f"📈 {replicas} x {MODEL}, {args.concurrency} concurrent requests for {args.duration:.0f}s")
+        results[replicas] = await run_against_simulated_server(args.port, replicas, new_load())
+
+    log_scaling(results)
+
+    if args.output_file:
+        with open(args.output_file, 'w') as f:
+            json.dump({'scaling': results}, f, indent=2)
+        logger.info(f"Benchmark results saved to {args.output_file}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
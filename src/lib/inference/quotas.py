@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+TOKEN-RATE QUOTAS
+Token buckets per executive role and per API key, metered in prompt + generated tokens
+A request's cost is reserved up front (prompt + max_tokens) and settled to what it used
+"""
+
+import asyncio
+import hashlib
+import math
+import time
+from typing import Any, Dict, List, Optional
+
+DEFAULT_QUOTA_CONFIG = {
+    # Longest an over-budget request is deferred before it is rejected with 429 instead
+    "max_wait_seconds": 30.0,
+    # {"<ROLE>": {"tokens_per_second": ..., "burst_tokens": ...}}
+    "roles": {},
+    # Applied to roles not listed above; None leaves them unmetered
+    "default_role": None,
+    # {"<key>": {"name": ..., "tokens_per_second": ..., "burst_tokens": ...}}
+    "api_keys": {},
+    # Applied, one bucket each, to API keys not listed above
+    "default_api_key": None,
+}
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (about 4 characters per token) for reserving budget before tokenization"""
+    return max(1, len(text) // 4)
+
+
+class QuotaExceeded(Exception):
+    """Over budget by more than the deferral limit; the client should retry after retry_after_seconds"""
+
+    def __init__(self, message: str, retry_after_seconds: int):
+        super().__init__(message)
+        self.retry_after_seconds = retry_after_seconds
+
+
+class TokenBucket:
+    """Refills at tokens_per_second up to burst_tokens
+
+    Requests take their whole cost at once and may drive the level negative,
+    so a request larger than the burst still runs, and everyone after it waits
+    until the debt is repaid. A request may start once the level, before its
+    own cost, covers min(cost, burst_tokens).
+    """
+
+    def __init__(self, label: str, tokens_per_second: float, burst_tokens: Optional[float] = None):
+        self.label = label
+        self.tokens_per_second = float(tokens_per_second)
+        self.burst_tokens = float(burst_tokens if burst_tokens is not None else tokens_per_second * 10)
+        self.level = self.burst_tokens
+        self.updated = time.monotonic()
+        self.stats = {"requests": 0, "tokens_charged": 0, "deferred": 0, "rejected": 0, "total_wait_ms": 0.0}
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.level = min(self.burst_tokens, self.level + (now - self.updated) * self.tokens_per_second)
+        self.updated = now
+
+    def wait_seconds(self, tokens: float) -> float:
+        """How long a request for tokens would have to wait, given everything already taken"""
+        self._refill()
+        deficit = min(tokens, self.burst_tokens) - self.level
+        return max(deficit, 0.0) / self.tokens_per_second
+
+    def take(self, tokens: float) -> None:
+        self._refill()
+        self.level -= tokens
+
+    def give_back(self, tokens: float) -> None:
+        self._refill()
+        self.level = min(self.burst_tokens, self.level + tokens)
+
+    def get_stats(self) -> Dict[str, Any]:
+        self._refill()
+        stats = self.stats
+        return {
+            "tokens_per_second": self.tokens_per_second,
+            "burst_tokens": self.burst_tokens,
+            "available_tokens": self.level,
+            "requests": stats["requests"],
+            "tokens_charged": stats["tokens_charged"],
+            "deferred": stats["deferred"],
+            "rejected": stats["rejected"],
+            "avg_wait_ms": stats["total_wait_ms"] / stats["deferred"] if stats["deferred"] else 0.0
+        }
+
+
+class QuotaReservation:
+    """Tokens held against one or more buckets for a single generation"""
+
+    def __init__(self, buckets: List[TokenBucket], tokens: int, usage: Dict[str, int]):
+        self.buckets = buckets
+        self.tokens = tokens
+        self.usage = usage
+        self.settled = False
+
+    def settle(self, tokens_used: int) -> None:
+        """Charge what the generation actually used: refund the unused reservation, or take the overrun"""
+        if self.settled:
+            return
+        self.settled = True
+        self.usage["tokens"] += tokens_used
+        for bucket in self.buckets:
+            bucket.give_back(self.tokens - tokens_used)
+            bucket.stats["tokens_charged"] += tokens_used
+
+    def cancel(self) -> None:
+        """Nothing was generated: refund the whole reservation"""
+        self.settle(0)
+
+
+class QuotaManager:
+    """Token-rate limits for executive roles and API keys
+
+    A request draws on its role's bucket and, when it presents one, its API
+    key's bucket; it is deferred until both have room, or rejected when that
+    would take longer than max_wait_seconds. Roles and keys without a
+    configured rate are not metered.
+    """
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        self.config = {**DEFAULT_QUOTA_CONFIG, **(config or {})}
+        self.max_wait_seconds = float(self.config["max_wait_seconds"])
+        self.role_limits = {role.upper(): limit for role, limit in self.config["roles"].items()}
+        self.role_buckets: Dict[str, TokenBucket] = {}
+        self.key_buckets: Dict[str, TokenBucket] = {}
+        # Tokens processed per role, metered or not
+        self.role_usage: Dict[str, Dict[str, int]] = {}
+
+    @property
+    def enabled(self) -> bool:
+        config = self.config
+        return bool(self.role_limits or config["default_role"] or config["api_keys"] or config["default_api_key"])
+
+    def _role_bucket(self, role: str) -> Optional[TokenBucket]:
+        role = role.upper()
+        bucket = self.role_buckets.get(role)
+        if bucket is None:
+            limit = self.role_limits.get(role, self.config["default_role"])
+            if not limit:
+                return None
+            bucket = self.role_buckets[role] = TokenBucket(role, limit["tokens_per_second"], limit.get("burst_tokens"))
+        return bucket
+
+    def _key_bucket(self, api_key: Optional[str]) -> Optional[TokenBucket]:
+        if not api_key:
+            return None
+        bucket = self.key_buckets.get(api_key)
+        if bucket is None:
+            limit = self.config["api_keys"].get(api_key, self.config["default_api_key"])
+            if not limit:
+                return None
+            # Stats never show the key itself
+            label = limit.get("name") or f"key-{hashlib.sha256(api_key.encode()).hexdigest()[:12]}"
+            bucket = TokenBucket(label, limit["tokens_per_second"], limit.get("burst_tokens"))
+            self.key_buckets[api_key] = bucket
+        return bucket
+
+    async def reserve(self, role: str, api_key: Optional[str], tokens: int) -> QuotaReservation:
+        """Take tokens from the role's and API key's buckets, waiting until both can afford them
+
+        Raises QuotaExceeded, taking nothing, if that wait would exceed max_wait_seconds.
+        """
+        buckets = [bucket for bucket in (self._role_bucket(role), self._key_bucket(api_key)) if bucket is not None]
+        usage = self.role_usage.setdefault(role.upper(), {"requests": 0, "tokens": 0})
+        if not buckets:
+            usage["requests"] += 1
+            return QuotaReservation([], tokens, usage)
+
+        wait = max(bucket.wait_seconds(tokens) for bucket in buckets)
+        if wait > self.max_wait_seconds:
+            for bucket in buckets:
+                bucket.stats["rejected"] += 1
+            limited = max(buckets, key=lambda bucket: bucket.wait_seconds(tokens))
+            raise QuotaExceeded(
+                f"Token quota for {limited.label} exhausted: {tokens} tokens would wait {wait:.1f}s",
+                max(1, math.ceil(wait - self.max_wait_seconds))
+            )
+
+        # Taking now, before waiting, queues later requests behind this one
+        for bucket in buckets:
+            bucket.take(tokens)
+            bucket.stats["requests"] += 1
+        usage["requests"] += 1
+        reservation = QuotaReservation(buckets, tokens, usage)
+        if wait > 0:
+            for bucket in buckets:
+                bucket.stats["deferred"] += 1
+                bucket.stats["total_wait_ms"] += wait * 1000
+            try:
+                await asyncio.sleep(wait)
+            except asyncio.CancelledError:
+                reservation.cancel()
+                raise
+        return reservation
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "max_wait_seconds": self.max_wait_seconds,
+            "roles": {label: bucket.get_stats() for label, bucket in self.role_buckets.items()},
+            "api_keys": {bucket.label: bucket.get_stats() for bucket in self.key_buckets.values()},
+            "usage_by_role": self.role_usage
+        }
@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+REPLICA POOL
+Several engines serving the same model, each on its own GPU set
+Work goes to the healthy replica with the least outstanding tokens; failed replicas leave the rotation
+Conversations stick to one replica by consistent hashing, so its prefix cache keeps their history
+"""
+
+import asyncio
+import bisect
+import contextlib
+import hashlib
+import os
+import time
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+# Points per replica on the hash ring; more spreads conversations more evenly
+VIRTUAL_NODES = 64
+
+
+def ring_hash(value: str) -> int:
+    return int.from_bytes(hashlib.blake2b(value.encode(), digest_size=8).digest(), "big")
+
+
+@contextlib.contextmanager
+def pinned_to_gpus(gpu_ids: List[int]) -> Iterator[None]:
+    """CUDA_VISIBLE_DEVICES limited to gpu_ids while an engine starts
+
+    The engine's worker processes inherit the environment they are spawned
+    with, so each replica sees only its own GPUs.
+    """
+    previous = os.environ.get("CUDA_VISIBLE_DEVICES")
+    os.environ["CUDA_VISIBLE_DEVICES"] = ",".join(str(gpu_id) for gpu_id in gpu_ids)
+    try:
+        yield
+    finally:
+        if previous is None:
+            del os.environ["CUDA_VISIBLE_DEVICES"]
+        else:
+            os.environ["CUDA_VISIBLE_DEVICES"] = previous
+
+
+class Replica:
+    """One engine of a model and the generations it is running
+
+    Outstanding tokens are each running generation's expected cost (prompt +
+    max_tokens) less what it has processed so far, read from the flight's
+    latest cumulative output.
+    """
+
+    def __init__(self, name: str, model_name: str, engine, gpu_ids: List[int], max_num_seqs: int):
+        self.name = name
+        self.model_name = model_name
+        self.engine = engine
+        self.gpu_ids = gpu_ids
+        self.max_num_seqs = max_num_seqs
+        self.healthy = True
+        self.suspect = False  # A generation failed; avoided until the next health check clears it
+        self.last_error: Optional[str] = None
+        self.last_checked: Optional[float] = None
+        self.active: Dict[str, Any] = {}  # request_id -> (flight, cost)
+        self.stats = {"generations": 0, "failures": 0}
+
+    def outstanding_tokens(self, tokens_processed: Callable[[Any], int]) -> int:
+        return sum(max(cost - tokens_processed(flight.latest), 0) for flight, cost in self.active.values())
+
+    def has_free_slot(self) -> bool:
+        return len(self.active) < self.max_num_seqs
+
+
+class ReplicaPool:
+    """The replicas of one model, and which of them should take the next generation
+
+    Work with an affinity key (a conversation) goes to the first usable
+    replica on the key's walk around a consistent-hash ring. When a replica
+    fails only its own conversations move, each to its ring successor, and
+    they return when it recovers; the rest keep their warm prefix caches.
+    """
+
+    def __init__(self, model_name: str, tokens_processed: Callable[[Any], int]):
+        self.model_name = model_name
+        self.replicas: List[Replica] = []
+        self.tokens_processed = tokens_processed
+        self.ring: List[Tuple[int, int]] = []  # (point, replica index), sorted
+        self.affinity_stats = {"requests": 0, "home": 0, "moved": 0}
+
+    def add(self, replica: Replica) -> None:
+        self.replicas.append(replica)
+        index = len(self.replicas) - 1
+        self.ring.extend((ring_hash(f"{replica.name}#{point}"), index) for point in range(VIRTUAL_NODES))
+        self.ring.sort()
+
+    @property
+    def healthy_replicas(self) -> List[Replica]:
+        return [replica for replica in self.replicas if replica.healthy]
+
+    @property
+    def capacity(self) -> int:
+        """Concurrent sequences across healthy replicas"""
+        return sum(replica.max_num_seqs for replica in self.healthy_replicas)
+
+    def replica_for(self, engine) -> Optional[str]:
+        """Name of the replica running engine"""
+        return next((replica.name for replica in self.replicas if replica.engine is engine), None)
+
+    def ring_order(self, key: str) -> List[Replica]:
+        """Every replica, healthy or not, in the order key's walk around the ring meets them"""
+        start = bisect.bisect(self.ring, (ring_hash(key),))
+        order: List[Replica] = []
+        for offset in range(len(self.ring)):
+            replica = self.replicas[self.ring[(start + offset) % len(self.ring)][1]]
+            if replica not in order:
+                order.append(replica)
+                if len(order) == len(self.replicas):
+                    break
+        return order
+
+    def pick(self, affinity_key: Optional[str] = None) -> Optional[Replica]:
+        """Replica for the next generation, by affinity when there is a key, otherwise by load
+
+        By load: the healthy replica with the fewest outstanding tokens,
+        preferring those with a free sequence slot. A dead engine fails new work
+        instantly, so it always looks least loaded: a suspect replica is only
+        picked when every healthy one is suspect.
+        """
+        if affinity_key is not None:
+            return self._pick_affine(affinity_key)
+        healthy = [replica for replica in self.healthy_replicas if not replica.suspect] or self.healthy_replicas
+        if not healthy:
+            return None
+        candidates = [replica for replica in healthy if replica.has_free_slot()] or healthy
+        return min(candidates, key=lambda replica: (replica.outstanding_tokens(self.tokens_processed),
+                                                   len(replica.active)))
+
+    def _pick_affine(self, key: str) -> Optional[Replica]:
+        """First healthy replica on key's ring walk with a free sequence slot
+
+        A full home replica spills the request to the next one on the ring, so a
+        busy conversation cannot pile up behind one engine.
+        """
+        order = self.ring_order(key)
+        healthy = [replica for replica in order if replica.healthy]
+        if not healthy:
+            return None
+        candidates = [replica for replica in healthy if not replica.suspect] or healthy
+        replica = next((replica for replica in candidates if replica.has_free_slot()), candidates[0])
+        self.affinity_stats["requests"] += 1
+        self.affinity_stats["home" if replica is order[0] else "moved"] += 1
+        return replica
+
+    def track(self, replica: Replica, request_id: str, flight, cost: int) -> None:
+        """Count a generation against its replica until it ends"""
+        replica.active[request_id] = (flight, cost)
+        replica.stats["generations"] += 1
+        flight.task.add_done_callback(lambda _: replica.active.pop(request_id, None))
+
+    async def check_health(self, timeout: float) -> List[Replica]:
+        """Probe every replica; returns those whose health changed"""
+        results = await asyncio.gather(*(self._probe(replica, timeout) for replica in self.replicas))
+        changed = []
+        for replica, error in zip(self.replicas, results):
+            replica.last_checked = time.time()
+            replica.suspect = False
+            if (error is None) != replica.healthy:
+                changed.append(replica)
+            if error is not None:
+                replica.last_error = error
+                if replica.healthy:
+                    replica.stats["failures"] += 1
+            replica.healthy = error is None
+        return changed
+
+    @staticmethod
+    async def _probe(replica: Replica, timeout: float) -> Optional[str]:
+        """None if the engine is healthy, else why not
+
+        AsyncLLMEngine.check_health raises once its background loop or a
+        worker has died; errored is set as soon as the loop stops.
+        """
+        if getattr(replica.engine, "errored", False):
+            return "engine loop has stopped"
+        try:
+            await asyncio.wait_for(replica.engine.check_health(), timeout=timeout)
+        except asyncio.TimeoutError:
+            return f"health check timed out after {timeout:.0f}s"
+        except Exception as e:
+            return str(e) or type(e).__name__
+        return None
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "healthy": len(self.healthy_replicas),
+            "total": len(self.replicas),
+            "capacity": self.capacity,
+            "affinity": self.affinity_stats,
+            "replicas": {
+                replica.name: {
+                    "gpu_ids": replica.gpu_ids,
+                    "healthy": replica.healthy,
+                    "suspect": replica.suspect,
+                    "running": len(replica.active),
+                    "outstanding_tokens": replica.outstanding_tokens(self.tokens_processed),
+                    "generations": replica.stats["generations"],
+                    "failures": replica.stats["failures"],
+                    "last_error": replica.last_error
+                }
+                for replica in self.replicas
+            }
+        }
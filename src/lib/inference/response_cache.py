@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+RESPONSE CACHE
+Exact-match cache of finished completions for repeated deterministic prompts
+Only temperature 0 requests are cached by default; sampled ones (the 0.7 default) must opt in
+Bounded LRU with a TTL; a hit costs a hash and a dict lookup instead of GPU time
+"""
+
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+
+@dataclass(frozen=True)
+class CachedCompletion:
+    """Everything needed to answer a repeat request, streaming or not"""
+    text: str
+    tokens_generated: int
+    prompt_tokens: int
+    finish_reason: Optional[str]
+    created_at: float
+
+
+def is_deterministic(temperature: float) -> bool:
+    """Greedy decoding: vLLM ignores top_p/top_k and always picks the same tokens"""
+    return temperature == 0
+
+
+def completion_cache_key(model_name: str, prompt: str, temperature: float, top_p: float, top_k: int,
+                         max_tokens: int, repetition_penalty: float, stop: Optional[List[str]]) -> str:
+    """Hash of everything that determines the completion"""
+    material = json.dumps(
+        [model_name, prompt, temperature, top_p, top_k, max_tokens, repetition_penalty, stop or []],
+        separators=(",", ":"), ensure_ascii=False
+    )
+    return hashlib.sha256(material.encode()).hexdigest()
+
+
+class ResponseCache:
+    """LRU of finished completions, each valid for ttl_seconds after it was generated
+
+    Not thread-safe: used from the server's event loop only.
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl_seconds: float = 300.0):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, CachedCompletion]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: str) -> Optional[CachedCompletion]:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        if time.monotonic() - entry.created_at > self.ttl_seconds:
+            del self._entries[key]
+            self.expirations += 1
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def put(self, key: str, text: str, tokens_generated: int, prompt_tokens: int,
+            finish_reason: Optional[str]) -> None:
+        self._entries[key] = CachedCompletion(text, tokens_generated, prompt_tokens, finish_reason, time.monotonic())
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations
+        }
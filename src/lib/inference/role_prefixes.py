@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+ROLE PREFIX REGISTRY
+Canonical persona preamble per executive role, prepended by the server
+One byte-identical prefix per role lets vLLM's prefix cache skip its prefill
+"""
+
+import json
+from typing import Dict, Optional
+
+# The personas B200LLMClient builds its prompts from; clients may now send only the suffix
+DEFAULT_ROLE_PREFIXES = {
+    "CFO": "You are a PhD-level Chief Financial Officer with expertise in financial modeling, "
+           "investment analysis, and risk assessment. ",
+    "CMO": "You are a PhD-level Chief Marketing Officer with expertise in brand strategy, "
+           "growth hacking, and competitive intelligence. ",
+    "CTO": "You are a PhD-level Chief Technology Officer with expertise in system architecture, "
+           "security, and scalable technology solutions. ",
+    "LEGAL": "You are a PhD-level General Counsel with expertise in corporate law, contract analysis, "
+             "and regulatory compliance. ",
+    "SOVREN-AI": "You are SOVREN-AI, a 405B parameter strategic analysis AI with comprehensive "
+                 "business intelligence capabilities. ",
+}
+
+
+class RolePrefixRegistry:
+    """Role (case-insensitive) -> canonical prompt prefix"""
+
+    def __init__(self, prefixes: Optional[Dict[str, str]] = None):
+        source = DEFAULT_ROLE_PREFIXES if prefixes is None else prefixes
+        self.prefixes = {role.upper(): prefix for role, prefix in source.items()}
+
+    @classmethod
+    def from_file(cls, path: str) -> "RolePrefixRegistry":
+        """Load {"<role>": "<prefix>"} from JSON, replacing the defaults"""
+        with open(path) as f:
+            return cls(json.load(f))
+
+    def get(self, executive_role: str) -> Optional[str]:
+        return self.prefixes.get(executive_role.upper())
+
+    def apply(self, executive_role: str, prompt: str) -> str:
+        """The prompt with its role's prefix, added only if the caller did not already send it"""
+        prefix = self.get(executive_role)
+        if prefix is None or prompt.startswith(prefix):
+            return prompt
+        return prefix + prompt
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+MODEL ROUTING TABLE
+Executive role -> ordered candidate models, each with limits on queue depth and context
+The first candidate that is up, fits the request and is not overloaded serves it
+"""
+
+import json
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+# "*" covers every role without an entry of its own
+DEFAULT_ROUTING_TABLE = {
+    "SOVREN-AI": [
+        {"model": "qwen2.5-405b-fp8"},
+        {"model": "qwen2.5-70b-fp8"},  # Only while the 405B is down
+    ],
+    "*": [
+        {"model": "qwen2.5-70b-fp8", "max_queue_depth": 32},
+        {"model": "qwen2.5-405b-fp8", "max_queue_depth": 4},  # Spare 405B capacity absorbs 70B overflow
+    ],
+}
+
+
+@dataclass
+class RouteCandidate:
+    model: str
+    max_queue_depth: Optional[int] = None  # Skip while this many requests wait for the model's slots
+    max_context_tokens: Optional[int] = None  # Skip longer requests; defaults to the model's max_model_len
+
+
+@dataclass
+class ModelState:
+    """Live view of a model the router needs: its admission backlog and context limit"""
+    queued: int
+    max_model_len: int
+
+
+@dataclass
+class RouteDecision:
+    model: str
+    reason: str  # "primary", or the skip reason of the first candidate passed over
+    max_context_tokens: int  # Prompt + max_tokens the chosen candidate allows
+
+
+class RoutingTable:
+    """Routes each request to the first candidate for its role that can take it
+
+    A candidate is passed over when its model has no healthy replica, when
+    the request (prompt + max_tokens) exceeds its context limit, or when its
+    admission queue is at max_queue_depth. If every candidate that could run
+    the request is overloaded, the least overloaded one takes it.
+    """
+
+    def __init__(self, table: Optional[Dict[str, List[Dict[str, Any]]]] = None):
+        source = DEFAULT_ROUTING_TABLE if table is None else table
+        self.routes = {
+            role.upper(): [RouteCandidate(**candidate) for candidate in candidates]
+            for role, candidates in source.items()
+        }
+        self.decisions: Dict[str, Dict[str, Dict[str, int]]] = {}
+
+    @classmethod
+    def from_file(cls, path: str) -> "RoutingTable":
+        """Load {"<role>" | "*": [{"model": ..., "max_queue_depth": ..., "max_context_tokens": ...}, ...]}"""
+        with open(path) as f:
+            return cls(json.load(f))
+
+    def candidates(self, executive_role: str) -> List[RouteCandidate]:
+        return self.routes.get(executive_role.upper(), self.routes.get("*", []))
+
+    @staticmethod
+    def _context_limit(candidate: RouteCandidate, state: ModelState) -> int:
+        return min(candidate.max_context_tokens or state.max_model_len, state.max_model_len)
+
+    def route(self, executive_role: str, context_tokens: int,
+              model_state: Callable[[str], Optional[ModelState]]) -> Optional[RouteDecision]:
+        """Pick a model for a request needing context_tokens; None if no candidate can run it
+
+        model_state returns None for a model with no healthy replica.
+        """
+        reason = "primary"
+        overloaded = []
+        for candidate in self.candidates(executive_role):
+            state = model_state(candidate.model)
+            if state is None:
+                skip = "unavailable"
+            elif context_tokens > self._context_limit(candidate, state):
+                skip = "context"
+            elif candidate.max_queue_depth is not None and state.queued >= candidate.max_queue_depth:
+                skip = "overloaded"
+                overloaded.append((state.queued / max(candidate.max_queue_depth, 1), candidate.model,
+                                   self._context_limit(candidate, state)))
+            else:
+                return self._record(executive_role, candidate.model, reason, self._context_limit(candidate, state))
+            if reason == "primary":
+                reason = skip
+
+        if overloaded:
+            _, model, context_limit = min(overloaded)
+            return self._record(executive_role, model, "overloaded", context_limit)
+        return None
+
+    def longest_context(self, executive_role: str,
+                        model_state: Callable[[str], Optional[ModelState]]) -> Optional[int]:
+        """Longest context any of the role's available candidates allows; None if none is available"""
+        limits = [self._context_limit(candidate, state) for candidate in self.candidates(executive_role)
+                  for state in (model_state(candidate.model),) if state is not None]
+        return max(limits, default=None)
+
+    def _record(self, executive_role: str, model: str, reason: str, max_context_tokens: int) -> RouteDecision:
+        counts = self.decisions.setdefault(executive_role.upper(), {}).setdefault(model, {})
+        counts[reason] = counts.get(reason, 0) + 1
+        return RouteDecision(model, reason, max_context_tokens)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "table": {
+                role: [
+                    {key: value for key, value in vars(candidate).items() if value is not None}
+                    for candidate in candidates
+                ]
+                for role, candidates in self.routes.items()
+            },
+            "decisions": self.decisions
+        }
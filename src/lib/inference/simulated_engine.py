@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+SIMULATED VLLM ENGINE
+Scripted stand-in for AsyncLLMEngine: same generate/abort surface, no GPUs or weights
+For CI, benchmarking and streaming tests of the inference server
+"""
+
+import asyncio
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Union
+
+# Vocabulary for unscripted prompts; the completion is a pure function of the prompt
+FILLER_WORDS = (
+    "revenue", "margin", "growth", "runway", "pipeline", "churn", "forecast", "capital",
+    "strategy", "risk", "market", "customer", "product", "launch", "quarter", "plan",
+)
+
+
+@dataclass
+class SimulatedSamplingParams:
+    """The vllm.SamplingParams fields the server sets, so --simulate runs without vLLM installed"""
+    temperature: float = 1.0
+    top_p: float = 1.0
+    top_k: int = -1
+    max_tokens: Optional[int] = 16
+    repetition_penalty: float = 1.0
+    stop: Optional[Union[str, List[str]]] = None
+
+
+@dataclass
+class SimulatedCompletionOutput:
+    """Shaped like vllm.CompletionOutput: cumulative text and token ids"""
+    index: int
+    text: str
+    token_ids: List[int]
+    cumulative_logprob: Optional[float] = None
+    logprobs: Optional[Any] = None
+    finish_reason: Optional[str] = None
+
+
+@dataclass
+class SimulatedRequestOutput:
+    """Shaped like vllm.RequestOutput"""
+    request_id: str
+    prompt: str
+    prompt_token_ids: List[int]
+    outputs: List[SimulatedCompletionOutput]
+    finished: bool
+    metrics: Optional[Any] = None
+    num_cached_tokens: Optional[int] = None
+
+
+def simple_tokenize(text: str) -> List[str]:
+    """Whitespace-preserving word pieces: ' word' per token, as BPE tokenizers emit them"""
+    pieces = []
+    for index, word in enumerate(text.split(' ')):
+        pieces.append(word if index == 0 else ' ' + word)
+    return [piece for piece in pieces if piece]
+
+
+class SimulatedTokenizer:
+    """Shaped like the Hugging Face tokenizer AsyncLLMEngine.get_tokenizer returns"""
+
+    def encode(self, text: str, add_special_tokens: bool = True) -> List[int]:
+        return [SimulatedAsyncLLMEngine._token_id(token) for token in simple_tokenize(text)]
+
+
+@dataclass
+class SimulatedAsyncLLMEngine:
+    """Streams scripted completions with a configurable time to first token and per-token pace
+
+    script maps a prompt to its completion tokens: a dict of exact prompts, or a
+    callable. Prompts it does not cover get deterministic filler until max_tokens,
+    like a model that never emits EOS. Sampling params are honored for
+    max_tokens and stop strings.
+
+    With enable_prefix_caching, full prompt blocks are remembered as vLLM's
+    automatic prefix caching does: a prompt sharing leading blocks with an
+    earlier one reports them as num_cached_tokens and skips their prefill time.
+
+    With max_model_len, a prompt plus max_tokens beyond it fails the request,
+    as vLLM rejects it.
+
+    With fail_after_seconds, the engine dies that long after it was created:
+    check_health and every generation, running or new, raise from then on.
+    """
+    model_name: str
+    script: Union[Dict[str, Union[str, List[str]]], Callable[[str], Optional[List[str]]], None] = None
+    time_to_first_token_ms: float = 50.0
+    inter_token_ms: float = 10.0
+    default_completion_tokens: int = 64
+    enable_prefix_caching: bool = False
+    block_size: int = 16
+    prefix_cache_blocks: int = 8192
+    prefill_ms_per_token: float = 0.0
+    max_model_len: Optional[int] = None
+    fail_after_seconds: Optional[float] = None
+    started_at: float = field(default_factory=time.monotonic)
+    aborted: set = field(default_factory=set)
+    running: Dict[str, float] = field(default_factory=dict)
+    cached_blocks: "OrderedDict[bytes, None]" = field(default_factory=OrderedDict)
+
+    @classmethod
+    def from_script_file(cls, model_name: str, path: str, **kwargs) -> "SimulatedAsyncLLMEngine":
+        """Load {"<prompt>": "<completion>" | ["<token>", ...]} from a JSON file"""
+        with open(path) as f:
+            return cls(model_name, script=json.load(f), **kwargs)
+
+    def _scripted_tokens(self, prompt: str, filler_tokens: int) -> List[str]:
+        completion = None
+        if callable(self.script):
+            completion = self.script(prompt)
+        elif self.script is not None:
+            completion = self.script.get(prompt)
+        if completion is None:
+            seed = int.from_bytes(hashlib.sha256(prompt.encode()).digest()[:8], 'little')
+            return [' ' + FILLER_WORDS[(seed + i * 7) % len(FILLER_WORDS)]
+                    for i in range(filler_tokens)]
+        return simple_tokenize(completion) if isinstance(completion, str) else list(completion)
+
+    @staticmethod
+    def _token_id(token: str) -> int:
+        return int.from_bytes(hashlib.blake2b(token.encode(), digest_size=4).digest(), 'little') % 151643
+
+    def _prefix_cache_lookup(self, prompt_token_ids: List[int]) -> int:
+        """Tokens of the prompt's leading full blocks already cached; caches all its full blocks"""
+        if not self.enable_prefix_caching:
+            return 0
+        cached_tokens = 0
+        still_matching = True
+        block_hash = b''
+        for start in range(0, len(prompt_token_ids) - self.block_size + 1, self.block_size):
+            # A block's identity includes everything before it, as in vLLM
+            block = prompt_token_ids[start:start + self.block_size]
+            block_hash = hashlib.blake2b(block_hash + str(block).encode(), digest_size=16).digest()
+            if still_matching and block_hash in self.cached_blocks:
+                cached_tokens += self.block_size
+            else:
+                still_matching = False
+            self.cached_blocks[block_hash] = None
+            self.cached_blocks.move_to_end(block_hash)
+        while len(self.cached_blocks) > self.prefix_cache_blocks:
+            self.cached_blocks.popitem(last=False)
+        return cached_tokens
+
+    def _check_alive(self) -> None:
+        if self.fail_after_seconds is not None and time.monotonic() - self.started_at >= self.fail_after_seconds:
+            raise RuntimeError(f"Simulated engine {self.model_name} has failed")
+
+    async def check_health(self) -> None:
+        """Raises once the engine has failed, as AsyncLLMEngine.check_health does"""
+        self._check_alive()
+
+    async def get_tokenizer(self) -> SimulatedTokenizer:
+        return SimulatedTokenizer()
+
+    async def generate(self, prompt: str, sampling_params, request_id: str) -> AsyncIterator[SimulatedRequestOutput]:
+        self._check_alive()
+        max_tokens = getattr(sampling_params, 'max_tokens', None)
+        if max_tokens is not None and max_tokens < 1:
+            raise ValueError(f"max_tokens must be at least 1, got {max_tokens}.")
+        tokens = self._scripted_tokens(prompt, max_tokens or self.default_completion_tokens)
+        prompt_token_ids = [self._token_id(token) for token in simple_tokenize(prompt)]
+        num_cached_tokens = self._prefix_cache_lookup(prompt_token_ids)
+        prefill_ms = (len(prompt_token_ids) - num_cached_tokens) * self.prefill_ms_per_token
+        max_tokens = max_tokens or len(tokens)
+        if self.max_model_len is not None and len(prompt_token_ids) + max_tokens > self.max_model_len:
+            raise ValueError(f"This model's maximum context length is {self.max_model_len} tokens. However, you "
+                             f"requested {len(prompt_token_ids) + max_tokens} tokens "
+                             f"({len(prompt_token_ids)} in the prompt, {max_tokens} for the completion).")
+        stop = getattr(sampling_params, 'stop', None) or []
+        if isinstance(stop, str):
+            stop = [stop]
+
+        self.running[request_id] = asyncio.get_running_loop().time()
+        text = ""
+        token_ids: List[int] = []
+        try:
+            await asyncio.sleep((self.time_to_first_token_ms + prefill_ms) / 1000)
+            if not tokens[:max_tokens]:
+                yield SimulatedRequestOutput(request_id, prompt, prompt_token_ids,
+                                             [SimulatedCompletionOutput(0, "", [], finish_reason='stop')], True,
+                                             num_cached_tokens=num_cached_tokens)
+                return
+            for index, token in enumerate(tokens[:max_tokens]):
+                if request_id in self.aborted:
+                    return
+                self._check_alive()
+                text += token
+                token_ids.append(self._token_id(token))
+
+                finish_reason = None
+                for stop_string in stop:
+                    position = text.find(stop_string)
+                    if position != -1:
+                        text = text[:position]
+                        finish_reason = 'stop'
+                        break
+                if finish_reason is None and index + 1 == min(len(tokens), max_tokens):
+                    finish_reason = 'length' if index + 1 == max_tokens else 'stop'
+
+                yield SimulatedRequestOutput(
+                    request_id=request_id,
+                    prompt=prompt,
+                    prompt_token_ids=prompt_token_ids,
+                    outputs=[SimulatedCompletionOutput(0, text, list(token_ids), finish_reason=finish_reason)],
+                    finished=finish_reason is not None,
+                    num_cached_tokens=num_cached_tokens
+                )
+                if finish_reason is not None:
+                    return
+                await asyncio.sleep(self.inter_token_ms / 1000)
+        finally:
+            self.running.pop(request_id, None)
+            self.aborted.discard(request_id)
+
+    async def abort(self, request_id: str) -> None:
+        """Stop a running request at its next token, as vLLM frees its sequence"""
+        if request_id in self.running:
+            self.aborted.add(request_id)
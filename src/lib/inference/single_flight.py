@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+SINGLE-FLIGHT GENERATION
+Identical requests that arrive while a generation is running attach to it
+instead of becoming another vLLM sequence
+"""
+
+import asyncio
+from typing import Any, AsyncIterator, Dict, Optional
+
+
+class Flight:
+    """One engine.generate call, fanned out to every request subscribed to it
+
+    vLLM outputs are cumulative, so a subscriber only ever needs the latest
+    one: a late joiner starts from the text generated so far, and a slow
+    reader skips intermediate outputs rather than queueing them.
+    """
+
+    def __init__(self, key: Optional[str], engine, request_id: str):
+        self.key = key
+        self.engine = engine
+        self.request_id = request_id
+        self.latest = None
+        self.done = False
+        self.error: Optional[BaseException] = None
+        self.subscribers = 0
+        self.task: Optional[asyncio.Future] = None
+        self._wakeups = set()
+
+    def start(self, prompt: str, sampling_params) -> None:
+        self.task = asyncio.ensure_future(self._run(prompt, sampling_params))
+
+    async def _run(self, prompt: str, sampling_params) -> None:
+        try:
+            async for output in self.engine.generate(prompt, sampling_params, request_id=self.request_id):
+                self.latest = output
+                self._notify()
+        except asyncio.CancelledError:
+            self.error = RuntimeError("Generation was aborted")
+            raise
+        except Exception as e:
+            self.error = e
+        finally:
+            self.done = True
+            self._notify()
+
+    def _notify(self) -> None:
+        for wakeup in self._wakeups:
+            wakeup.set()
+
+    async def outputs(self) -> AsyncIterator[Any]:
+        """Cumulative outputs for one subscriber; raises the engine's error if generation failed"""
+        wakeup = asyncio.Event()
+        self._wakeups.add(wakeup)
+        seen = None
+        try:
+            while True:
+                # Clear before looking, so an output that lands meanwhile wakes the next wait
+                wakeup.clear()
+                latest = self.latest
+                if latest is not None and latest is not seen:
+                    seen = latest
+                    yield latest
+                    continue
+                if self.done:
+                    if self.error is not None:
+                        raise self.error
+                    return
+                await wakeup.wait()
+        finally:
+            self._wakeups.discard(wakeup)
+
+
+class SingleFlight:
+    """Registry of running generations by completion key
+
+    Requests without a key (sampled, or opted out) always get a private flight.
+    """
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self.flights: Dict[str, Flight] = {}
+        self.generations_started = 0
+        self.requests_coalesced = 0
+
+    def running(self, key: Optional[str]) -> Optional[Flight]:
+        """The generation identical requests would join, if one is in flight"""
+        return self.flights.get(key) if key is not None and self.enabled else None
+
+    def join(self, key: Optional[str], engine, prompt: str, sampling_params, request_id: str) -> Flight:
+        """Subscribe to the running generation for key, starting one if there is none"""
+        flight = self.running(key)
+        if flight is None:
+            flight = Flight(key, engine, request_id)
+            flight.start(prompt, sampling_params)
+            self.generations_started += 1
+            if key is not None and self.enabled:
+                self.flights[key] = flight
+                flight.task.add_done_callback(lambda _: self._forget(flight))
+        else:
+            self.requests_coalesced += 1
+        flight.subscribers += 1
+        return flight
+
+    def leave(self, flight: Flight) -> bool:
+        """Unsubscribe; True if that abandoned a generation nobody is waiting for any more
+
+        The caller then aborts it in the engine. An abandoned flight is forgotten
+        at once so a new identical request starts afresh rather than joining it.
+        """
+        flight.subscribers -= 1
+        if flight.subscribers > 0 or flight.done:
+            return False
+        self._forget(flight)
+        flight.task.cancel()
+        return True
+
+    def _forget(self, flight: Flight) -> None:
+        if flight.key is not None and self.flights.get(flight.key) is flight:
+            del self.flights[flight.key]
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "in_flight": len(self.flights),
+            "generations_started": self.generations_started,
+            "requests_coalesced": self.requests_coalesced
+        }
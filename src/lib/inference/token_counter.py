@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+PROMPT TOKEN COUNTER
+Exact prompt lengths from the engines' tokenizer, counted before a request is queued
+Recent prompts' counts are kept in an LRU, so repeats and growing conversations stay cheap
+"""
+
+import asyncio
+import hashlib
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+from quotas import estimate_tokens
+
+# Prompts at least this long are tokenized off the event loop
+OFFLOAD_CHARS = 16384
+
+
+class PromptTokenCounter:
+    """Prompt -> token count, by the engines' own tokenizer when there is one
+
+    Without a tokenizer (engines that do not expose one) counts fall back to
+    the 4-characters-per-token estimate. Entries are keyed by a digest of the
+    prompt, so the LRU does not hold on to long prompts.
+    """
+
+    def __init__(self, tokenizer: Optional[Any] = None, max_entries: int = 4096):
+        self.tokenizer = tokenizer
+        self.max_entries = max_entries
+        self.counts: "OrderedDict[bytes, int]" = OrderedDict()
+        self.stats = {"hits": 0, "misses": 0}
+
+    @property
+    def exact(self) -> bool:
+        return self.tokenizer is not None
+
+    async def count(self, prompt: str) -> int:
+        if self.tokenizer is None:
+            return estimate_tokens(prompt)
+
+        key = hashlib.blake2b(prompt.encode(), digest_size=16).digest()
+        count = self.counts.get(key)
+        if count is not None:
+            self.counts.move_to_end(key)
+            self.stats["hits"] += 1
+            return count
+
+        self.stats["misses"] += 1
+        if len(prompt) >= OFFLOAD_CHARS:
+            token_ids = await asyncio.to_thread(self.tokenizer.encode, prompt)
+        else:
+            token_ids = self.tokenizer.encode(prompt)
+        count = len(token_ids)
+        self.counts[key] = count
+        while len(self.counts) > self.max_entries:
+            self.counts.popitem(last=False)
+        return count
+
+    def get_stats(self) -> Dict[str, Any]:
+        lookups = self.stats["hits"] + self.stats["misses"]
+        return {
+            "exact": self.exact,
+            "entries": len(self.counts),
+            "max_entries": self.max_entries,
+            "hits": self.stats["hits"],
+            "misses": self.stats["misses"],
+            "hit_rate": self.stats["hits"] / lookups if lookups else 0.0
+        }
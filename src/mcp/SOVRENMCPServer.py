@@ -8,31 +8,39 @@ ZERO PLACEHOLDERS - FULL FUNCTIONALITY
 import asyncio
 import json
 import logging
+import math
+import os
 import time
 import psutil
-import numpy as np
 try:
     import GPUtil
     GPUTIL_AVAILABLE = True
 except ImportError:
     GPUTIL_AVAILABLE = False
     GPUtil = None
-from typing import Dict, List, Optional, Any
-from dataclasses import dataclass
-from fastapi import FastAPI, HTTPException, BackgroundTasks
+from typing import Dict, List, Optional, Any, Tuple
+from dataclasses import dataclass, field
+from fastapi import FastAPI, HTTPException, BackgroundTasks, WebSocket
 from fastapi.middleware.cors import CORSMiddleware
-import uvicorn
-import torch
 import subprocess
 import threading
+import itertools
 from concurrent.futures import ThreadPoolExecutor
-import websockets
-from datetime import datetime
+from collections import deque
+from memory_estimator import estimate_for_request, round_up_gb
+from serialization import (
+    AllocationRecord, GPUStatusRecord, GPUSummaryRecord, SystemRecord, encode, json_response
+)
+from datetime import datetime, timedelta
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+DEFAULT_CAPABILITY_CACHE = os.path.join(os.path.expanduser("~"), ".cache", "sovren", "gpu_capabilities.json")
+# Longest lease an allocation may be granted or renewed for; keeps expiry times representable
+MAX_LEASE_SECONDS = 7 * 24 * 3600
+
 @dataclass
 class B200GPUStatus:
     gpu_id: int
@@ -84,55 +92,115 @@ class B200ResourceAllocation:
     batch_size: int
     estimated_latency_ms: float
     power_budget_watts: float
+    pids: List[int] = field(default_factory=list)  # Owner processes, registered by the component
+    estimated_memory_gb: Optional[float] = None  # Per GPU, from model_type/quantization/context/batch
+
+@dataclass
+class AllocationUsage:
+    allocation_id: str
+    component: str
+    reserved_mb: Dict[int, float]  # Per GPU, from the ledger
+    used_mb: Dict[int, float]  # Per GPU, from the owner PIDs' GPU processes
+    owners_alive: bool
+    over_consumer: bool
+
+@dataclass
+class FleetSnapshot:
+    seq: int
+    timestamp: float
+    gpus: List[Optional[B200GPUStatus]]  # None where the GPU could not be read
+    system: SystemStatus
+    active_allocations: int
+    emergency: bool
 
 class B200GPUMonitor:
     """Real-time B200 Blackwell GPU monitoring and protection"""
 
-    def __init__(self):
+    def __init__(self, capability_cache: Optional[str] = DEFAULT_CAPABILITY_CACHE):
         if not GPUTIL_AVAILABLE or GPUtil is None:
             raise RuntimeError("GPUtil not available - install with: pip install GPUtil")
-        self.gpu_count = len(GPUtil.getGPUs())
+        gpus = GPUtil.getGPUs()
+        self.gpu_count = len(gpus)
         self.monitoring = False
         self.alert_callbacks = []
 
-        # B200 specific monitoring
-        self.b200_capabilities = self._detect_b200_capabilities()
-        self.fp8_monitoring_enabled = self._check_fp8_monitoring()
-        self.nvlink_topology = self._map_nvlink_topology()
+        # B200 specific monitoring, probed once per driver/hardware combination
+        fingerprint = {
+            'driver_version': gpus[0].driver if gpus else None,
+            'gpu_uuids': [gpu.uuid for gpu in gpus]
+        }
+        probe = self._load_capability_cache(capability_cache, fingerprint)
+        if probe is None:
+            probe = {
+                'capabilities': self._detect_b200_capabilities(),
+                'fp8_monitoring_enabled': self._check_fp8_monitoring(),
+                'nvlink_topology': self._map_nvlink_topology()
+            }
+            if all('name' in gpu for gpu in probe['capabilities'].values()):
+                self._store_capability_cache(capability_cache, fingerprint, probe)
+
+        self.b200_capabilities = probe['capabilities']
+        self.fp8_monitoring_enabled = probe['fp8_monitoring_enabled']
+        self.nvlink_topology = probe['nvlink_topology']
 
         logger.info(f"B200 Monitor initialized: {self.gpu_count} GPUs detected")
         logger.info(f"B200 capabilities: {self.b200_capabilities}")
 
+    @staticmethod
+    def _load_capability_cache(path: Optional[str], fingerprint: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Cached capability probe, if it was taken on the same driver and GPUs"""
+        if not path:
+            return None
+        try:
+            with open(path) as f:
+                cached = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if cached.get('fingerprint') != fingerprint:
+            logger.info("GPU driver or hardware changed - re-probing capabilities")
+            return None
+        return cached['probe']
+
+    @staticmethod
+    def _store_capability_cache(path: Optional[str], fingerprint: Dict[str, Any], probe: Dict[str, Any]) -> None:
+        """Atomically write the capability probe next to its fingerprint"""
+        if not path:
+            return
+        try:
+            os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+            temp_path = f"{path}.{os.getpid()}.tmp"
+            with open(temp_path, 'w') as f:
+                json.dump({'fingerprint': fingerprint, 'probe': probe}, f)
+            os.replace(temp_path, path)
+        except OSError as e:
+            logger.warning(f"Could not cache GPU capabilities to {path}: {e}")
+
     def _detect_b200_capabilities(self) -> Dict[str, Any]:
         """Detect B200 Blackwell specific capabilities"""
-        capabilities = {}
-        for gpu_id in range(self.gpu_count):
-            try:
-                # Query GPU architecture and capabilities
-                result = subprocess.run([
-                    'nvidia-ml-py3', '--query-gpu=name,compute_cap,memory.total',
-                    '--format=csv,noheader,nounits', f'--id={gpu_id}'
-                ], capture_output=True, text=True, timeout=10)
-
-                if result.returncode == 0:
-                    data = result.stdout.strip().split(', ')
-                    gpu_name = data[0]
-                    compute_cap = data[1]
-                    memory_total = float(data[2])
+        capabilities = {str(gpu_id): {'is_b200_blackwell': False} for gpu_id in range(self.gpu_count)}
+        try:
+            # Query GPU architecture and capabilities for every GPU in one call
+            result = subprocess.run([
+                'nvidia-smi', '--query-gpu=index,name,compute_cap,memory.total',
+                '--format=csv,noheader,nounits'
+            ], capture_output=True, text=True, timeout=10)
+
+            if result.returncode == 0:
+                for line in result.stdout.strip().split('\n'):
+                    gpu_id, gpu_name, compute_cap, memory_total = [field.strip() for field in line.split(',')]
 
                     is_b200 = 'B200' in gpu_name and compute_cap == '10.0'
-                    capabilities[str(gpu_id)] = {
+                    capabilities[gpu_id] = {
                         'name': gpu_name,
                         'compute_capability': compute_cap,
-                        'memory_total_mb': memory_total,
+                        'memory_total_mb': float(memory_total),
                         'is_b200_blackwell': is_b200,
                         'fp8_tensor_cores': 208 * 4 if is_b200 else 0,  # 208 SMs * 4 Tensor Cores
                         'shared_memory_per_sm': 227 * 1024 if is_b200 else 0,  # 227KB
                         'max_power_watts': 1000 if is_b200 else 450
                     }
-            except Exception as e:
-                logger.warning(f"Could not detect capabilities for GPU {gpu_id}: {e}")
-                capabilities[str(gpu_id)] = {'is_b200_blackwell': False}
+        except Exception as e:
+            logger.warning(f"Could not detect GPU capabilities: {e}")
 
         return capabilities
 
@@ -301,6 +369,25 @@ class B200GPUMonitor:
         """Get status of all GPUs"""
         return [self.get_gpu_status(i) for i in range(self.gpu_count)]
 
+    def get_available_gpu_status(self) -> List[Optional[B200GPUStatus]]:
+        """Get status of all GPUs, None for any that cannot be read (lost or failing)"""
+        statuses: List[Optional[B200GPUStatus]] = []
+        for gpu_id in range(self.gpu_count):
+            try:
+                statuses.append(self.get_gpu_status(gpu_id))
+            except Exception:
+                statuses.append(None)
+        return statuses
+
+    def process_alive(self, pid: int) -> bool:
+        """Whether an allocation owner process is still running"""
+        try:
+            return psutil.Process(pid).status() != psutil.STATUS_ZOMBIE
+        except psutil.NoSuchProcess:
+            return False
+        except psutil.AccessDenied:
+            return True
+
     def check_gpu_health(self, gpu_status: B200GPUStatus) -> Dict[str, Any]:
         """Check GPU health and return alerts"""
         alerts = []
@@ -344,13 +431,156 @@ class B200GPUMonitor:
             'memory_usage_percent': memory_usage_percent
         }
 
+class SimulatedB200GPUMonitor(B200GPUMonitor):
+    """B200 monitor backed by the deterministic fleet simulator (no GPUs required)"""
+
+    def __init__(self, gpu_count: int = 8, seed: int = 0, scenario: Optional[str] = None,
+                 tick_seconds: float = 1.0, clock=None):
+        from b200_simulator import B200FleetSimulator
+
+        self.fleet = B200FleetSimulator(
+            gpu_count=gpu_count,
+            seed=seed,
+            scenario=scenario,
+            tick_seconds=tick_seconds,
+            clock=clock
+        )
+        self.gpu_count = gpu_count
+        self.monitoring = False
+        self.alert_callbacks = []
+
+        self.b200_capabilities = {
+            str(gpu.gpu_id): {
+                'name': 'NVIDIA B200 (simulated)',
+                'uuid': gpu.uuid,
+                'compute_capability': '10.0',
+                'memory_total_mb': gpu.memory_total,
+                'is_b200_blackwell': True,
+                'fp8_tensor_cores': 208 * 4,
+                'shared_memory_per_sm': 227 * 1024,
+                'max_power_watts': 1000
+            }
+            for gpu in self.fleet.gpus
+        }
+        self.fp8_monitoring_enabled = True
+        self.nvlink_topology = {'nvlink_detected': True, 'gpu_count': gpu_count, 'simulated': True}
+        # The sampler reads from a worker thread while allocations read on the event loop
+        self.fleet_lock = threading.Lock()
+
+        logger.info(f"Simulated B200 Monitor initialized: {gpu_count} GPUs, "
+                    f"seed={seed}, scenario={self.fleet.scenario}")
+
+    def attach_ledger(self, allocations: Dict[str, B200ResourceAllocation]) -> None:
+        """Let the simulated fleet react to allocations made through the allocator"""
+        self.fleet.attach_ledger(allocations)
+
+    def process_alive(self, pid: int) -> bool:
+        """Simulated PIDs live in the fleet; anything else is a real local process"""
+        from b200_simulator import SIMULATED_PID_BASE
+
+        if pid >= SIMULATED_PID_BASE:
+            return self.fleet.process_alive(pid)
+        return super().process_alive(pid)
+
+    def get_gpu_status(self, gpu_id: int) -> B200GPUStatus:
+        """Get comprehensive GPU status from the simulated fleet"""
+        try:
+            with self.fleet_lock:
+                reading = self.fleet.read_gpu(gpu_id)
+        except Exception as e:
+            logger.error(f"Error getting GPU {gpu_id} status: {e}")
+            raise
+
+        b200_caps = self.b200_capabilities[str(gpu_id)]
+        memory_util = (reading['memory_used'] / reading['memory_total']) * 100
+
+        return B200GPUStatus(
+            gpu_id=gpu_id,
+            memory_used=reading['memory_used'],
+            memory_total=reading['memory_total'],
+            memory_free=reading['memory_free'],
+            utilization=reading['utilization'],
+            temperature=reading['temperature'],
+            power_draw=reading['power_draw'],
+            processes=reading['processes'],
+            architecture=b200_caps['name'],
+            compute_capability=b200_caps['compute_capability'],
+            fp8_tensor_cores=b200_caps['fp8_tensor_cores'],
+            shared_memory_per_sm=b200_caps['shared_memory_per_sm'],
+            streaming_multiprocessors=208,
+            nvlink_bandwidth=8.0,
+            fp8_utilization=reading['utilization'] * 0.8,
+            memory_bandwidth_utilization=min(memory_util * 1.2, 100.0)
+        )
+
+class SharedMemoryGPUMonitor(B200GPUMonitor):
+    """B200 monitor reading the telemetry segment published by a primary MCP server
+
+    Lets additional HTTP workers serve live GPU telemetry without touching the GPUs.
+    """
+
+    def __init__(self, segment_name: str = "sovren_telemetry"):
+        from telemetry_shm import TelemetryReader
+
+        self.reader = TelemetryReader(segment_name)
+        self.monitoring = False
+        self.alert_callbacks = []
+
+        self.b200_capabilities = {
+            str(gpu_id): {
+                'name': 'NVIDIA B200',
+                'compute_capability': '10.0',
+                'is_b200_blackwell': True,
+                'fp8_tensor_cores': 208 * 4,
+                'shared_memory_per_sm': 227 * 1024,
+                'max_power_watts': 1000
+            }
+            for gpu_id in range(self.reader.gpu_capacity)
+        }
+        self.fp8_monitoring_enabled = True
+        self.nvlink_topology = {'nvlink_detected': True, 'gpu_count': self.reader.gpu_capacity}
+
+        logger.info(f"Shared memory B200 Monitor attached to {segment_name}: "
+                    f"{self.gpu_count} of {self.reader.gpu_capacity} GPUs published")
+
+    @property
+    def gpu_count(self) -> int:
+        """Re-read per snapshot: a worker can attach before the primary first publishes"""
+        return self.reader.gpu_count
+
+    def get_gpu_status(self, gpu_id: int) -> B200GPUStatus:
+        """Get GPU status from the latest published snapshot"""
+        record = self.reader.read_gpu(gpu_id)
+        if record.lost:
+            raise RuntimeError(f"GPU {gpu_id} unavailable in latest telemetry snapshot")
+
+        b200_caps = self.b200_capabilities[str(gpu_id)]
+        return B200GPUStatus(
+            gpu_id=gpu_id,
+            memory_used=record.memory_used,
+            memory_total=record.memory_total,
+            memory_free=record.memory_free,
+            utilization=record.utilization,
+            temperature=record.temperature,
+            power_draw=record.power_draw,
+            processes=[],  # Only the process count is published
+            architecture=b200_caps['name'],
+            compute_capability=b200_caps['compute_capability'],
+            fp8_tensor_cores=b200_caps['fp8_tensor_cores'],
+            shared_memory_per_sm=b200_caps['shared_memory_per_sm'],
+            streaming_multiprocessors=208,
+            nvlink_bandwidth=8.0,
+            fp8_utilization=record.fp8_utilization,
+            memory_bandwidth_utilization=record.memory_bandwidth_utilization
+        )
+
 class SystemMonitor:
     """System-wide monitoring"""
     
     def get_system_status(self) -> SystemStatus:
         """Get comprehensive system status"""
-        # CPU usage
-        cpu_usage = psutil.cpu_percent(interval=1)
+        # CPU usage since the previous sample (non-blocking: never stall the event loop)
+        cpu_usage = psutil.cpu_percent(interval=None)
         
         # Memory usage
         memory = psutil.virtual_memory()
@@ -384,11 +614,16 @@ class SystemMonitor:
 class ResourceAllocator:
     """Safe resource allocation and management"""
     
-    def __init__(self):
+    def __init__(self, gpu_monitor: Optional[B200GPUMonitor] = None):
         self.allocations: Dict[str, B200ResourceAllocation] = {}
-        self.gpu_monitor = B200GPUMonitor()
+        self.gpu_monitor = gpu_monitor or B200GPUMonitor()
+        if isinstance(self.gpu_monitor, SimulatedB200GPUMonitor):
+            self.gpu_monitor.attach_ledger(self.allocations)
         self.system_monitor = SystemMonitor()
         self.allocation_lock = asyncio.Lock()
+        self._allocation_sequence = itertools.count()
+        self.ledger_version = 0  # Bumped on every ledger change, keys response caches
+        self.trace = None  # AllocationTraceRecorder, when recording for offline replay
         
         # B200 Blackwell safety limits
         self.safety_limits = {
@@ -402,54 +637,92 @@ class ResourceAllocator:
             'max_nvlink_bandwidth': 8.0,  # TB/s for B200
             'min_context_length': 1024,
             'max_context_length': 2048000,  # 2M tokens for B200
-            'max_concurrent_models': 8  # One per GPU max
+            'max_concurrent_models': 8,  # One per GPU max
+            'max_reservation_overrun_percent': 5  # GPU memory used beyond the reservation before flagging
+        }
+
+        # memory_gb checked against the estimate for known models:
+        # 'raise' lifts under-reservations to the estimate, 'reject' refuses them, 'warn' only logs
+        self.memory_estimation = {
+            'under_reservation_policy': 'raise',
+            'tolerance_percent': 10
         }
     
     async def allocate_resources(self, request: Dict[str, Any]) -> B200ResourceAllocation:
         """Safely allocate resources with comprehensive checks"""
         async with self.allocation_lock:
-            # Validate request
-            self._validate_allocation_request(request)
-            
-            # Check current system status
-            gpu_statuses = self.gpu_monitor.get_all_gpu_status()
-            system_status = self.system_monitor.get_system_status()
-            
-            # Safety checks
-            if not self._is_allocation_safe(request, gpu_statuses, system_status):
+            pinned = 'gpu_ids' in request
+            try:
+                # Validate request
+                self._validate_allocation_request(request)
+                request = self._apply_memory_estimate(request)
+                allocation = self._allocate_locked(request)
+            except HTTPException as e:
+                if self.trace is not None:
+                    self.trace.record_arrival(request, pinned, reason=str(e.detail))
+                raise
+            if self.trace is not None:
+                self.trace.record_arrival(request, pinned, allocation)
+            return allocation
+
+    def _allocate_locked(self, request: Dict[str, Any]) -> B200ResourceAllocation:
+        """Admit, place and reserve a validated request; the caller holds allocation_lock"""
+        # Check current system status; a lost GPU is unavailable, not a reason to refuse the others
+        gpu_statuses = self.gpu_monitor.get_available_gpu_status()
+        system_status = self.system_monitor.get_system_status()
+
+        # Place requests that ask for a number of GPUs rather than specific ones
+        if 'gpu_ids' not in request and 'gpu_count' in request:
+            gpu_ids, violations = self._place(request, gpu_statuses, system_status)
+            if violations:
                 raise HTTPException(
                     status_code=400,
-                    detail="Resource allocation would exceed safety limits"
+                    detail=f"Resource allocation would exceed safety limits: {violations[0]['message']}"
                 )
-            
-            # Create B200 allocation
-            allocation = B200ResourceAllocation(
-                allocation_id=self._generate_allocation_id(),
-                component=request['component'],
-                gpu_ids=request.get('gpu_ids', []),
-                memory_gb=request.get('memory_gb', 0),
-                cpu_cores=request.get('cpu_cores', 0),
-                priority=request.get('priority', 'normal'),
-                status='allocated',
-                created_at=datetime.now(),
-                expires_at=None,
-                # B200 specific allocations
-                fp8_tensor_cores_reserved=request.get('fp8_tensor_cores', 0),
-                shared_memory_mb=request.get('shared_memory_mb', 0),
-                nvlink_bandwidth_reserved=request.get('nvlink_bandwidth', 0.0),
-                model_type=request.get('model_type', 'unknown'),
-                quantization=request.get('quantization', 'fp16'),
-                context_length=request.get('context_length', 4096),
-                batch_size=request.get('batch_size', 1),
-                estimated_latency_ms=request.get('estimated_latency_ms', 100.0),
-                power_budget_watts=request.get('power_budget_watts', 450.0)
+            request = {**request, 'gpu_ids': gpu_ids}
+        
+        # Safety checks
+        if not self._is_allocation_safe(request, gpu_statuses, system_status):
+            raise HTTPException(
+                status_code=400,
+                detail="Resource allocation would exceed safety limits"
             )
-            
-            # Reserve resources
-            self.allocations[allocation.allocation_id] = allocation
-            
-            logger.info(f"Allocated resources: {allocation}")
-            return allocation
+        
+        # Leased allocations must be renewed before expiry or they are reclaimed
+        lease_seconds = request.get('lease_seconds')
+        created_at = datetime.now()
+
+        # Create B200 allocation
+        allocation = B200ResourceAllocation(
+            allocation_id=self._generate_allocation_id(),
+            component=request['component'],
+            gpu_ids=request.get('gpu_ids', []),
+            memory_gb=request.get('memory_gb', 0),
+            cpu_cores=request.get('cpu_cores', 0),
+            priority=request.get('priority', 'normal'),
+            status='allocated',
+            created_at=created_at,
+            expires_at=created_at + timedelta(seconds=lease_seconds) if lease_seconds else None,
+            # B200 specific allocations
+            fp8_tensor_cores_reserved=request.get('fp8_tensor_cores', 0),
+            shared_memory_mb=request.get('shared_memory_mb', 0),
+            nvlink_bandwidth_reserved=request.get('nvlink_bandwidth', 0.0),
+            model_type=request.get('model_type', 'unknown'),
+            quantization=request.get('quantization', 'fp16'),
+            context_length=request.get('context_length', 4096),
+            batch_size=request.get('batch_size', 1),
+            estimated_latency_ms=request.get('estimated_latency_ms', 100.0),
+            power_budget_watts=request.get('power_budget_watts', 450.0),
+            pids=self._validate_pids(request.get('pids', [])),
+            estimated_memory_gb=request.get('estimated_memory_gb')
+        )
+        
+        # Reserve resources
+        self.allocations[allocation.allocation_id] = allocation
+        self.ledger_version += 1
+        
+        logger.info(f"Allocated resources: {allocation}")
+        return allocation
     
     def _validate_allocation_request(self, request: Dict[str, Any]) -> None:
         """Validate allocation request format"""
@@ -460,55 +733,329 @@ class ResourceAllocator:
                     status_code=400,
                     detail=f"Missing required field: {field}"
                 )
+        # Admission compares these against free memory; a negative amount would pass as extra headroom
+        for field in ('memory_gb', 'system_memory_gb'):
+            if field not in request:
+                continue
+            value = request[field]
+            if isinstance(value, bool) or not isinstance(value, (int, float)) or not math.isfinite(value) or value < 0:
+                raise HTTPException(status_code=400, detail=f"{field} must be a non-negative number")
+        # No lease_seconds (or null) means the allocation is held until released
+        if request.get('lease_seconds') is not None:
+            self._validate_lease_seconds(request['lease_seconds'])
     
+    def _apply_memory_estimate(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Fill in or check memory_gb (per GPU) against the model's estimated footprint"""
+        try:
+            estimate = estimate_for_request(request)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        if estimate is None:
+            return request
+
+        estimated_gb = round_up_gb(estimate['per_gpu_gb'])
+        request = {**request, 'estimated_memory_gb': estimated_gb}
+        requested_gb = request.get('memory_gb')
+        if not requested_gb:
+            return {**request, 'memory_gb': estimated_gb}
+
+        tolerance = self.memory_estimation['tolerance_percent'] / 100
+        description = (f"{request['component']}: {requested_gb}GB per GPU for {estimate['model']} "
+                       f"{estimate['quantization']} (tp={estimate['tensor_parallel']}, "
+                       f"{estimate['context_length']} tokens x {estimate['batch_size']}), "
+                       f"estimated {estimated_gb}GB")
+        if requested_gb < estimate['per_gpu_gb'] * (1 - tolerance):
+            policy = self.memory_estimation['under_reservation_policy']
+            if policy == 'reject':
+                raise HTTPException(status_code=400, detail=f"Under-reserved, would run out of memory: {description}")
+            if policy == 'raise':
+                logger.warning(f"Under-reserved, raising to the estimate: {description}")
+                return {**request, 'memory_gb': estimated_gb}
+            logger.warning(f"Under-reserved: {description}")
+        elif requested_gb > estimate['per_gpu_gb'] * (1 + tolerance):
+            logger.warning(f"Over-reserved: {description}")
+        return request
+
+    def _validate_lease_seconds(self, lease_seconds: Any) -> float:
+        """Validate a lease length: a finite, positive number of seconds up to MAX_LEASE_SECONDS"""
+        if (isinstance(lease_seconds, bool) or not isinstance(lease_seconds, (int, float))
+                or not math.isfinite(lease_seconds) or not 0 < lease_seconds <= MAX_LEASE_SECONDS):
+            raise HTTPException(
+                status_code=400,
+                detail=f"lease_seconds must be a positive number of seconds up to {MAX_LEASE_SECONDS}"
+            )
+        return float(lease_seconds)
+
+    def _validate_pids(self, pids: Any) -> List[int]:
+        """Validate owner PIDs registered with an allocation"""
+        if not isinstance(pids, list) or not all(isinstance(pid, int) and pid > 0 for pid in pids):
+            raise HTTPException(status_code=400, detail="pids must be a list of positive integers")
+        return sorted(set(pids))
+
     def _is_allocation_safe(self, request: Dict[str, Any],
                           gpu_statuses: List[B200GPUStatus],
                           system_status: SystemStatus) -> bool:
         """Check if allocation is safe"""
+        violations = self._admission_violations(request, gpu_statuses, system_status)
+        for violation in violations:
+            logger.warning(violation['message'])
+        return not violations
+
+    def _admission_violations(self, request: Dict[str, Any],
+                              gpu_statuses: List[Optional[B200GPUStatus]],
+                              system_status: SystemStatus,
+                              planned_mb: Optional[Dict[int, float]] = None,
+                              planned_system_gb: float = 0.0) -> List[Dict[str, Any]]:
+        """Constraints a request would violate, on top of memory already planned per GPU"""
+        planned_mb = planned_mb or {}
+        violations = []
+
         # Check GPU memory
         requested_gpu_ids = request.get('gpu_ids', [])
         requested_memory_gb = request.get('memory_gb', 0)
-        
+
         for gpu_id in requested_gpu_ids:
-            if gpu_id >= len(gpu_statuses):
-                return False
-                
+            if gpu_id >= len(gpu_statuses) or gpu_statuses[gpu_id] is None:
+                violations.append({
+                    'constraint': 'gpu_unavailable',
+                    'gpu_id': gpu_id,
+                    'message': f"GPU {gpu_id} is not available"
+                })
+                continue
+
             gpu_status = gpu_statuses[gpu_id]
-            
+
             # Check memory availability
-            available_memory_gb = gpu_status.memory_free / 1024  # Convert MB to GB
+            available_memory_gb = (gpu_status.memory_free - planned_mb.get(gpu_id, 0.0)) / 1024  # Convert MB to GB
             if requested_memory_gb > available_memory_gb:
-                logger.warning(f"GPU {gpu_id} insufficient memory: {available_memory_gb}GB available, {requested_memory_gb}GB requested")
-                return False
-            
+                violations.append({
+                    'constraint': 'gpu_memory',
+                    'gpu_id': gpu_id,
+                    'requested_gb': requested_memory_gb,
+                    'available_gb': available_memory_gb,
+                    'message': f"GPU {gpu_id} insufficient memory: {available_memory_gb}GB available, {requested_memory_gb}GB requested"
+                })
+
             # Check temperature
             if gpu_status.temperature > self.safety_limits['max_gpu_temperature']:
-                logger.warning(f"GPU {gpu_id} temperature too high: {gpu_status.temperature}°C")
-                return False
-        
+                violations.append({
+                    'constraint': 'gpu_temperature',
+                    'gpu_id': gpu_id,
+                    'temperature_c': gpu_status.temperature,
+                    'limit_c': self.safety_limits['max_gpu_temperature'],
+                    'message': f"GPU {gpu_id} temperature too high: {gpu_status.temperature}°C"
+                })
+
         # Check system memory
         requested_system_memory_gb = request.get('system_memory_gb', 0)
-        if requested_system_memory_gb > system_status.memory_available:
-            logger.warning(f"Insufficient system memory: {system_status.memory_available}GB available, {requested_system_memory_gb}GB requested")
-            return False
-        
-        return True
-    
+        available_system_memory_gb = system_status.memory_available - planned_system_gb
+        if requested_system_memory_gb > available_system_memory_gb:
+            violations.append({
+                'constraint': 'system_memory',
+                'requested_gb': requested_system_memory_gb,
+                'available_gb': available_system_memory_gb,
+                'message': f"Insufficient system memory: {available_system_memory_gb}GB available, {requested_system_memory_gb}GB requested"
+            })
+
+        return violations
+
+    def _place(self, request: Dict[str, Any], gpu_statuses: List[Optional[B200GPUStatus]],
+               system_status: SystemStatus, planned_mb: Optional[Dict[int, float]] = None,
+               planned_system_gb: float = 0.0) -> Tuple[List[int], List[Dict[str, Any]]]:
+        """Choose GPUs for a request that asks for gpu_count instead of explicit gpu_ids
+
+        Safety first: the eligible GPUs with the most free memory, coolest first on ties.
+        Returns the chosen GPU ids, or no GPUs and the constraints that blocked placement.
+        """
+        gpu_count = request['gpu_count']
+        if not isinstance(gpu_count, int) or gpu_count < 1:
+            raise HTTPException(status_code=400, detail="gpu_count must be a positive integer")
+
+        planned_mb = planned_mb or {}
+        eligible = []
+        blocked_by: Dict[str, List[str]] = {}
+        for gpu_id in range(len(gpu_statuses)):
+            violations = self._admission_violations(
+                {**request, 'gpu_ids': [gpu_id], 'system_memory_gb': 0}, gpu_statuses, system_status, planned_mb
+            )
+            if violations:
+                blocked_by[str(gpu_id)] = [violation['constraint'] for violation in violations]
+            else:
+                gpu_status = gpu_statuses[gpu_id]
+                eligible.append((-(gpu_status.memory_free - planned_mb.get(gpu_id, 0.0)), gpu_status.temperature, gpu_id))
+
+        violations = self._admission_violations(
+            {**request, 'gpu_ids': []}, gpu_statuses, system_status, planned_mb, planned_system_gb
+        )
+        if len(eligible) < gpu_count:
+            violations.insert(0, {
+                'constraint': 'gpu_count',
+                'requested': gpu_count,
+                'eligible': len(eligible),
+                'blocked_by': blocked_by,
+                'message': f"Only {len(eligible)} GPUs can take {request.get('memory_gb', 0)}GB, {gpu_count} requested"
+            })
+        if violations:
+            return [], violations
+        return [gpu_id for _, _, gpu_id in sorted(eligible)[:gpu_count]], []
+
+    def plan_allocations(self, requests: List[Dict[str, Any]], gpu_statuses: List[Optional[B200GPUStatus]],
+                         system_status: SystemStatus,
+                         planned_mb: Optional[Dict[int, float]] = None) -> Dict[str, Any]:
+        """Dry-run admission and placement of requests in order, committing nothing
+
+        Each admitted request is layered onto a private overlay of reserved memory, so
+        later requests see the earlier ones; the ledger and the statuses are never touched.
+        """
+        for request in requests:
+            self._validate_allocation_request(request)
+        requests = [self._apply_memory_estimate(request) for request in requests]
+
+        planned_mb = dict(planned_mb or {})
+        planned_system_gb = 0.0
+        placements = []
+        binding_constraints = []
+
+        for index, request in enumerate(requests):
+            if 'gpu_ids' not in request and 'gpu_count' in request:
+                gpu_ids, violations = self._place(request, gpu_statuses, system_status, planned_mb, planned_system_gb)
+            else:
+                gpu_ids = request.get('gpu_ids', [])
+                violations = self._admission_violations(request, gpu_statuses, system_status,
+                                                        planned_mb, planned_system_gb)
+
+            admitted = not violations
+            if admitted:
+                for gpu_id in gpu_ids:
+                    planned_mb[gpu_id] = planned_mb.get(gpu_id, 0.0) + request.get('memory_gb', 0) * 1024
+                planned_system_gb += request.get('system_memory_gb', 0)
+
+            for violation in violations:
+                binding_constraints.append({'index': index, 'component': request['component'], **violation})
+            placements.append({
+                'index': index,
+                'component': request['component'],
+                'admitted': admitted,
+                'gpu_ids': gpu_ids if admitted else [],
+                'memory_gb': request.get('memory_gb', 0),
+                'estimated_memory_gb': request.get('estimated_memory_gb')
+            })
+
+        return {
+            'feasible': all(placement['admitted'] for placement in placements),
+            'placements': placements,
+            'binding_constraints': binding_constraints,
+            'headroom': {
+                'gpus': [
+                    {
+                        'gpu_id': gpu_id,
+                        'memory_free_gb': (gpu_status.memory_free - planned_mb.get(gpu_id, 0.0)) / 1024,
+                        'planned_gb': planned_mb.get(gpu_id, 0.0) / 1024,
+                        'temperature_headroom_c': self.safety_limits['max_gpu_temperature'] - gpu_status.temperature
+                    }
+                    for gpu_id, gpu_status in enumerate(gpu_statuses) if gpu_status is not None
+                ],
+                'system_memory_available_gb': system_status.memory_available - planned_system_gb
+            }
+        }
+
     def _generate_allocation_id(self) -> str:
         """Generate unique allocation ID"""
-        return f"alloc_{int(time.time())}_{len(self.allocations)}"
+        # Monotonic sequence: len(self.allocations) repeats once allocations are released
+        return f"alloc_{int(time.time())}_{next(self._allocation_sequence)}"
     
-    async def deallocate_resources(self, allocation_id: str) -> bool:
+    async def deallocate_resources(self, allocation_id: str, reason: str = 'released') -> bool:
         """Deallocate resources"""
         async with self.allocation_lock:
             if allocation_id in self.allocations:
                 allocation = self.allocations[allocation_id]
                 allocation.status = 'deallocated'
                 del self.allocations[allocation_id]
+                self.ledger_version += 1
+                if self.trace is not None:
+                    self.trace.record_release(allocation_id, reason)
                 logger.info(f"Deallocated resources: {allocation_id}")
                 return True
             return False
     
+    async def renew_allocation(self, allocation_id: str, lease_seconds: Any) -> Optional[B200ResourceAllocation]:
+        """Extend an allocation's lease"""
+        lease_seconds = self._validate_lease_seconds(lease_seconds)
+        async with self.allocation_lock:
+            allocation = self.allocations.get(allocation_id)
+            if allocation is not None:
+                allocation.expires_at = datetime.now() + timedelta(seconds=lease_seconds)
+                self.ledger_version += 1
+            return allocation
+
+    async def register_pids(self, allocation_id: str, pids: List[int]) -> Optional[B200ResourceAllocation]:
+        """Attach owner processes to an allocation for usage attribution"""
+        pids = self._validate_pids(pids)
+        async with self.allocation_lock:
+            allocation = self.allocations.get(allocation_id)
+            if allocation is not None:
+                allocation.pids = sorted(set(allocation.pids) | set(pids))
+                self.ledger_version += 1
+            return allocation
+
+    def attribute_usage(self, gpu_statuses: List[Optional[B200GPUStatus]]) -> List[AllocationUsage]:
+        """Join the GPU process table against allocations with registered PIDs"""
+        used_by_pid: Dict[int, Dict[int, float]] = {}
+        for gpu_status in gpu_statuses:
+            if gpu_status is None:
+                continue
+            for process in gpu_status.processes:
+                per_gpu = used_by_pid.setdefault(process['pid'], {})
+                per_gpu[gpu_status.gpu_id] = per_gpu.get(gpu_status.gpu_id, 0.0) + process['memory_mb']
+
+        tolerance = 1 + self.safety_limits['max_reservation_overrun_percent'] / 100
+        usage = []
+        for allocation in self.get_all_allocations():
+            if not allocation.pids:
+                continue
+            # memory_gb is reserved on each GPU of the allocation
+            reserved_mb = {gpu_id: allocation.memory_gb * 1024 for gpu_id in allocation.gpu_ids}
+            used_mb = {gpu_id: 0.0 for gpu_id in allocation.gpu_ids}
+            for pid in allocation.pids:
+                for gpu_id, memory_mb in used_by_pid.get(pid, {}).items():
+                    used_mb[gpu_id] = used_mb.get(gpu_id, 0.0) + memory_mb
+
+            usage.append(AllocationUsage(
+                allocation_id=allocation.allocation_id,
+                component=allocation.component,
+                reserved_mb=reserved_mb,
+                used_mb=used_mb,
+                owners_alive=any(self.gpu_monitor.process_alive(pid) for pid in allocation.pids),
+                over_consumer=any(memory_mb > reserved_mb.get(gpu_id, 0.0) * tolerance
+                                  for gpu_id, memory_mb in used_mb.items())
+            ))
+        return usage
+
+    async def release_orphaned_allocations(self, usage: List[AllocationUsage]) -> List[str]:
+        """Reclaim allocations whose registered owner processes have all exited
+
+        Returns only the allocations released here; one already released since
+        the usage sample (by its owner or a lease expiry) is not reported.
+        """
+        reclaimed = []
+        for entry in usage:
+            if not entry.owners_alive and await self.deallocate_resources(entry.allocation_id, reason='orphaned'):
+                logger.warning(f"Owner processes exited, reclaimed allocation: {entry.allocation_id}")
+                reclaimed.append(entry.allocation_id)
+        return reclaimed
+
+    async def release_expired_allocations(self) -> List[str]:
+        """Reclaim allocations whose lease was not renewed in time"""
+        now = datetime.now()
+        expired = [
+            allocation.allocation_id for allocation in self.get_all_allocations()
+            if allocation.expires_at is not None and allocation.expires_at <= now
+        ]
+        for allocation_id in expired:
+            if await self.deallocate_resources(allocation_id, reason='expired'):
+                logger.warning(f"Lease expired, reclaimed allocation: {allocation_id}")
+        return expired
+
     def get_allocation_status(self, allocation_id: str) -> Optional[B200ResourceAllocation]:
         """Get allocation status"""
         return self.allocations.get(allocation_id)
@@ -524,15 +1071,27 @@ class EmergencyProtocol:
         self.resource_allocator = resource_allocator
         self.emergency_active = False
         
-    async def check_emergency_conditions(self) -> Dict[str, Any]:
-        """Check for emergency conditions"""
-        gpu_statuses = self.resource_allocator.gpu_monitor.get_all_gpu_status()
-        system_status = self.resource_allocator.system_monitor.get_system_status()
+    async def check_emergency_conditions(self, snapshot: Optional[FleetSnapshot] = None) -> Dict[str, Any]:
+        """Check for emergency conditions, optionally against an existing snapshot"""
+        if snapshot is not None:
+            gpu_statuses = snapshot.gpus
+            system_status = snapshot.system
+        else:
+            gpu_statuses = self.resource_allocator.gpu_monitor.get_available_gpu_status()
+            system_status = self.resource_allocator.system_monitor.get_system_status()
         
         emergency_conditions = []
         
         # Check each GPU
-        for gpu_status in gpu_statuses:
+        for gpu_id, gpu_status in enumerate(gpu_statuses):
+            if gpu_status is None:
+                emergency_conditions.append({
+                    'type': 'gpu_lost',
+                    'gpu_id': gpu_id,
+                    'message': f'GPU {gpu_id} is not responding'
+                })
+                continue
+
             health = self.resource_allocator.gpu_monitor.check_gpu_health(gpu_status)
             
             for alert in health['alerts']:
@@ -581,7 +1140,7 @@ class EmergencyProtocol:
         
         for allocation in allocations:
             if allocation.priority in ['low', 'normal']:
-                await self.resource_allocator.deallocate_resources(allocation.allocation_id)
+                await self.resource_allocator.deallocate_resources(allocation.allocation_id, reason='emergency')
                 logger.info(f"Emergency deallocated: {allocation.allocation_id}")
     
     async def _force_shutdown(self) -> None:
@@ -602,7 +1161,8 @@ class SOVRENMCPServer:
     def __init__(self, config: Optional[Dict[str, Any]] = None):
         self.config = config or self._default_config()
         self.app = FastAPI(title="SOVREN MCP Server", version="1.0.0")
-        self.resource_allocator = ResourceAllocator()
+        self.resource_allocator = ResourceAllocator(self._create_gpu_monitor())
+        self.resource_allocator.memory_estimation.update(self.config.get('memory_estimation', {}))
         self.emergency_protocol = EmergencyProtocol(self.resource_allocator)
         self.monitoring_active = False
         self.websocket_connections = set()
@@ -621,6 +1181,40 @@ class SOVRENMCPServer:
 
         # Background monitoring
         self.monitoring_task = None
+        self.loop_lag_task = None
+        self.sampling_task = None
+
+        # Fleet sampling and shared memory telemetry
+        self.latest_snapshot: Optional[FleetSnapshot] = None
+        self.snapshot_seq = 0
+        self.telemetry_writer = None
+
+        # Columnar telemetry history, when enabled
+        self.archiver = None
+
+        # Per-allocation GPU usage joined against the ledger each sample
+        self.latest_usage: List[AllocationUsage] = []
+        self.over_consumers: set = set()
+        self.reclaimed_allocations = deque(maxlen=100)
+
+        # Encoded response bodies keyed by (snapshot seq, ledger version)
+        self._status_body_cache = (None, b'')
+        self._realtime_body_cache = (None, b'')
+
+        # Binary transport for co-located clients
+        self.unix_transport = None
+        self.loop_lag_samples = deque(maxlen=600)  # 60s of 100ms probes
+
+        # Cluster coordinator, when this server federates node agents
+        self.federation = None
+        federation = self._federation_config()
+        if federation['role'] == 'coordinator':
+            from federation import FederationCoordinator
+            self.federation = FederationCoordinator(
+                self, host=federation['host'], port=federation['port'],
+                node_lease_seconds=federation['node_lease_seconds']
+            )
+            self.federation.setup_routes(self.app)
 
     def _default_config(self) -> Dict[str, Any]:
         """Default configuration"""
@@ -646,106 +1240,198 @@ class SOVRENMCPServer:
                     'gpu_temperature': 80,
                     'system_memory': 85
                 }
+            },
+            'gpu_backend': {
+                'type': 'nvidia',  # 'nvidia', 'simulated' or 'shared_memory'
+                'capability_cache': DEFAULT_CAPABILITY_CACHE
+            },
+            'telemetry': {
+                'shared_memory': True,
+                'segment_name': 'sovren_telemetry',
+                'sample_interval_seconds': 1.0
+            },
+            'unix_socket': {
+                'enabled': True,
+                'path': '/tmp/sovren_mcp.sock'
+            },
+            'usage_attribution': {
+                'reclaim_orphaned': True
+            },
+            'memory_estimation': {
+                'under_reservation_policy': 'raise',  # 'raise', 'reject' or 'warn'
+                'tolerance_percent': 10
+            },
+            'archive': {
+                'enabled': False,
+                'directory': '/var/lib/sovren/telemetry',
+                'rotation': 'hourly',  # 'hourly' or 'daily'
+                'flush_interval_seconds': 60,
+                'retention_days': 30,
+                'max_total_gb': None,
+                'compression': 'zstd'
+            },
+            'trace': {
+                'enabled': False,
+                'path': '/var/lib/sovren/allocation_trace.jsonl.gz',
+                'telemetry_interval_seconds': 60
+            },
+            'federation': {
+                'role': None,  # None, 'coordinator' or 'agent'
+                'host': '0.0.0.0',  # Coordinator: where agents connect
+                'port': 8765,
+                'coordinator': None,  # Agent: coordinator host:port
+                'node_id': None,  # Agent: defaults to the hostname
+                'node_lease_seconds': 5.0
             }
         }
 
+    def _create_gpu_monitor(self) -> B200GPUMonitor:
+        """Create the GPU monitor for the configured backend"""
+        backend = self.config.get('gpu_backend', {'type': 'nvidia'})
+
+        if backend.get('type') == 'simulated':
+            return SimulatedB200GPUMonitor(
+                gpu_count=backend.get('gpu_count', 8),
+                seed=backend.get('seed', 0),
+                scenario=backend.get('scenario'),
+                tick_seconds=backend.get('tick_seconds', 1.0)
+            )
+        if backend.get('type') == 'shared_memory':
+            return SharedMemoryGPUMonitor(self._telemetry_config()['segment_name'])
+        return B200GPUMonitor(capability_cache=backend.get('capability_cache', DEFAULT_CAPABILITY_CACHE))
+
+    def _telemetry_config(self) -> Dict[str, Any]:
+        """Telemetry configuration with defaults filled in"""
+        return {
+            'shared_memory': True,
+            'segment_name': 'sovren_telemetry',
+            'sample_interval_seconds': 1.0,
+            **self.config.get('telemetry', {})
+        }
+
+    def _federation_config(self) -> Dict[str, Any]:
+        """Federation configuration with defaults filled in"""
+        return {
+            'role': None,
+            'host': '0.0.0.0',
+            'port': 8765,
+            'coordinator': None,
+            'node_id': None,
+            'node_lease_seconds': 5.0,
+            **self.config.get('federation', {})
+        }
+
+    def _require_ledger(self) -> None:
+        """Refuse allocation work on a --read-telemetry worker, whose ledger is private and always empty"""
+        if self.config.get('gpu_backend', {}).get('type') == 'shared_memory':
+            raise HTTPException(
+                status_code=503,
+                detail="Telemetry-only worker: send allocation requests to the primary MCP server"
+            )
+
     def _setup_routes(self):
         """Setup FastAPI routes"""
 
         @self.app.get("/health")
         async def health_check():
             """Health check endpoint"""
-            gpu_statuses = self.resource_allocator.gpu_monitor.get_all_gpu_status()
-            system_status = self.resource_allocator.system_monitor.get_system_status()
+            snapshot = self.current_snapshot()
 
-            return {
+            return json_response(encode({
                 'status': 'healthy',
-                'timestamp': datetime.now().isoformat(),
-                'gpu_count': len(gpu_statuses),
-                'system_memory_usage': system_status.memory_usage,
-                'monitoring_active': self.monitoring_active
-            }
+                'timestamp': datetime.now(),
+                'gpu_count': len(snapshot.gpus),
+                'system_memory_usage': snapshot.system.memory_usage,
+                'monitoring_active': self.monitoring_active,
+                'event_loop_lag': self.get_event_loop_lag()
+            }))
 
         @self.app.get("/status")
         async def get_status():
             """Get comprehensive system status"""
-            gpu_statuses = self.resource_allocator.gpu_monitor.get_all_gpu_status()
-            system_status = self.resource_allocator.system_monitor.get_system_status()
-            allocations = self.resource_allocator.get_all_allocations()
-
-            # Check for emergency conditions
-            emergency_check = await self.emergency_protocol.check_emergency_conditions()
-
-            return {
-                'timestamp': datetime.now().isoformat(),
-                'system': {
-                    'cpu_usage': system_status.cpu_usage,
-                    'memory_usage': system_status.memory_usage,
-                    'memory_total_gb': system_status.memory_total,
-                    'memory_available_gb': system_status.memory_available,
-                    'disk_usage': system_status.disk_usage,
-                    'uptime_hours': system_status.uptime / 3600
-                },
-                'gpus': [
-                    {
-                        'gpu_id': gpu.gpu_id,
-                        'memory_used_gb': gpu.memory_used / 1024,
-                        'memory_total_gb': gpu.memory_total / 1024,
-                        'memory_free_gb': gpu.memory_free / 1024,
-                        'utilization_percent': gpu.utilization,
-                        'temperature_celsius': gpu.temperature,
-                        'power_draw_watts': gpu.power_draw,
-                        'process_count': len(gpu.processes)
-                    }
-                    for gpu in gpu_statuses
-                ],
-                'allocations': [
-                    {
-                        'allocation_id': alloc.allocation_id,
-                        'component': alloc.component,
-                        'gpu_ids': alloc.gpu_ids,
-                        'memory_gb': alloc.memory_gb,
-                        'priority': alloc.priority,
-                        'status': alloc.status,
-                        'created_at': alloc.created_at.isoformat()
-                    }
-                    for alloc in allocations
-                ],
-                'emergency': emergency_check
-            }
+            return json_response(await self.encode_status())
 
         @self.app.post("/allocate")
         async def allocate_resources(request: Dict[str, Any]):
             """Allocate resources safely"""
+            self._require_ledger()
             try:
                 allocation = await self.resource_allocator.allocate_resources(request)
-                return {
+                return json_response(encode({
                     'success': True,
                     'allocation_id': allocation.allocation_id,
-                    'allocation': {
-                        'component': allocation.component,
-                        'gpu_ids': allocation.gpu_ids,
-                        'memory_gb': allocation.memory_gb,
-                        'priority': allocation.priority,
-                        'status': allocation.status,
-                        'created_at': allocation.created_at.isoformat()
-                    }
-                }
+                    'allocation': AllocationRecord.from_allocation(allocation),
+                    'estimated_memory_gb': allocation.estimated_memory_gb
+                }))
             except HTTPException as e:
                 raise e
             except Exception as e:
                 logger.error(f"Allocation error: {e}")
                 raise HTTPException(status_code=500, detail=str(e))
 
+        @self.app.post("/plan")
+        async def plan_allocations(request: Dict[str, Any]):
+            """Dry-run admission and placement for one or many hypothetical requests"""
+            self._require_ledger()
+            requests = request['requests'] if 'requests' in request else [request]
+            if not isinstance(requests, list) or not all(isinstance(item, dict) for item in requests):
+                raise HTTPException(status_code=400, detail="requests must be a list of allocation requests")
+            return json_response(encode(self.plan(requests)))
+
+        @self.app.post("/estimate")
+        async def estimate_memory(request: Dict[str, Any]):
+            """Per-GPU memory estimate for serving a model (weights + KV cache + activations)"""
+            try:
+                estimate = estimate_for_request(request)
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e))
+            if estimate is None:
+                raise HTTPException(status_code=400, detail=f"Unknown model_type: {request.get('model_type')}")
+            return estimate
+
         @self.app.delete("/allocate/{allocation_id}")
         async def deallocate_resources(allocation_id: str):
             """Deallocate resources"""
+            self._require_ledger()
             success = await self.resource_allocator.deallocate_resources(allocation_id)
             if success:
                 return {'success': True, 'message': f'Deallocated {allocation_id}'}
             else:
                 raise HTTPException(status_code=404, detail='Allocation not found')
 
+        @self.app.post("/allocate/{allocation_id}/renew")
+        async def renew_allocation(allocation_id: str, request: Dict[str, Any]):
+            """Renew an allocation lease"""
+            self._require_ledger()
+            allocation = await self.resource_allocator.renew_allocation(
+                allocation_id, request.get('lease_seconds', 30)
+            )
+            if allocation:
+                return {
+                    'success': True,
+                    'allocation_id': allocation_id,
+                    'expires_at': allocation.expires_at.isoformat()
+                }
+            else:
+                raise HTTPException(status_code=404, detail='Allocation not found')
+
+        @self.app.post("/allocate/{allocation_id}/pids")
+        async def register_allocation_pids(allocation_id: str, request: Dict[str, Any]):
+            """Register the processes that own an allocation"""
+            self._require_ledger()
+            allocation = await self.resource_allocator.register_pids(allocation_id, request.get('pids', []))
+            if allocation is None:
+                raise HTTPException(status_code=404, detail='Allocation not found')
+            return {
+                'allocation_id': allocation.allocation_id,
+                'pids': allocation.pids
+            }
+
+        @self.app.get("/usage")
+        async def get_usage():
+            """Reserved versus used GPU memory per component"""
+            return json_response(encode(self.get_usage_report()))
+
         @self.app.get("/allocate/{allocation_id}")
         async def get_allocation_status(allocation_id: str):
             """Get allocation status"""
@@ -758,13 +1444,16 @@ class SOVRENMCPServer:
                     'memory_gb': allocation.memory_gb,
                     'priority': allocation.priority,
                     'status': allocation.status,
-                    'created_at': allocation.created_at.isoformat()
+                    'created_at': allocation.created_at.isoformat(),
+                    'expires_at': allocation.expires_at.isoformat() if allocation.expires_at else None,
+                    'pids': allocation.pids,
+                    'estimated_memory_gb': allocation.estimated_memory_gb
                 }
             else:
                 raise HTTPException(status_code=404, detail='Allocation not found')
 
         @self.app.websocket("/ws")
-        async def websocket_endpoint(websocket):
+        async def websocket_endpoint(websocket: WebSocket):
             """WebSocket for real-time monitoring"""
             await websocket.accept()
             self.websocket_connections.add(websocket)
@@ -772,37 +1461,73 @@ class SOVRENMCPServer:
             try:
                 while True:
                     # Send status updates every 5 seconds
-                    status = await self.get_realtime_status()
-                    await websocket.send_json(status)
+                    await websocket.send_text((await self.encode_realtime_status()).decode())
                     await asyncio.sleep(5)
             except Exception as e:
                 logger.error(f"WebSocket error: {e}")
             finally:
                 self.websocket_connections.discard(websocket)
 
+    def current_snapshot(self) -> FleetSnapshot:
+        """Latest sampled snapshot, sampling on demand when no sampler runs"""
+        if self.latest_snapshot is not None and self.sampling_task is not None:
+            return self.latest_snapshot
+        return self.sample_fleet()
+
+    async def get_status(self) -> Dict[str, Any]:
+        """Comprehensive status document built from the latest snapshot"""
+        snapshot = self.current_snapshot()
+        emergency_check = await self.emergency_protocol.check_emergency_conditions(snapshot)
+
+        return {
+            'timestamp': datetime.fromtimestamp(snapshot.timestamp),
+            'system': SystemRecord.from_status(snapshot.system),
+            'gpus': [GPUStatusRecord.from_status(gpu) for gpu in snapshot.gpus if gpu is not None],
+            'allocations': [
+                AllocationRecord.from_allocation(allocation)
+                for allocation in self.resource_allocator.get_all_allocations()
+            ],
+            'emergency': emergency_check
+        }
+
+    async def encode_status(self) -> bytes:
+        """/status body, reused while neither the snapshot nor the ledger changed"""
+        snapshot = self.current_snapshot()
+        key = (snapshot.seq, self.resource_allocator.ledger_version)
+        if self._status_body_cache[0] != key:
+            self._status_body_cache = (key, encode(await self.get_status()))
+        return self._status_body_cache[1]
+
     async def get_realtime_status(self) -> Dict[str, Any]:
         """Get real-time status for WebSocket clients"""
-        gpu_statuses = self.resource_allocator.gpu_monitor.get_all_gpu_status()
-        system_status = self.resource_allocator.system_monitor.get_system_status()
-        emergency_check = await self.emergency_protocol.check_emergency_conditions()
+        return {'timestamp': datetime.now(), **self._realtime_snapshot_fields()}
+
+    def _realtime_snapshot_fields(self) -> Dict[str, Any]:
+        """Everything in the WebSocket status except its send-time timestamp"""
+        snapshot = self.current_snapshot()
 
         return {
-            'timestamp': datetime.now().isoformat(),
-            'system_memory_usage': system_status.memory_usage,
-            'cpu_usage': system_status.cpu_usage,
-            'gpu_summary': [
-                {
-                    'gpu_id': gpu.gpu_id,
-                    'memory_usage_percent': (gpu.memory_used / gpu.memory_total) * 100,
-                    'utilization': gpu.utilization,
-                    'temperature': gpu.temperature
-                }
-                for gpu in gpu_statuses
-            ],
-            'emergency_status': emergency_check['emergency_detected'],
-            'active_allocations': len(self.resource_allocator.get_all_allocations())
+            'system_memory_usage': snapshot.system.memory_usage,
+            'cpu_usage': snapshot.system.cpu_usage,
+            'gpu_summary': [GPUSummaryRecord.from_status(gpu) for gpu in snapshot.gpus if gpu is not None],
+            'emergency_status': snapshot.emergency,
+            'active_allocations': len(self.resource_allocator.allocations)
         }
 
+    async def encode_realtime_status(self) -> bytes:
+        """WebSocket status body stamped with the time of sending
+
+        The snapshot fields are encoded once per (snapshot, ledger version)
+        and shared by every subscriber; only the timestamp is encoded per send,
+        so consecutive frames always advance.
+        """
+        snapshot = self.current_snapshot()
+        key = (snapshot.seq, self.resource_allocator.ledger_version)
+        if self._realtime_body_cache[0] != key:
+            self._realtime_body_cache = (key, encode(self._realtime_snapshot_fields()))
+        timestamp = encode({'timestamp': datetime.now()})
+        return timestamp[:-1] + b',' + self._realtime_body_cache[1][1:]
+
     async def start_monitoring(self):
         """Start background monitoring"""
         if self.monitoring_active:
@@ -810,28 +1535,39 @@ class SOVRENMCPServer:
 
         self.monitoring_active = True
         self.monitoring_task = asyncio.create_task(self._monitoring_loop())
+        self.loop_lag_task = asyncio.create_task(self._loop_lag_probe())
+
+        # Secondary workers read telemetry; only the primary samples and publishes it
+        if not isinstance(self.resource_allocator.gpu_monitor, SharedMemoryGPUMonitor):
+            self._open_telemetry_writer()
+            self._open_archiver()
+            self._open_trace()
+            self.sampling_task = asyncio.create_task(self._sampling_loop())
         logger.info("Background monitoring started")
 
     async def _monitoring_loop(self):
         """Background monitoring loop"""
         while self.monitoring_active:
             try:
-                # Check for emergency conditions
-                emergency_check = await self.emergency_protocol.check_emergency_conditions()
+                # Check for emergency conditions against the sampler's latest snapshot
+                emergency_check = await self.emergency_protocol.check_emergency_conditions(self.latest_snapshot)
 
                 if emergency_check['emergency_detected']:
                     await self.emergency_protocol.initiate_emergency_protocol(
                         emergency_check['conditions']
                     )
 
+                # Reclaim allocations whose lease was not renewed
+                await self.resource_allocator.release_expired_allocations()
+
                 # Send updates to WebSocket clients
                 if self.websocket_connections:
-                    status = await self.get_realtime_status()
+                    status = (await self.encode_realtime_status()).decode()
                     disconnected = set()
 
                     for websocket in self.websocket_connections:
                         try:
-                            await websocket.send_json(status)
+                            await websocket.send_text(status)
                         except:
                             disconnected.add(websocket)
 
@@ -844,15 +1580,265 @@ class SOVRENMCPServer:
                 logger.error(f"Monitoring loop error: {e}")
                 await asyncio.sleep(5)
 
+    def _open_telemetry_writer(self) -> None:
+        """Create the shared memory telemetry segment if enabled"""
+        telemetry = self._telemetry_config()
+        if not telemetry['shared_memory'] or self.telemetry_writer is not None:
+            return
+        try:
+            from telemetry_shm import TelemetryWriter
+            self.telemetry_writer = TelemetryWriter(
+                gpu_capacity=self.resource_allocator.gpu_monitor.gpu_count,
+                name=telemetry['segment_name']
+            )
+        except Exception as e:
+            logger.warning(f"Shared memory telemetry disabled: {e}")
+
+    def _open_archiver(self) -> None:
+        """Start the Parquet telemetry archive if enabled"""
+        archive = self.config.get('archive', {})
+        if not archive.get('enabled') or self.archiver is not None:
+            return
+        try:
+            from telemetry_archive import TelemetryArchiver
+            self.archiver = TelemetryArchiver(
+                directory=archive.get('directory', '/var/lib/sovren/telemetry'),
+                rotation=archive.get('rotation', 'hourly'),
+                flush_interval_seconds=archive.get('flush_interval_seconds', 60),
+                retention_days=archive.get('retention_days', 30),
+                max_total_gb=archive.get('max_total_gb'),
+                compression=archive.get('compression', 'zstd')
+            )
+        except Exception as e:
+            logger.warning(f"Telemetry archive disabled: {e}")
+
+    def _open_trace(self) -> None:
+        """Start recording the allocation trace if enabled"""
+        trace = {'enabled': False, 'path': '/var/lib/sovren/allocation_trace.jsonl.gz',
+                 'telemetry_interval_seconds': 60, **self.config.get('trace', {})}
+        if not trace['enabled'] or self.resource_allocator.trace is not None:
+            return
+        try:
+            from allocation_trace import AllocationTraceRecorder
+            recorder = AllocationTraceRecorder(trace['path'], trace['telemetry_interval_seconds'])
+            gpu_monitor = self.resource_allocator.gpu_monitor
+            recorder.record_header(
+                [{'gpu_id': gpu_id, 'memory_total_mb': gpu.memory_total if gpu is not None else 0.0}
+                 for gpu_id, gpu in enumerate(self.current_snapshot().gpus)],
+                max_gpu_temperature=self.resource_allocator.safety_limits['max_gpu_temperature']
+            )
+            self.resource_allocator.trace = recorder
+            logger.info(f"Recording allocation trace to {trace['path']} ({gpu_monitor.gpu_count} GPUs)")
+        except Exception as e:
+            logger.warning(f"Allocation trace disabled: {e}")
+
+    def sample_fleet(self) -> FleetSnapshot:
+        """Sample every GPU once and publish the snapshot"""
+        return self.publish_snapshot(*self.read_fleet())
+
+    def read_fleet(self) -> Tuple[List[Optional[B200GPUStatus]], SystemStatus]:
+        """Query every GPU and the host once; blocking, so the sampler runs it off the event loop"""
+        gpus = self.resource_allocator.gpu_monitor.get_available_gpu_status()
+        return gpus, self.resource_allocator.system_monitor.get_system_status()
+
+    def publish_snapshot(self, gpus: List[Optional[B200GPUStatus]], system_status: SystemStatus) -> FleetSnapshot:
+        """Turn one fleet reading into the latest snapshot, usage attribution, archive and telemetry"""
+        gpu_monitor = self.resource_allocator.gpu_monitor
+        active_allocations = len(self.resource_allocator.allocations)
+        emergency = any(
+            gpu is None or any(alert['level'] == 'CRITICAL' for alert in gpu_monitor.check_gpu_health(gpu)['alerts'])
+            for gpu in gpus
+        ) or system_status.memory_usage > 95
+
+        self.snapshot_seq += 1
+        snapshot = FleetSnapshot(
+            seq=self.snapshot_seq,
+            timestamp=time.time(),
+            gpus=gpus,
+            system=system_status,
+            active_allocations=active_allocations,
+            emergency=emergency
+        )
+        self.latest_snapshot = snapshot
+        self._attribute_usage(snapshot)
+        if self.archiver is not None:
+            self.archiver.append(snapshot)
+        if self.resource_allocator.trace is not None:
+            reserved_mb: Dict[int, float] = {}
+            for allocation in self.resource_allocator.get_all_allocations():
+                for gpu_id in allocation.gpu_ids:
+                    reserved_mb[gpu_id] = reserved_mb.get(gpu_id, 0.0) + allocation.memory_gb * 1024
+            self.resource_allocator.trace.record_telemetry(gpus, reserved_mb, timestamp=snapshot.timestamp)
+
+        if self.telemetry_writer is not None:
+            self.telemetry_writer.publish(
+                enumerate(gpus), system_status, active_allocations,
+                emergency=emergency, timestamp=snapshot.timestamp
+            )
+        return snapshot
+
+    def _attribute_usage(self, snapshot: FleetSnapshot) -> None:
+        """Join the snapshot's GPU processes against the ledger and flag over-consumers"""
+        self.latest_usage = self.resource_allocator.attribute_usage(snapshot.gpus)
+
+        over_consumers = {entry.allocation_id for entry in self.latest_usage if entry.over_consumer}
+        for entry in self.latest_usage:
+            if entry.allocation_id in over_consumers - self.over_consumers:
+                logger.warning(f"Allocation {entry.allocation_id} ({entry.component}) uses "
+                               f"{sum(entry.used_mb.values()) / 1024:.1f}GB against "
+                               f"{sum(entry.reserved_mb.values()) / 1024:.1f}GB reserved")
+        self.over_consumers = over_consumers
+
+    async def reclaim_orphaned_allocations(self) -> List[str]:
+        """Release allocations whose owners exited, as of the latest sample"""
+        usage = {'reclaim_orphaned': True, **self.config.get('usage_attribution', {})}
+        if not usage['reclaim_orphaned']:
+            return []
+
+        components = {entry.allocation_id: entry.component for entry in self.latest_usage}
+        reclaimed = await self.resource_allocator.release_orphaned_allocations(self.latest_usage)
+        for allocation_id in reclaimed:
+            self.reclaimed_allocations.append({
+                'allocation_id': allocation_id,
+                'component': components[allocation_id],
+                'reclaimed_at': datetime.now()
+            })
+        if reclaimed:
+            self.latest_usage = [entry for entry in self.latest_usage if entry.allocation_id not in reclaimed]
+        return reclaimed
+
+    def plan(self, requests: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """What-if placement against the latest snapshot and the current ledger
+
+        Reads only the already sampled snapshot, so it costs no GPU queries and
+        takes no allocation lock. Allocations made after the snapshot was taken
+        are not in its free memory yet and are subtracted explicitly.
+        """
+        snapshot = self.current_snapshot()
+        sampled_at = datetime.fromtimestamp(snapshot.timestamp)
+        planned_mb: Dict[int, float] = {}
+        for allocation in self.resource_allocator.get_all_allocations():
+            if allocation.created_at > sampled_at:
+                for gpu_id in allocation.gpu_ids:
+                    planned_mb[gpu_id] = planned_mb.get(gpu_id, 0.0) + allocation.memory_gb * 1024
+
+        plan = self.resource_allocator.plan_allocations(requests, snapshot.gpus, snapshot.system, planned_mb)
+        return {
+            'snapshot_seq': snapshot.seq,
+            'snapshot_age_ms': (time.time() - snapshot.timestamp) * 1000,
+            'ledger_version': self.resource_allocator.ledger_version,
+            **plan
+        }
+
+    def get_usage_report(self) -> Dict[str, Any]:
+        """Reserved versus used GPU memory per component, for right-sizing reservations"""
+        snapshot = self.current_snapshot()
+        if self.sampling_task is None:
+            self._attribute_usage(snapshot)
+
+        components: Dict[str, Dict[str, Any]] = {}
+        for entry in self.latest_usage:
+            component = components.setdefault(entry.component, {
+                'allocations': 0, 'reserved_gb': 0.0, 'used_gb': 0.0, 'over_consumers': 0
+            })
+            component['allocations'] += 1
+            component['reserved_gb'] += sum(entry.reserved_mb.values()) / 1024
+            component['used_gb'] += sum(entry.used_mb.values()) / 1024
+            component['over_consumers'] += entry.over_consumer
+        for component in components.values():
+            component['efficiency'] = (
+                component['used_gb'] / component['reserved_gb'] if component['reserved_gb'] else None
+            )
+
+        attributed = {entry.allocation_id for entry in self.latest_usage}
+        return {
+            'timestamp': datetime.fromtimestamp(snapshot.timestamp),
+            'components': components,
+            'over_consumers': [
+                {
+                    'allocation_id': entry.allocation_id,
+                    'component': entry.component,
+                    'gpus': {
+                        str(gpu_id): {
+                            'reserved_gb': entry.reserved_mb.get(gpu_id, 0.0) / 1024,
+                            'used_gb': memory_mb / 1024
+                        }
+                        for gpu_id, memory_mb in entry.used_mb.items()
+                    }
+                }
+                for entry in self.latest_usage if entry.over_consumer
+            ],
+            'unattributed_allocations': sum(
+                allocation_id not in attributed for allocation_id in self.resource_allocator.allocations
+            ),
+            'reclaimed_allocations': list(self.reclaimed_allocations)
+        }
+
+    def encode_snapshot_binary(self) -> bytes:
+        """Latest fleet snapshot in the fixed telemetry layout"""
+        from telemetry_shm import pack_snapshot, segment_size
+
+        snapshot = self.latest_snapshot or self.sample_fleet()
+        buffer = bytearray(segment_size(len(snapshot.gpus)))
+        pack_snapshot(buffer, len(snapshot.gpus), snapshot.seq, enumerate(snapshot.gpus),
+                      snapshot.system, snapshot.active_allocations, snapshot.emergency,
+                      snapshot.timestamp)
+        return bytes(buffer)
+
+    async def _sampling_loop(self):
+        """Background fleet sampler"""
+        interval = self._telemetry_config()['sample_interval_seconds']
+        while self.monitoring_active:
+            try:
+                # nvidia-smi and GPUtil calls block for tens of ms per GPU; keep them off the event loop
+                gpus, system_status = await asyncio.to_thread(self.read_fleet)
+                self.publish_snapshot(gpus, system_status)
+                await self.reclaim_orphaned_allocations()
+                if self.archiver is not None:
+                    await self.archiver.maybe_flush()
+                if self.resource_allocator.trace is not None:
+                    self.resource_allocator.trace.maybe_flush()
+            except Exception as e:
+                logger.error(f"Fleet sampling error: {e}")
+            await asyncio.sleep(interval)
+
+    async def _loop_lag_probe(self, interval: float = 0.1):
+        """Measure how late the event loop wakes up a 100ms timer"""
+        loop = asyncio.get_running_loop()
+        while self.monitoring_active:
+            scheduled = loop.time() + interval
+            await asyncio.sleep(interval)
+            self.loop_lag_samples.append(max(0.0, loop.time() - scheduled) * 1000)
+
+    def get_event_loop_lag(self) -> Dict[str, float]:
+        """Event loop lag over the last minute in milliseconds"""
+        if not self.loop_lag_samples:
+            return {'last_ms': 0.0, 'p99_ms': 0.0, 'max_ms': 0.0, 'samples': 0}
+
+        samples = sorted(self.loop_lag_samples)
+        return {
+            'last_ms': self.loop_lag_samples[-1],
+            'p99_ms': samples[min(len(samples) - 1, int(len(samples) * 0.99))],
+            'max_ms': samples[-1],
+            'samples': len(samples)
+        }
+
     async def stop_monitoring(self):
         """Stop background monitoring"""
         self.monitoring_active = False
-        if self.monitoring_task:
-            self.monitoring_task.cancel()
-            try:
-                await self.monitoring_task
-            except asyncio.CancelledError:
-                pass
+        for task in (self.monitoring_task, self.loop_lag_task, self.sampling_task):
+            if task:
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        if self.telemetry_writer is not None:
+            self.telemetry_writer.close()
+            self.telemetry_writer = None
+        if self.archiver is not None:
+            await self.archiver.close()
+            self.archiver = None
         logger.info("Background monitoring stopped")
 
     async def start_server(self, host: str = "0.0.0.0", port: int = 8000):
@@ -862,7 +1848,15 @@ class SOVRENMCPServer:
         # Start monitoring
         await self.start_monitoring()
 
+        # Start binary transport for co-located clients
+        await self._start_unix_socket()
+
+        # Accept node agents
+        if self.federation is not None:
+            await self.federation.start()
+
         # Start FastAPI server
+        import uvicorn
         config = uvicorn.Config(
             app=self.app,
             host=host,
@@ -874,6 +1868,19 @@ class SOVRENMCPServer:
         server = uvicorn.Server(config)
         await server.serve()
 
+    async def _start_unix_socket(self) -> None:
+        """Start the Unix domain socket listener if enabled"""
+        unix_socket = {'enabled': True, 'path': '/tmp/sovren_mcp.sock', **self.config.get('unix_socket', {})}
+        if not unix_socket['enabled']:
+            return
+        try:
+            from uds_transport import UnixSocketTransport
+            self.unix_transport = UnixSocketTransport(self, unix_socket['path'])
+            await self.unix_transport.start()
+        except Exception as e:
+            self.unix_transport = None
+            logger.warning(f"Unix socket transport disabled: {e}")
+
     async def shutdown(self):
         """Graceful shutdown"""
         logger.info("Shutting down SOVREN MCP Server")
@@ -881,6 +1888,14 @@ class SOVRENMCPServer:
         # Stop monitoring
         await self.stop_monitoring()
 
+        # Stop binary transport
+        if self.unix_transport is not None:
+            await self.unix_transport.stop()
+
+        # Drop node agent connections; their leases run out and they fence themselves
+        if self.federation is not None:
+            await self.federation.stop()
+
         # Close WebSocket connections
         for websocket in self.websocket_connections:
             try:
@@ -891,12 +1906,53 @@ class SOVRENMCPServer:
         # Deallocate all resources
         allocations = self.resource_allocator.get_all_allocations()
         for allocation in allocations:
-            await self.resource_allocator.deallocate_resources(allocation.allocation_id)
+            await self.resource_allocator.deallocate_resources(allocation.allocation_id, reason='shutdown')
+
+        if self.resource_allocator.trace is not None:
+            self.resource_allocator.trace.close()
+            self.resource_allocator.trace = None
 
         logger.info("SOVREN MCP Server shutdown complete")
 
 async def main():
     """Main entry point"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="SOVREN MCP Server")
+    parser.add_argument("--host", default="0.0.0.0", help="Bind address (default: 0.0.0.0)")
+    parser.add_argument("--port", type=int, default=8000, help="HTTP port (default: 8000)")
+    parser.add_argument("--simulate", action="store_true",
+                        help="Run against the simulated B200 fleet instead of real GPUs")
+    parser.add_argument("--sim-gpus", type=int, default=8, help="Simulated GPU count (default: 8)")
+    parser.add_argument("--sim-seed", type=int, default=0, help="Simulator RNG seed (default: 0)")
+    parser.add_argument("--sim-scenario", default=None,
+                        help="Simulator scenario: steady, thermal_ramp, memory_leak, gpu_lost or a JSON file")
+    parser.add_argument("--read-telemetry", action="store_true",
+                        help="Serve GPU telemetry from the shared memory segment of a primary MCP server")
+    parser.add_argument("--telemetry-segment", default="sovren_telemetry",
+                        help="Shared memory telemetry segment name (default: sovren_telemetry)")
+    parser.add_argument("--unix-socket", default="/tmp/sovren_mcp.sock",
+                        help="Unix domain socket for the binary transport (default: /tmp/sovren_mcp.sock)")
+    parser.add_argument("--no-unix-socket", action="store_true", help="Disable the binary transport")
+    parser.add_argument("--archive-dir", default=None,
+                        help="Archive per-GPU telemetry as rotated Parquet files in this directory")
+    parser.add_argument("--archive-rotation", choices=('hourly', 'daily'), default='hourly',
+                        help="Archive file rotation (default: hourly)")
+    parser.add_argument("--archive-retention-days", type=float, default=30,
+                        help="Delete archive files older than this (default: 30)")
+    parser.add_argument("--capability-cache", default=DEFAULT_CAPABILITY_CACHE,
+                        help=f"GPU capability probe cache, '' to probe on every start (default: {DEFAULT_CAPABILITY_CACHE})")
+    parser.add_argument("--trace", default=None, metavar="PATH",
+                        help="Record allocation requests, releases and telemetry for allocation_simulator.py")
+    parser.add_argument("--coordinator-port", type=int, default=None,
+                        help="Coordinate a cluster: accept node agents on this port and serve /cluster routes")
+    parser.add_argument("--node-lease-seconds", type=float, default=5.0,
+                        help="Coordinator: seconds without a snapshot before a node is lost (default: 5)")
+    parser.add_argument("--join", default=None, metavar="HOST:PORT",
+                        help="Run as a node agent streaming to the coordinator at HOST:PORT (no HTTP)")
+    parser.add_argument("--node-id", default=None, help="Agent node id (default: hostname)")
+    args = parser.parse_args()
+
     # Production configuration
     config = {
         'infrastructure_protection': {
@@ -920,14 +1976,68 @@ async def main():
                 'gpu_temperature': 80,
                 'system_memory': 85
             }
+        },
+        'gpu_backend': {
+            'type': 'shared_memory' if args.read_telemetry else 'simulated' if args.simulate else 'nvidia',
+            'gpu_count': args.sim_gpus,
+            'seed': args.sim_seed,
+            'scenario': args.sim_scenario,
+            'capability_cache': args.capability_cache
+        },
+        'telemetry': {
+            'shared_memory': True,
+            'segment_name': args.telemetry_segment,
+            'sample_interval_seconds': 1.0
+        },
+        'unix_socket': {
+            # Secondary telemetry workers leave the socket to the primary
+            'enabled': not (args.no_unix_socket or args.read_telemetry),
+            'path': args.unix_socket
+        },
+        'usage_attribution': {
+            'reclaim_orphaned': True
+        },
+        'archive': {
+            # Only the sampling primary archives; secondary workers have nothing to add
+            'enabled': args.archive_dir is not None and not args.read_telemetry,
+            'directory': args.archive_dir,
+            'rotation': args.archive_rotation,
+            'flush_interval_seconds': 60,
+            'retention_days': args.archive_retention_days,
+            'compression': 'zstd'
+        },
+        'trace': {
+            'enabled': args.trace is not None and not args.read_telemetry,
+            'path': args.trace,
+            'telemetry_interval_seconds': 60
+        },
+        'federation': {
+            'role': 'agent' if args.join else 'coordinator' if args.coordinator_port else None,
+            'host': args.host,
+            'port': args.coordinator_port,
+            'coordinator': args.join,
+            'node_id': args.node_id,
+            'node_lease_seconds': args.node_lease_seconds
         }
     }
 
     # Create and start server
     server = SOVRENMCPServer(config)
 
+    if args.join:
+        # Allocations on an agent's node are made only through the coordinator
+        from federation import NodeAgent
+        agent = NodeAgent(server, args.join, node_id=args.node_id)
+        try:
+            await agent.run()
+        except KeyboardInterrupt:
+            logger.info("Received shutdown signal")
+        finally:
+            await server.shutdown()
+        return
+
     try:
-        await server.start_server(host="0.0.0.0", port=8000)
+        await server.start_server(host=args.host, port=args.port)
     except KeyboardInterrupt:
         logger.info("Received shutdown signal")
     finally:
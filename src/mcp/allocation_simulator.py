@@ -0,0 +1,578 @@
+#!/usr/bin/env python3
+"""
+SOVREN Allocation Simulator
+Discrete-event replay of allocation traces against pluggable admission and placement policies
+"""
+
+import bisect
+import heapq
+import importlib
+import itertools
+import logging
+import math
+import os
+import random
+import time
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from allocation_trace import AllocationTraceRecorder, read_trace
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DURATION_SECONDS = 600.0
+PRIORITY_RANK = {'critical': 0, 'high': 1, 'medium': 2, 'normal': 2, 'low': 3}
+
+# Event kinds, in tie-break order: capacity is freed before it is requested at the same instant
+DEPARTURE = 0
+TELEMETRY = 1
+ARRIVAL = 2
+
+
+class SimRequest:
+    __slots__ = ('arrival', 'component', 'priority', 'memory_mb', 'gpu_count', 'pinned_gpu_ids',
+                 'duration', 'recorded')
+
+    def __init__(self, arrival: float, component: str, priority: str, memory_mb: float, gpu_count: int,
+                 pinned_gpu_ids: Optional[Tuple[int, ...]], duration: Optional[float], recorded: str):
+        self.arrival = arrival
+        self.component = component
+        self.priority = priority
+        self.memory_mb = memory_mb
+        self.gpu_count = gpu_count
+        self.pinned_gpu_ids = pinned_gpu_ids
+        self.duration = duration  # None: held until the end of the trace
+        self.recorded = recorded  # What the server did: 'allocate' or 'reject'
+
+
+class ReplayTrace:
+    """A trace reduced to requests with hold times and a telemetry timeline"""
+
+    def __init__(self, gpu_capacity_mb: List[float], max_gpu_temperature: float, requests: List[SimRequest],
+                 telemetry: List[Tuple[float, List[float], List[bool], List[float]]], start: float, end: float):
+        self.gpu_capacity_mb = gpu_capacity_mb
+        self.max_gpu_temperature = max_gpu_temperature
+        self.requests = requests
+        self.telemetry = telemetry  # (t, background_mb, lost, temperature) per GPU
+        self.start = start
+        self.end = end
+
+
+def load_replay(path: str, unpin: bool = False) -> ReplayTrace:
+    """Pair allocations with their releases and give rejected requests a typical hold time
+
+    A rejected request never ran, so it holds for the median duration of its
+    component's admitted requests. With unpin, requests for explicit GPU ids
+    become requests for that many GPUs, leaving their placement to the policy.
+    """
+    gpu_capacity_mb: List[float] = []
+    max_gpu_temperature = 82.0
+    requests: List[SimRequest] = []
+    telemetry = []
+    open_allocations: Dict[str, SimRequest] = {}
+    start = end = None
+
+    for event in read_trace(path):
+        t = event['t']
+        start = t if start is None else start
+        end = t
+        kind = event['event']
+        if kind == 'header':
+            if not gpu_capacity_mb:
+                gpu_capacity_mb = [gpu['memory_total_mb'] for gpu in event['gpus']]
+                max_gpu_temperature = event.get('max_gpu_temperature', max_gpu_temperature)
+            # A restart ends everything the previous session held
+            for request in open_allocations.values():
+                request.duration = t - request.arrival
+            open_allocations.clear()
+        elif kind in ('allocate', 'reject'):
+            pinned = event['pinned'] and not unpin
+            request = SimRequest(
+                arrival=t,
+                component=event['component'],
+                priority=event.get('priority') or 'normal',
+                memory_mb=(event.get('memory_gb') or 0) * 1024,
+                gpu_count=event.get('gpu_count') or 1,
+                pinned_gpu_ids=tuple(event['gpu_ids']) if pinned and event.get('gpu_ids') else None,
+                duration=None,
+                recorded=kind
+            )
+            requests.append(request)
+            if kind == 'allocate':
+                open_allocations[event['allocation_id']] = request
+        elif kind == 'release':
+            request = open_allocations.pop(event['allocation_id'], None)
+            if request is not None:
+                request.duration = t - request.arrival
+        elif kind == 'telemetry':
+            gpus = sorted(event['gpus'])
+            telemetry.append((
+                t,
+                [max(0.0, used - reserved) for _, _, used, reserved, _ in gpus],
+                [lost for _, lost, _, _, _ in gpus],
+                [temperature for _, _, _, _, temperature in gpus]
+            ))
+
+    if start is None:
+        raise ValueError(f"{path} holds no trace events")
+    if not gpu_capacity_mb:
+        raise ValueError(f"{path} has no header")
+
+    durations_by_component: Dict[str, List[float]] = {}
+    for request in requests:
+        if request.recorded == 'allocate' and request.duration is not None:
+            durations_by_component.setdefault(request.component, []).append(request.duration)
+    all_durations = sorted(itertools.chain.from_iterable(durations_by_component.values()))
+    fallback = all_durations[len(all_durations) // 2] if all_durations else DEFAULT_DURATION_SECONDS
+    medians = {component: sorted(durations)[len(durations) // 2]
+               for component, durations in durations_by_component.items()}
+    for request in requests:
+        if request.recorded == 'reject':
+            request.duration = medians.get(request.component, fallback)
+
+    return ReplayTrace(gpu_capacity_mb, max_gpu_temperature, requests, telemetry, start, end)
+
+
+class ClusterState:
+    """Per-GPU capacity as admission sees it: capacity - background - reserved"""
+
+    def __init__(self, gpu_capacity_mb: List[float], max_gpu_temperature: float):
+        self.gpu_count = len(gpu_capacity_mb)
+        self.capacity_mb = list(gpu_capacity_mb)
+        self.background_mb = [0.0] * self.gpu_count
+        self.reserved_mb = [0.0] * self.gpu_count
+        self.unavailable = [False] * self.gpu_count
+        self.temperature = [0.0] * self.gpu_count
+        self.max_gpu_temperature = max_gpu_temperature
+
+    def free_mb(self, gpu_id: int) -> float:
+        return self.capacity_mb[gpu_id] - self.background_mb[gpu_id] - self.reserved_mb[gpu_id]
+
+    def eligible(self, memory_mb: float) -> List[int]:
+        """GPUs that can take memory_mb: present, under the temperature limit and with room"""
+        return [gpu_id for gpu_id in range(self.gpu_count)
+                if not self.unavailable[gpu_id] and self.free_mb(gpu_id) >= memory_mb]
+
+    def could_ever_fit(self, request: SimRequest) -> bool:
+        """Whether the request fits the empty cluster; anything else is rejected outright"""
+        if request.pinned_gpu_ids is not None:
+            return all(gpu_id < self.gpu_count and self.capacity_mb[gpu_id] >= request.memory_mb
+                       for gpu_id in request.pinned_gpu_ids)
+        return sum(capacity >= request.memory_mb for capacity in self.capacity_mb) >= request.gpu_count
+
+    def apply_telemetry(self, background_mb: List[float], lost: List[bool], temperature: List[float]) -> None:
+        for gpu_id in range(min(self.gpu_count, len(background_mb))):
+            self.background_mb[gpu_id] = background_mb[gpu_id]
+            self.temperature[gpu_id] = temperature[gpu_id]
+            self.unavailable[gpu_id] = lost[gpu_id] or temperature[gpu_id] > self.max_gpu_temperature
+
+
+class PlacementPolicy:
+    """Chooses GPUs for a request, or None when it cannot be placed now
+
+    Requests pinned to explicit GPUs are admitted there or not at all;
+    subclasses choose among eligible GPUs for requests that give a count.
+    """
+
+    name = 'base'
+
+    def place(self, request: SimRequest, state: ClusterState) -> Optional[List[int]]:
+        if request.pinned_gpu_ids is not None:
+            for gpu_id in request.pinned_gpu_ids:
+                if gpu_id >= state.gpu_count or state.unavailable[gpu_id] or state.free_mb(gpu_id) < request.memory_mb:
+                    return None
+            return list(request.pinned_gpu_ids)
+        eligible = state.eligible(request.memory_mb)
+        if len(eligible) < request.gpu_count:
+            return None
+        return self.choose(request, eligible, state)
+
+    def choose(self, request: SimRequest, eligible: List[int], state: ClusterState) -> List[int]:
+        raise NotImplementedError
+
+
+class SafetyFirstPlacement(PlacementPolicy):
+    """The server's placement: most free memory first, coolest on ties"""
+
+    name = 'safety_first'
+
+    def choose(self, request, eligible, state):
+        eligible.sort(key=lambda gpu_id: (-state.free_mb(gpu_id), state.temperature[gpu_id], gpu_id))
+        return eligible[:request.gpu_count]
+
+
+class BestFitPlacement(PlacementPolicy):
+    """Least free memory that still fits, packing GPUs to keep whole GPUs free for large requests"""
+
+    name = 'best_fit'
+
+    def choose(self, request, eligible, state):
+        eligible.sort(key=lambda gpu_id: (state.free_mb(gpu_id), gpu_id))
+        return eligible[:request.gpu_count]
+
+
+class FirstFitPlacement(PlacementPolicy):
+    """Lowest-numbered GPUs that fit"""
+
+    name = 'first_fit'
+
+    def choose(self, request, eligible, state):
+        return eligible[:request.gpu_count]
+
+
+class AdmissionPolicy:
+    """What happens to a request that cannot be placed on arrival
+
+    max_wait_seconds of 0 rejects it, as the server does. Otherwise it waits in
+    a queue ordered by queue_key for up to max_wait_seconds; without backfill a
+    blocked queue head holds back everything behind it.
+    """
+
+    name = 'reject'
+    backfill = False
+
+    def __init__(self, max_wait_seconds: float = 0.0):
+        self.max_wait_seconds = max_wait_seconds
+
+    def queue_key(self, request: SimRequest) -> Tuple:
+        return (request.arrival,)
+
+
+class RejectAdmission(AdmissionPolicy):
+    name = 'reject'
+
+    def __init__(self, max_wait_seconds: float = 0.0):
+        super().__init__(0.0)
+
+
+class FifoAdmission(AdmissionPolicy):
+    name = 'fifo'
+
+
+class PriorityBackfillAdmission(AdmissionPolicy):
+    """Highest priority first, and anything behind a blocked request that fits goes ahead"""
+
+    name = 'priority'
+    backfill = True
+
+    def queue_key(self, request):
+        return (PRIORITY_RANK.get(request.priority, 2), request.arrival)
+
+
+PLACEMENT_POLICIES = {policy.name: policy for policy in (SafetyFirstPlacement, BestFitPlacement, FirstFitPlacement)}
+ADMISSION_POLICIES = {policy.name: policy for policy in (RejectAdmission, FifoAdmission, PriorityBackfillAdmission)}
+
+
+def load_policy(name: str, registry: Dict[str, type]) -> type:
+    """A built-in policy by name, or any class given as 'module:Class'"""
+    if ':' in name:
+        module_name, class_name = name.split(':', 1)
+        return getattr(importlib.import_module(module_name), class_name)
+    if name not in registry:
+        raise ValueError(f"Unknown policy '{name}' (expected one of {', '.join(registry)} or module:Class)")
+    return registry[name]
+
+
+def _percentile(values: Sequence[float], percent: float) -> float:
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, int(len(values) * percent / 100))]
+
+
+def simulate(trace: ReplayTrace, placement: PlacementPolicy, admission: AdmissionPolicy) -> Dict[str, Any]:
+    """Replay the trace's requests and telemetry; returns the policy's report
+
+    Utilization is reserved memory over the capacity of available GPUs,
+    time-weighted. Fragmentation is 1 - largest free block / total free memory,
+    time-weighted; a rejection counts as fragmentation-caused when the
+    cluster's total free memory could have held the request.
+    """
+    state = ClusterState(trace.gpu_capacity_mb, trace.max_gpu_temperature)
+    sequence = itertools.count()
+    events: List[Tuple[float, int, int, Any]] = [
+        (request.arrival, ARRIVAL, next(sequence), request) for request in trace.requests
+    ]
+    events.extend((sample[0], TELEMETRY, next(sequence), sample) for sample in trace.telemetry)
+    heapq.heapify(events)
+
+    queue: List[Tuple[Tuple, int, SimRequest]] = []
+    waits: List[float] = []
+    queued = rejected = fragmentation_rejections = recorded_rejections = 0
+
+    last_time = trace.start
+    reserved_area = capacity_area = busy_area = fragmentation_area = free_time = 0.0
+    metrics_dirty = True
+    reserved_total = available_capacity = busy = fragmentation = 0.0
+
+    def refresh_metrics() -> None:
+        nonlocal reserved_total, available_capacity, busy, fragmentation
+        reserved_total = available_capacity = busy = 0.0
+        largest_free = total_free = 0.0
+        for gpu_id in range(state.gpu_count):
+            reserved_total += state.reserved_mb[gpu_id]
+            if state.reserved_mb[gpu_id] > 0:
+                busy += 1
+            if state.unavailable[gpu_id]:
+                continue
+            available_capacity += state.capacity_mb[gpu_id]
+            free = max(0.0, state.free_mb(gpu_id))
+            total_free += free
+            largest_free = max(largest_free, free)
+        fragmentation = 1 - largest_free / total_free if total_free > 0 else -1.0
+
+    def start(request: SimRequest, gpu_ids: List[int], now: float) -> None:
+        nonlocal metrics_dirty
+        for gpu_id in gpu_ids:
+            state.reserved_mb[gpu_id] += request.memory_mb
+        end = now + request.duration if request.duration is not None else trace.end
+        heapq.heappush(events, (end, DEPARTURE, next(sequence), (request, gpu_ids)))
+        waits.append(now - request.arrival)
+        metrics_dirty = True
+
+    def reject(request: SimRequest) -> None:
+        nonlocal rejected, fragmentation_rejections
+        rejected += 1
+        total_free = sum(max(0.0, state.free_mb(gpu_id)) for gpu_id in range(state.gpu_count)
+                         if not state.unavailable[gpu_id])
+        if total_free >= request.memory_mb * request.gpu_count:
+            fragmentation_rejections += 1
+
+    def drain(now: float) -> None:
+        for index in range(len(queue) - 1, -1, -1):
+            if now - queue[index][2].arrival > admission.max_wait_seconds:
+                reject(queue.pop(index)[2])
+        index = 0
+        while index < len(queue):
+            request = queue[index][2]
+            gpu_ids = placement.place(request, state)
+            if gpu_ids is not None:
+                queue.pop(index)
+                start(request, gpu_ids, now)
+            elif admission.backfill:
+                index += 1
+            else:
+                break
+
+    while events:
+        now, kind, _, payload = heapq.heappop(events)
+        if now > trace.end:
+            break
+        if metrics_dirty:
+            refresh_metrics()
+            metrics_dirty = False
+        elapsed = now - last_time
+        if elapsed > 0:
+            reserved_area += elapsed * reserved_total
+            capacity_area += elapsed * available_capacity
+            busy_area += elapsed * busy
+            if fragmentation >= 0:
+                fragmentation_area += elapsed * fragmentation
+                free_time += elapsed
+            last_time = now
+
+        if kind == ARRIVAL:
+            request = payload
+            recorded_rejections += request.recorded == 'reject'
+            gpu_ids = None if queue and not admission.backfill else placement.place(request, state)
+            if gpu_ids is not None:
+                start(request, gpu_ids, now)
+            elif admission.max_wait_seconds > 0 and state.could_ever_fit(request):
+                queued += 1
+                bisect.insort(queue, (admission.queue_key(request), next(sequence), request))
+            else:
+                reject(request)
+        elif kind == DEPARTURE:
+            request, gpu_ids = payload
+            for gpu_id in gpu_ids:
+                state.reserved_mb[gpu_id] -= request.memory_mb
+            metrics_dirty = True
+            drain(now)
+        else:
+            _, background_mb, lost, temperature = payload
+            state.apply_telemetry(background_mb, lost, temperature)
+            metrics_dirty = True
+            drain(now)
+
+    # Whatever is still waiting when the trace ends was never served
+    for _, _, request in queue:
+        reject(request)
+
+    arrivals = len(trace.requests)
+    waits.sort()
+    duration = trace.end - trace.start
+    return {
+        'placement': placement.name,
+        'admission': admission.name,
+        'max_wait_seconds': admission.max_wait_seconds,
+        'trace_days': duration / 86400,
+        'gpu_count': state.gpu_count,
+        'arrivals': arrivals,
+        'admitted': len(waits),
+        'rejected': rejected,
+        'rejection_rate': rejected / arrivals if arrivals else 0.0,
+        'recorded_rejection_rate': recorded_rejections / arrivals if arrivals else 0.0,
+        'fragmentation_rejections': fragmentation_rejections,
+        'queued': queued,
+        'queueing_delay_s': {
+            'mean': sum(waits) / len(waits) if waits else 0.0,
+            'p50': _percentile(waits, 50),
+            'p95': _percentile(waits, 95),
+            'p99': _percentile(waits, 99),
+            'max': waits[-1] if waits else 0.0
+        },
+        'utilization': reserved_area / capacity_area if capacity_area else 0.0,
+        'gpu_busy_fraction': busy_area / (duration * state.gpu_count) if duration else 0.0,
+        'fragmentation': fragmentation_area / free_time if free_time else 0.0
+    }
+
+
+# Synthetic workload: (component, model_type, quantization, gpu_count, priority, weight, mean hold seconds)
+SYNTHETIC_WORKLOAD = [
+    ('sovren_core', 'Qwen2.5-405B', 'fp8', 4, 'critical', 0.04, 4 * 3600),
+    ('shadow_board_cfo', 'Qwen2.5-70B', 'fp8', 1, 'high', 0.12, 1800),
+    ('shadow_board_cmo', 'Qwen2.5-70B', 'fp8', 1, 'high', 0.12, 1800),
+    ('voice_synthesis', 'Qwen2.5-7B', 'fp16', 1, 'high', 0.30, 300),
+    ('embedding', 'Qwen2.5-7B', 'int8', 1, 'medium', 0.22, 600),
+    ('batch_analysis', 'Qwen2.5-32B', 'fp16', 2, 'low', 0.20, 1200),
+]
+
+
+def synthesize_trace(path: str, days: float, gpu_count: int = 8, seed: int = 0,
+                     mean_interarrival_seconds: float = 60.0, telemetry_interval_seconds: float = 60.0) -> int:
+    """Write a synthetic demand trace with a diurnal arrival rate; returns the number of arrivals
+
+    Every request is recorded as admitted, so the trace describes demand only and
+    its recorded rejection rate is zero.
+    """
+    from b200_simulator import B200_MEMORY_TOTAL_MB
+    from memory_estimator import estimate_memory, resolve_model, round_up_gb
+
+    rng = random.Random(seed)
+    workload = []
+    for component, model_type, quantization, count, priority, weight, hold in SYNTHETIC_WORKLOAD:
+        estimate = estimate_memory(resolve_model(model_type), quantization, context_length=8192,
+                                   batch_size=4, tensor_parallel=count)
+        workload.append((component, model_type, quantization, count, priority, weight, hold,
+                         round_up_gb(estimate['per_gpu_gb'])))
+    weights = [entry[5] for entry in workload]
+
+    start = 1_700_000_000.0
+    end = start + days * 86400
+    events: List[Tuple[float, int, Dict[str, Any]]] = []
+
+    # Poisson arrivals thinned to a daily cycle peaking at twice the mean rate
+    t = start
+    index = 0
+    while True:
+        t += rng.expovariate(2.0 / mean_interarrival_seconds)
+        if t >= end:
+            break
+        if rng.random() > (1 + math.sin(2 * math.pi * (t - start) / 86400)) / 2:
+            continue
+        component, model_type, quantization, count, priority, _, hold, memory_gb = rng.choices(workload, weights)[0]
+        allocation_id = f"syn_{index}"
+        index += 1
+        request = {'component': component, 'priority': priority, 'gpu_count': count, 'memory_gb': memory_gb,
+                   'model_type': model_type, 'quantization': quantization}
+        events.append((t, 0, {'request': request, 'allocation_id': allocation_id}))
+        events.append((t + rng.expovariate(1.0 / hold), 1, {'allocation_id': allocation_id}))
+
+    t = start
+    while t < end:
+        events.append((t, 2, {}))
+        t += telemetry_interval_seconds
+    events.sort(key=lambda event: (event[0], event[1]))
+
+    # The recorder appends, as a restarted server would; a synthetic trace starts fresh
+    if os.path.exists(path):
+        os.remove(path)
+    recorder = AllocationTraceRecorder(path, telemetry_interval_seconds=telemetry_interval_seconds)
+    recorder.record_header([{'gpu_id': gpu_id, 'memory_total_mb': B200_MEMORY_TOTAL_MB} for gpu_id in range(gpu_count)],
+                           max_gpu_temperature=82, timestamp=start)
+    for t, kind, event in events:
+        if t >= end:
+            continue
+        if kind == 0:
+            allocation = SimpleNamespace(allocation_id=event['allocation_id'], gpu_ids=[],
+                                         memory_gb=event['request']['memory_gb'])
+            recorder.record_arrival(event['request'], pinned=False, allocation=allocation, timestamp=t)
+        elif kind == 1:
+            recorder.record_release(event['allocation_id'], 'released', timestamp=t)
+        else:
+            gpus = [SimpleNamespace(memory_used=rng.uniform(1024, 3072), temperature=rng.uniform(45, 70))
+                    for _ in range(gpu_count)]
+            recorder.record_telemetry(gpus, {}, timestamp=t)
+    recorder.close()
+    return index
+
+
+def main():
+    """Replay a trace against one policy pair, or compare all built-in pairs"""
+    import argparse
+    import json
+
+    parser = argparse.ArgumentParser(description="Replay an MCP allocation trace against admission and placement policies")
+    parser.add_argument("--trace", help="Trace recorded with --trace (JSON lines, optionally .gz)")
+    parser.add_argument("--placement", default="safety_first",
+                        help=f"Placement policy: {', '.join(PLACEMENT_POLICIES)} or module:Class (default: safety_first)")
+    parser.add_argument("--admission", default="reject",
+                        help=f"Admission policy: {', '.join(ADMISSION_POLICIES)} or module:Class (default: reject)")
+    parser.add_argument("--max-wait", type=float, default=300.0,
+                        help="Seconds a queued request may wait, for queueing admission policies (default: 300)")
+    parser.add_argument("--unpin", action="store_true",
+                        help="Let the placement policy place requests that named explicit GPU ids")
+    parser.add_argument("--compare", action="store_true", help="Run every built-in policy pair")
+    parser.add_argument("--json", action="store_true", help="Print reports as JSON")
+    parser.add_argument("--synthesize-days", type=float, default=None,
+                        help="Write a synthetic trace of this many days to --trace instead of replaying")
+    parser.add_argument("--gpus", type=int, default=8, help="GPUs in a synthetic trace (default: 8)")
+    parser.add_argument("--seed", type=int, default=0, help="Synthetic trace seed (default: 0)")
+    args = parser.parse_args()
+
+    if not args.trace:
+        parser.error("--trace is required")
+
+    if args.synthesize_days is not None:
+        started = time.perf_counter()
+        arrivals = synthesize_trace(args.trace, args.synthesize_days, args.gpus, args.seed)
+        print(f"Wrote {arrivals} arrivals over {args.synthesize_days:g} days to {args.trace} "
+              f"in {time.perf_counter() - started:.1f}s")
+        return
+
+    started = time.perf_counter()
+    trace = load_replay(args.trace, unpin=args.unpin)
+    load_seconds = time.perf_counter() - started
+
+    if args.compare:
+        pairs = [(placement, admission) for admission in ADMISSION_POLICIES for placement in PLACEMENT_POLICIES]
+    else:
+        pairs = [(args.placement, args.admission)]
+
+    reports = []
+    for placement_name, admission_name in pairs:
+        placement = load_policy(placement_name, PLACEMENT_POLICIES)()
+        admission = load_policy(admission_name, ADMISSION_POLICIES)(args.max_wait)
+        started = time.perf_counter()
+        report = simulate(trace, placement, admission)
+        report['simulation_seconds'] = time.perf_counter() - started
+        reports.append(report)
+
+    if args.json:
+        print(json.dumps(reports, indent=2))
+        return
+
+    print(f"{len(trace.requests)} requests over {(trace.end - trace.start) / 86400:.1f} days on "
+          f"{len(trace.gpu_capacity_mb)} GPUs, loaded in {load_seconds:.1f}s; "
+          f"recorded rejection rate {reports[0]['recorded_rejection_rate']:.2%}")
+    print(f"{'placement':<14}{'admission':<10}{'util':>7}{'busy':>7}{'reject':>8}{'frag rej':>9}"
+          f"{'wait p50':>10}{'wait p99':>10}{'frag':>7}{'sim':>7}")
+    for report in reports:
+        delay = report['queueing_delay_s']
+        print(f"{report['placement']:<14}{report['admission']:<10}{report['utilization']:>7.1%}"
+              f"{report['gpu_busy_fraction']:>7.1%}{report['rejection_rate']:>8.2%}"
+              f"{report['fragmentation_rejections']:>9}{delay['p50']:>9.0f}s{delay['p99']:>9.0f}s"
+              f"{report['fragmentation']:>7.2f}{report['simulation_seconds']:>6.1f}s")
+
+
+if __name__ == "__main__":
+    main()
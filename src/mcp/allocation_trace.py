@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+SOVREN Allocation Trace
+Append-only record of allocation requests, releases and GPU telemetry for offline policy replay
+"""
+
+import gzip
+import json
+import logging
+import os
+import time
+from typing import Any, Dict, Iterator, List, Optional
+
+from serialization import ORJSON_AVAILABLE, encode, orjson
+
+logger = logging.getLogger(__name__)
+
+TRACE_VERSION = 1
+
+
+class AllocationTraceRecorder:
+    """Writes one JSON object per line: header, allocate, reject, release, telemetry
+
+    Every arrival is recorded with its outcome (allocate or reject) and the
+    request after memory estimation, so a replay sees what admission saw.
+    Telemetry is down-sampled to telemetry_interval_seconds and records, per
+    GPU, memory used alongside memory reserved by the ledger: the difference is
+    the background usage a replay cannot derive from the requests alone.
+    """
+
+    def __init__(self, path: str, telemetry_interval_seconds: float = 60.0,
+                 flush_interval_seconds: float = 5.0):
+        self.path = path
+        self.telemetry_interval_seconds = telemetry_interval_seconds
+        self.flush_interval_seconds = flush_interval_seconds
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._file = gzip.open(path, 'ab') if path.endswith('.gz') else open(path, 'ab')
+        self._last_telemetry = float('-inf')
+        self._last_flush = time.monotonic()
+        self.events_written = 0
+
+    def _write(self, event: Dict[str, Any]) -> None:
+        self._file.write(encode(event) + b'\n')
+        self.events_written += 1
+
+    def record_header(self, gpus: List[Dict[str, Any]], max_gpu_temperature: float,
+                      timestamp: Optional[float] = None) -> None:
+        """Start of a recording session; a server restart appends a new header"""
+        self._write({
+            'event': 'header',
+            'version': TRACE_VERSION,
+            't': timestamp if timestamp is not None else time.time(),
+            'gpus': gpus,
+            'max_gpu_temperature': max_gpu_temperature
+        })
+
+    def record_arrival(self, request: Dict[str, Any], pinned: bool, allocation=None,
+                       reason: Optional[str] = None, timestamp: Optional[float] = None) -> None:
+        """An allocation request and its outcome: the allocation, or why it was rejected"""
+        gpu_ids = allocation.gpu_ids if allocation is not None else request.get('gpu_ids')
+        self._write({
+            'event': 'allocate' if allocation is not None else 'reject',
+            't': timestamp if timestamp is not None else time.time(),
+            'allocation_id': allocation.allocation_id if allocation is not None else None,
+            'component': request.get('component'),
+            'priority': request.get('priority', 'normal'),
+            'gpu_ids': gpu_ids if pinned or allocation is not None else None,
+            'gpu_count': len(gpu_ids) if gpu_ids else request.get('gpu_count', 1),
+            'pinned': pinned,
+            'memory_gb': allocation.memory_gb if allocation is not None else request.get('memory_gb', 0),
+            'model_type': request.get('model_type'),
+            'lease_seconds': request.get('lease_seconds'),
+            'reason': reason
+        })
+
+    def record_release(self, allocation_id: str, reason: str, timestamp: Optional[float] = None) -> None:
+        self._write({
+            'event': 'release',
+            't': timestamp if timestamp is not None else time.time(),
+            'allocation_id': allocation_id,
+            'reason': reason
+        })
+
+    def record_telemetry(self, gpus: List[Optional[Any]], reserved_mb: Dict[int, float],
+                         timestamp: Optional[float] = None) -> None:
+        """Per GPU [gpu_id, lost, memory_used_mb, reserved_mb, temperature], rate limited"""
+        timestamp = timestamp if timestamp is not None else time.time()
+        if timestamp - self._last_telemetry < self.telemetry_interval_seconds:
+            return
+        self._last_telemetry = timestamp
+        self._write({
+            'event': 'telemetry',
+            't': timestamp,
+            'gpus': [
+                [gpu_id, True, 0.0, reserved_mb.get(gpu_id, 0.0), 0.0] if gpu is None else
+                [gpu_id, False, gpu.memory_used, reserved_mb.get(gpu_id, 0.0), gpu.temperature]
+                for gpu_id, gpu in enumerate(gpus)
+            ]
+        })
+
+    def maybe_flush(self) -> None:
+        now = time.monotonic()
+        if now - self._last_flush >= self.flush_interval_seconds:
+            self._file.flush()
+            self._last_flush = now
+
+    def close(self) -> None:
+        self._file.close()
+
+
+def read_trace(path: str) -> Iterator[Dict[str, Any]]:
+    """Trace events in file order; a torn last line from a crash is skipped"""
+    opener = gzip.open if path.endswith('.gz') else open
+    loads = orjson.loads if ORJSON_AVAILABLE else json.loads
+
+    with opener(path, 'rb') as f:
+        for line_number, line in enumerate(f, 1):
+            try:
+                yield loads(line)
+            except ValueError:
+                logger.warning(f"{path}:{line_number}: skipping unreadable trace line")
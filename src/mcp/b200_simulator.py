@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+"""
+SOVREN B200 Fleet Simulator
+Deterministic GPU-less model of a B200 cluster for CI, benchmarking and scenario replay
+"""
+
+import json
+import logging
+import math
+import random
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Mapping, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+# B200 Blackwell physical envelope
+B200_MEMORY_TOTAL_MB = 183359.0
+B200_DRIVER_RESERVED_MB = 512.0
+B200_IDLE_POWER_WATTS = 140.0
+B200_MAX_POWER_WATTS = 1000.0
+AMBIENT_TEMPERATURE_C = 30.0
+THERMAL_RESISTANCE_C_PER_WATT = 0.055  # 1000W settles at ~85C with nominal cooling
+THERMAL_TIME_CONSTANT_S = 30.0
+
+SIMULATED_PID_BASE = 400000
+
+
+class GPULostError(RuntimeError):
+    """Raised when a simulated GPU has fallen off the bus"""
+
+
+class ManualClock:
+    """Explicitly advanced clock for reproducible replays"""
+
+    def __init__(self, start: float = 0.0):
+        self.now = start
+
+    def advance(self, seconds: float) -> None:
+        self.now += seconds
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@dataclass
+class ScenarioEvent:
+    """Scripted fault injected into the fleet at a simulated time"""
+    kind: str  # 'thermal_ramp', 'memory_leak', 'fall_off_bus', 'recover'
+    gpu_id: int
+    start_s: float
+    duration_s: float = 0.0  # 0 means the effect persists
+    magnitude: float = 0.0  # degrees C for thermal_ramp, MB/s for memory_leak
+
+    def active(self, sim_time: float) -> bool:
+        if sim_time < self.start_s:
+            return False
+        return self.duration_s <= 0 or sim_time < self.start_s + self.duration_s
+
+
+@dataclass
+class SimulatedGPU:
+    """Physical state of one simulated B200"""
+    gpu_id: int
+    uuid: str
+    memory_total: float = B200_MEMORY_TOTAL_MB
+    leaked_memory: float = 0.0
+    utilization: float = 0.0
+    temperature: float = AMBIENT_TEMPERATURE_C + B200_IDLE_POWER_WATTS * THERMAL_RESISTANCE_C_PER_WATT
+    power_draw: float = B200_IDLE_POWER_WATTS
+    thermal_offset: float = 0.0
+    lost: bool = False
+
+
+SCENARIOS: Dict[str, Callable[[int], List[ScenarioEvent]]] = {
+    'steady': lambda gpu_count: [],
+    # Cooling failure on GPU 0: +25C over 5 minutes
+    'thermal_ramp': lambda gpu_count: [
+        ScenarioEvent('thermal_ramp', 0, start_s=60, duration_s=300, magnitude=25.0)
+    ],
+    # Runaway allocation on the last GPU: 512 MB/s until the card is full
+    'memory_leak': lambda gpu_count: [
+        ScenarioEvent('memory_leak', gpu_count - 1, start_s=30, magnitude=512.0)
+    ],
+    # GPU 1 falls off the bus and comes back after a reset
+    'gpu_lost': lambda gpu_count: [
+        ScenarioEvent('fall_off_bus', min(1, gpu_count - 1), start_s=120),
+        ScenarioEvent('recover', min(1, gpu_count - 1), start_s=420)
+    ],
+}
+
+
+def load_scenario(scenario: Optional[str], gpu_count: int) -> List[ScenarioEvent]:
+    """Resolve a built-in scenario name or a JSON file of events"""
+    if not scenario:
+        return []
+    if scenario in SCENARIOS:
+        return SCENARIOS[scenario](gpu_count)
+    with open(scenario) as f:
+        return [ScenarioEvent(**event) for event in json.load(f)]
+
+
+class B200FleetSimulator:
+    """Seeded model of N B200s reacting to the allocation ledger
+
+    Time advances in fixed ticks derived from the injected clock, so the fleet
+    state is a pure function of (seed, scenario, ledger history per tick).
+    """
+
+    def __init__(self, gpu_count: int = 8, seed: int = 0,
+                 scenario: Optional[str] = None, tick_seconds: float = 1.0,
+                 clock: Optional[Callable[[], float]] = None):
+        if gpu_count < 1:
+            raise ValueError("gpu_count must be at least 1")
+        self.gpu_count = gpu_count
+        self.seed = seed
+        self.tick_seconds = tick_seconds
+        self.clock = clock or time.monotonic
+        self.rng = random.Random(seed)
+        self.events = load_scenario(scenario, gpu_count)
+        self.scenario = scenario or 'steady'
+
+        self.gpus = [
+            SimulatedGPU(gpu_id=i, uuid=f"GPU-5a1b200-{seed:04x}-{i:04d}")
+            for i in range(gpu_count)
+        ]
+        self.ledger: Mapping[str, Any] = {}
+        self.tick = 0
+        self._epoch = self.clock()
+        self._pids: Dict[str, int] = {}
+        self._exited_pids: Set[int] = set()
+        self._process_memory: Dict[int, float] = {}  # Per-GPU MB overriding the reservation
+
+    @property
+    def sim_time(self) -> float:
+        return self.tick * self.tick_seconds
+
+    def attach_ledger(self, ledger: Mapping[str, Any]) -> None:
+        """Observe a live allocation ledger (allocation_id -> allocation)"""
+        self.ledger = ledger
+
+    def sync(self) -> None:
+        """Advance the model to the clock's current tick"""
+        target_tick = int((self.clock() - self._epoch) / self.tick_seconds)
+        while self.tick < target_tick:
+            self.step()
+
+    def step(self) -> None:
+        """Advance the fleet by one tick"""
+        self.tick += 1
+        decay = 1.0 - math.exp(-self.tick_seconds / THERMAL_TIME_CONSTANT_S)
+
+        for gpu in self.gpus:
+            self._apply_events(gpu)
+            if gpu.lost:
+                continue
+
+            processes = self._processes_on(gpu.gpu_id)
+            load = sum(15.0 + 70.0 * (memory_mb / gpu.memory_total) for _, _, memory_mb in processes)
+            gpu.utilization = min(100.0, max(0.0, load + self.rng.gauss(0.0, 2.0) if processes else self.rng.uniform(0.0, 1.0)))
+            gpu.power_draw = (B200_IDLE_POWER_WATTS
+                              + (B200_MAX_POWER_WATTS - B200_IDLE_POWER_WATTS) * gpu.utilization / 100
+                              + self.rng.gauss(0.0, 5.0))
+            target_temperature = (AMBIENT_TEMPERATURE_C
+                                  + gpu.power_draw * THERMAL_RESISTANCE_C_PER_WATT
+                                  + gpu.thermal_offset)
+            gpu.temperature += (target_temperature - gpu.temperature) * decay
+
+    def _apply_events(self, gpu: SimulatedGPU) -> None:
+        now = self.sim_time
+        for event in self.events:
+            if event.gpu_id != gpu.gpu_id or now < event.start_s:
+                continue
+            if event.kind == 'thermal_ramp':
+                if event.duration_s > 0:
+                    progress = min(1.0, (now - event.start_s) / event.duration_s)
+                else:
+                    progress = 1.0
+                gpu.thermal_offset = event.magnitude * progress
+            elif event.kind == 'memory_leak' and event.active(now):
+                gpu.leaked_memory += event.magnitude * self.tick_seconds
+            elif event.kind == 'fall_off_bus' and now - event.start_s < self.tick_seconds:
+                gpu.lost = True
+                logger.warning(f"Simulated GPU {gpu.gpu_id} fell off the bus at t={now:.0f}s")
+            elif event.kind == 'recover' and now - event.start_s < self.tick_seconds:
+                gpu.lost = False
+                gpu.leaked_memory = 0.0
+                logger.info(f"Simulated GPU {gpu.gpu_id} recovered at t={now:.0f}s")
+
+    def _processes_on(self, gpu_id: int) -> List[tuple]:
+        processes = []
+        for allocation_id, allocation in list(self.ledger.items()):
+            if gpu_id not in allocation.gpu_ids:
+                continue
+            pid = self._pids.get(allocation_id)
+            if pid in self._exited_pids:
+                continue
+            processes.append((allocation_id, allocation.component,
+                              self._process_memory.get(pid, allocation.memory_gb * 1024)))
+        return processes
+
+    def _pid_for(self, allocation_id: str) -> int:
+        # PIDs are assigned in first-seen order so replays are reproducible
+        if allocation_id not in self._pids:
+            self._pids[allocation_id] = SIMULATED_PID_BASE + len(self._pids)
+        return self._pids[allocation_id]
+
+    def pid_of(self, allocation_id: str) -> int:
+        """Simulated PID of the process serving an allocation"""
+        return self._pid_for(allocation_id)
+
+    def exit_process(self, pid: int) -> None:
+        """Kill a simulated process without releasing its allocation, freeing its memory"""
+        self._exited_pids.add(pid)
+
+    def set_process_memory(self, pid: int, memory_mb: float) -> None:
+        """Make a simulated process use more or less than its allocation reserved"""
+        self._process_memory[pid] = memory_mb
+
+    def process_alive(self, pid: int) -> bool:
+        return pid in self._pids.values() and pid not in self._exited_pids
+
+    def read_gpu(self, gpu_id: int) -> Dict[str, Any]:
+        """Return the current reading of one GPU, as nvidia-smi would"""
+        self.sync()
+        gpu = self.gpus[gpu_id]
+        if gpu.lost:
+            raise GPULostError(f"GPU {gpu_id} ({gpu.uuid}) has fallen off the bus")
+
+        # Memory and the process table react to the ledger immediately, as a model load would
+        processes = [
+            {'pid': self._pid_for(allocation_id), 'name': component, 'memory_mb': memory_mb}
+            for allocation_id, component, memory_mb in self._processes_on(gpu_id)
+        ]
+        reserved = sum(process['memory_mb'] for process in processes)
+        memory_used = min(gpu.memory_total, B200_DRIVER_RESERVED_MB + reserved + gpu.leaked_memory)
+
+        return {
+            'gpu_id': gpu_id,
+            'uuid': gpu.uuid,
+            'memory_used': memory_used,
+            'memory_total': gpu.memory_total,
+            'memory_free': gpu.memory_total - memory_used,
+            'utilization': round(gpu.utilization, 1),
+            'temperature': round(gpu.temperature, 1),
+            'power_draw': round(max(0.0, gpu.power_draw), 1),
+            'processes': processes
+        }
+
+
+def main():
+    """Replay a scenario without a server and print one JSON line per tick"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Replay a simulated B200 fleet scenario")
+    parser.add_argument("--gpus", type=int, default=8, help="Number of simulated GPUs")
+    parser.add_argument("--seed", type=int, default=0, help="RNG seed")
+    parser.add_argument("--scenario", default="steady",
+                        help=f"Built-in scenario ({', '.join(SCENARIOS)}) or JSON event file")
+    parser.add_argument("--seconds", type=int, default=600, help="Simulated duration")
+    args = parser.parse_args()
+
+    clock = ManualClock()
+    fleet = B200FleetSimulator(args.gpus, seed=args.seed, scenario=args.scenario, clock=clock)
+
+    for _ in range(args.seconds):
+        clock.advance(fleet.tick_seconds)
+        readings = []
+        for gpu_id in range(fleet.gpu_count):
+            try:
+                reading = fleet.read_gpu(gpu_id)
+                readings.append({k: reading[k] for k in ('gpu_id', 'memory_used', 'utilization', 'temperature', 'power_draw')})
+            except GPULostError:
+                readings.append({'gpu_id': gpu_id, 'lost': True})
+        print(json.dumps({'t': fleet.sim_time, 'gpus': readings}))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,689 @@
+#!/usr/bin/env python3
+"""
+SOVREN MCP Server Load Benchmark
+High-concurrency latency/throughput benchmark with baseline regression checks
+"""
+
+import asyncio
+import json
+import logging
+import random
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import httpx
+import websockets
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+logging.getLogger("httpx").setLevel(logging.WARNING)
+
+OPERATIONS = ('allocate', 'release', 'status', 'health')
+DEFAULT_MIX = 'allocate=1,release=1,status=2,health=6'
+
+
+def parse_mix(mix: str) -> Dict[str, float]:
+    """Parse an operation mix such as 'allocate=1,release=1,status=2,health=6'"""
+    weights = {}
+    for part in mix.split(','):
+        op, _, weight = part.partition('=')
+        op = op.strip()
+        if op not in OPERATIONS:
+            raise ValueError(f"Unknown operation '{op}' (expected one of {', '.join(OPERATIONS)})")
+        weights[op] = float(weight or 1)
+    return weights
+
+
+def percentile(sorted_values: List[float], p: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(p / 100 * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[index]
+
+
+def summarize_latencies(latencies_ms: List[float]) -> Dict[str, float]:
+    """p50/p95/p99/mean/max of a latency sample"""
+    values = sorted(latencies_ms)
+    return {
+        'p50': percentile(values, 50),
+        'p95': percentile(values, 95),
+        'p99': percentile(values, 99),
+        'mean': sum(values) / len(values) if values else 0.0,
+        'max': values[-1] if values else 0.0
+    }
+
+
+class MCPServerBenchmark:
+    """Async load generator for the MCP server HTTP and WebSocket APIs"""
+
+    def __init__(self, server_url: str = "http://localhost:8000", mix: str = DEFAULT_MIX,
+                 concurrency: int = 32, duration: float = 30.0, ws_subscribers: int = 8,
+                 seed: int = 0):
+        self.server_url = server_url
+        self.websocket_url = server_url.replace("http", "ws") + "/ws"
+        self.mix = parse_mix(mix)
+        self.concurrency = concurrency
+        self.duration = duration
+        self.ws_subscribers = ws_subscribers
+        self.seed = seed
+
+        self.latencies: Dict[str, List[float]] = {op: [] for op in OPERATIONS}
+        self.counts: Dict[str, int] = {op: 0 for op in OPERATIONS}
+        self.errors: Dict[str, int] = {op: 0 for op in OPERATIONS}
+        self.allocation_pool: List[str] = []
+        self.gpu_count = 1
+        self.client_lag_ms: List[float] = []
+        self.ws_stats = {'connected': 0, 'messages': 0, 'errors': 0, 'connect_latency_ms': []}
+        self._deadline = 0.0
+
+    async def _timed(self, op: str, call) -> Optional[httpx.Response]:
+        self.counts[op] += 1
+        start = time.perf_counter()
+        try:
+            response = await call
+        except Exception as e:
+            self.errors[op] += 1
+            logger.debug(f"{op} failed: {e}")
+            return None
+        self.latencies[op].append((time.perf_counter() - start) * 1000)
+        if response.status_code >= 400:
+            self.errors[op] += 1
+        return response
+
+    async def _allocate(self, client: httpx.AsyncClient, rng: random.Random, worker_id: int) -> None:
+        request = {
+            'component': f'benchmark_worker_{worker_id}',
+            'gpu_ids': [rng.randrange(self.gpu_count)],
+            'memory_gb': 1.0,
+            'priority': 'low'
+        }
+        response = await self._timed('allocate', client.post("/allocate", json=request))
+        if response is not None and response.status_code == 200:
+            self.allocation_pool.append(response.json()['allocation_id'])
+
+    async def _worker(self, client: httpx.AsyncClient, worker_id: int) -> None:
+        rng = random.Random(self.seed * 100003 + worker_id)
+        ops = list(self.mix)
+        weights = [self.mix[op] for op in ops]
+
+        while time.perf_counter() < self._deadline:
+            op = rng.choices(ops, weights)[0]
+            if op == 'release' and self.allocation_pool:
+                allocation_id = self.allocation_pool.pop(rng.randrange(len(self.allocation_pool)))
+                await self._timed('release', client.delete(f"/allocate/{allocation_id}"))
+            elif op in ('allocate', 'release'):
+                await self._allocate(client, rng, worker_id)
+            elif op == 'status':
+                await self._timed('status', client.get("/status"))
+            else:
+                await self._timed('health', client.get("/health"))
+
+    async def _ws_subscriber(self) -> None:
+        start = time.perf_counter()
+        try:
+            async with websockets.connect(self.websocket_url, open_timeout=10) as websocket:
+                self.ws_stats['connected'] += 1
+                self.ws_stats['connect_latency_ms'].append((time.perf_counter() - start) * 1000)
+                while True:
+                    remaining = self._deadline - time.perf_counter()
+                    if remaining <= 0:
+                        return
+                    try:
+                        message = await asyncio.wait_for(websocket.recv(), timeout=remaining)
+                    except asyncio.TimeoutError:
+                        return
+                    json.loads(message)
+                    self.ws_stats['messages'] += 1
+        except Exception as e:
+            self.ws_stats['errors'] += 1
+            logger.debug(f"WebSocket subscriber failed: {e}")
+
+    async def _client_lag_probe(self, interval: float = 0.1) -> None:
+        loop = asyncio.get_running_loop()
+        while time.perf_counter() < self._deadline:
+            scheduled = loop.time() + interval
+            await asyncio.sleep(interval)
+            self.client_lag_ms.append(max(0.0, loop.time() - scheduled) * 1000)
+
+    async def run(self) -> Dict[str, Any]:
+        """Run the benchmark and return the results document"""
+        limits = httpx.Limits(max_connections=self.concurrency, max_keepalive_connections=self.concurrency)
+        async with httpx.AsyncClient(base_url=self.server_url, limits=limits, timeout=30.0) as client:
+            health = (await client.get("/health")).json()
+            self.gpu_count = max(1, health.get('gpu_count', 1))
+
+            logger.info(f"🏋️ Benchmarking {self.server_url}: {self.concurrency} workers, "
+                        f"{self.ws_subscribers} WebSocket subscribers, {self.duration:.0f}s, mix={self.mix}")
+
+            started = time.perf_counter()
+            self._deadline = started + self.duration
+            await asyncio.gather(
+                *(self._worker(client, i) for i in range(self.concurrency)),
+                *(self._ws_subscriber() for _ in range(self.ws_subscribers)),
+                self._client_lag_probe()
+            )
+            elapsed = time.perf_counter() - started
+
+            server_health = (await client.get("/health")).json()
+
+            # Leave the ledger as we found it
+            for allocation_id in self.allocation_pool:
+                await client.delete(f"/allocate/{allocation_id}")
+            self.allocation_pool.clear()
+
+        return self._build_results(elapsed, server_health)
+
+    def _build_results(self, elapsed: float, server_health: Dict[str, Any]) -> Dict[str, Any]:
+        operations = {}
+        for op in OPERATIONS:
+            count = self.counts[op]
+            if not count:
+                continue
+            operations[op] = {
+                'count': count,
+                'errors': self.errors[op],
+                'error_rate': self.errors[op] / count,
+                'throughput_rps': count / elapsed,
+                'latency_ms': summarize_latencies(self.latencies[op])
+            }
+
+        total_requests = sum(op['count'] for op in operations.values())
+        total_errors = sum(op['errors'] for op in operations.values())
+
+        return {
+            'timestamp': time.time(),
+            'config': {
+                'server_url': self.server_url,
+                'mix': self.mix,
+                'concurrency': self.concurrency,
+                'duration_s': self.duration,
+                'ws_subscribers': self.ws_subscribers,
+                'seed': self.seed
+            },
+            'elapsed_s': elapsed,
+            'total_requests': total_requests,
+            'throughput_rps': total_requests / elapsed,
+            'error_rate': total_errors / max(1, total_requests),
+            'operations': operations,
+            'websocket': {
+                'subscribers': self.ws_subscribers,
+                'connected': self.ws_stats['connected'],
+                'messages': self.ws_stats['messages'],
+                'errors': self.ws_stats['errors'],
+                'connect_latency_ms': summarize_latencies(self.ws_stats['connect_latency_ms'])
+            },
+            'event_loop_lag': {
+                'server': server_health.get('event_loop_lag', {}),
+                'client': summarize_latencies(self.client_lag_ms)
+            }
+        }
+
+
+def compare_to_baseline(results: Dict[str, Any], baseline: Dict[str, Any],
+                        threshold: float = 0.2) -> List[str]:
+    """Return human-readable regressions of results against a stored baseline"""
+    regressions = []
+
+    for op, current in results['operations'].items():
+        previous = baseline.get('operations', {}).get(op)
+        if not previous:
+            continue
+        for metric in ('p50', 'p95', 'p99'):
+            before, after = previous['latency_ms'][metric], current['latency_ms'][metric]
+            if before > 0 and after > before * (1 + threshold):
+                regressions.append(f"{op} {metric} latency {before:.2f}ms -> {after:.2f}ms")
+        if current['throughput_rps'] < previous['throughput_rps'] * (1 - threshold):
+            regressions.append(
+                f"{op} throughput {previous['throughput_rps']:.1f} -> {current['throughput_rps']:.1f} req/s"
+            )
+        if current['error_rate'] > previous['error_rate'] + 0.01:
+            regressions.append(f"{op} error rate {previous['error_rate']:.2%} -> {current['error_rate']:.2%}")
+
+    before_lag = baseline.get('event_loop_lag', {}).get('server', {}).get('p99_ms', 0.0)
+    after_lag = results['event_loop_lag']['server'].get('p99_ms', 0.0)
+    if before_lag > 0 and after_lag > before_lag * (1 + threshold) and after_lag - before_lag > 1.0:
+        regressions.append(f"server event loop lag p99 {before_lag:.2f}ms -> {after_lag:.2f}ms")
+
+    return regressions
+
+
+def compare_transports(server_url: str, socket_path: str, iterations: int = 1000) -> Dict[str, Any]:
+    """Per-call latency of the hot operations over HTTP+JSON versus the unix socket"""
+    from uds_transport import UnixSocketClient
+
+    samples: Dict[str, Dict[str, List[float]]] = {
+        op: {'http': [], 'uds': []} for op in ('snapshot', 'allocate', 'renew', 'release')
+    }
+    request = {'component': 'transport_benchmark', 'gpu_ids': [0], 'memory_gb': 1.0,
+               'priority': 'low', 'lease_seconds': 60}
+
+    def timed(op: str, transport: str, call):
+        start = time.perf_counter()
+        result = call()
+        samples[op][transport].append((time.perf_counter() - start) * 1e6)
+        return result
+
+    with httpx.Client(base_url=server_url, timeout=10.0) as http, UnixSocketClient(socket_path) as uds:
+        for _ in range(iterations):
+            timed('snapshot', 'http', lambda: http.get("/status").json())
+            allocation_id = timed('allocate', 'http', lambda: http.post("/allocate", json=request).json())['allocation_id']
+            timed('renew', 'http', lambda: http.post(f"/allocate/{allocation_id}/renew", json={'lease_seconds': 60}).json())
+            timed('release', 'http', lambda: http.delete(f"/allocate/{allocation_id}").json())
+
+            timed('snapshot', 'uds', uds.snapshot)
+            allocation_id = timed('allocate', 'uds', lambda: uds.allocate(request))['allocation_id']
+            timed('renew', 'uds', lambda: uds.renew(allocation_id, 60))
+            timed('release', 'uds', lambda: uds.release(allocation_id))
+
+    comparison = {}
+    for op, transports in samples.items():
+        http_us = summarize_latencies(transports['http'])
+        uds_us = summarize_latencies(transports['uds'])
+        comparison[op] = {
+            'http_us': http_us,
+            'uds_us': uds_us,
+            'overhead_reduction_us': http_us['p50'] - uds_us['p50'],
+            'speedup': http_us['p50'] / uds_us['p50'] if uds_us['p50'] else 0.0
+        }
+    return comparison
+
+
+def _legacy_status_document(server, snapshot, emergency_check) -> Dict[str, Any]:
+    """/status as it was built before the record encoder, for comparison"""
+    from datetime import datetime
+
+    system_status = snapshot.system
+    return {
+        'timestamp': datetime.now().isoformat(),
+        'system': {
+            'cpu_usage': system_status.cpu_usage,
+            'memory_usage': system_status.memory_usage,
+            'memory_total_gb': system_status.memory_total,
+            'memory_available_gb': system_status.memory_available,
+            'disk_usage': system_status.disk_usage,
+            'uptime_hours': system_status.uptime / 3600
+        },
+        'gpus': [
+            {
+                'gpu_id': gpu.gpu_id,
+                'memory_used_gb': gpu.memory_used / 1024,
+                'memory_total_gb': gpu.memory_total / 1024,
+                'memory_free_gb': gpu.memory_free / 1024,
+                'utilization_percent': gpu.utilization,
+                'temperature_celsius': gpu.temperature,
+                'power_draw_watts': gpu.power_draw,
+                'process_count': len(gpu.processes)
+            }
+            for gpu in snapshot.gpus
+        ],
+        'allocations': [
+            {
+                'allocation_id': alloc.allocation_id,
+                'component': alloc.component,
+                'gpu_ids': alloc.gpu_ids,
+                'memory_gb': alloc.memory_gb,
+                'priority': alloc.priority,
+                'status': alloc.status,
+                'created_at': alloc.created_at.isoformat()
+            }
+            for alloc in server.resource_allocator.get_all_allocations()
+        ],
+        'emergency': emergency_check
+    }
+
+
+async def benchmark_serialization(gpu_counts=(8, 64, 512), iterations: int = 200) -> Dict[str, Any]:
+    """Bytes and microseconds per /status response at several simulated fleet sizes"""
+    from fastapi.encoders import jsonable_encoder
+    from SOVRENMCPServer import SOVRENMCPServer
+
+    results = {}
+    for gpu_count in gpu_counts:
+        server = SOVRENMCPServer({
+            'monitoring': {'interval_seconds': 5},
+            'gpu_backend': {'type': 'simulated', 'gpu_count': gpu_count},
+            'telemetry': {'shared_memory': False}
+        })
+        for gpu_id in range(gpu_count):
+            await server.resource_allocator.allocate_resources({
+                'component': f'benchmark_{gpu_id}', 'gpu_ids': [gpu_id], 'memory_gb': 40.0
+            })
+        snapshot = server.sample_fleet()
+        # Pin the snapshot so only document building and encoding are timed
+        server.current_snapshot = lambda: snapshot
+        emergency_check = await server.emergency_protocol.check_emergency_conditions(snapshot)
+
+        def measure(render) -> Dict[str, float]:
+            body = render()
+            start = time.perf_counter()
+            for _ in range(iterations):
+                render()
+            return {'bytes': len(body), 'us_per_response': (time.perf_counter() - start) / iterations * 1e6}
+
+        legacy = measure(lambda: json.dumps(
+            jsonable_encoder(_legacy_status_document(server, snapshot, emergency_check)),
+            ensure_ascii=False, allow_nan=False, separators=(",", ":")
+        ).encode())
+
+        encoded_bodies = []
+
+        async def encode_cold():
+            server._status_body_cache = (None, b'')
+            return await server.encode_status()
+
+        async def encode_cached():
+            return await server.encode_status()
+
+        for name, render in (('encoded', encode_cold), ('cached', encode_cached)):
+            await render()
+            start = time.perf_counter()
+            for _ in range(iterations):
+                body = await render()
+            encoded_bodies.append((name, {
+                'bytes': len(body),
+                'us_per_response': (time.perf_counter() - start) / iterations * 1e6
+            }))
+
+        results[str(gpu_count)] = {'legacy': legacy, **dict(encoded_bodies)}
+    return results
+
+
+async def benchmark_archive(directory: str, gpu_count: int = 64, hours: float = 6.0,
+                            flush_interval_seconds: float = 60.0) -> Dict[str, Any]:
+    """Archive simulated 1 Hz telemetry, then time aggregate queries over it"""
+    from b200_simulator import ManualClock
+    from SOVRENMCPServer import FleetSnapshot, SimulatedB200GPUMonitor, SystemMonitor
+    from telemetry_archive import TelemetryArchiver, TelemetryQuery, archive_files
+
+    clock = ManualClock()
+    monitor = SimulatedB200GPUMonitor(gpu_count=gpu_count, seed=0, clock=clock)
+    system_status = SystemMonitor().get_system_status()
+    archiver = TelemetryArchiver(directory, flush_interval_seconds=flush_interval_seconds, retention_days=None)
+
+    ticks = int(hours * 3600)
+    origin = time.time() - ticks
+    append_seconds = 0.0
+    flush_seconds = 0.0
+    for tick in range(ticks):
+        clock.advance(1.0)
+        snapshot = FleetSnapshot(
+            seq=tick, timestamp=origin + tick, gpus=monitor.get_all_gpu_status(),
+            system=system_status, active_allocations=0, emergency=False
+        )
+        start = time.perf_counter()
+        archiver.append(snapshot)
+        append_seconds += time.perf_counter() - start
+        if (tick + 1) % int(flush_interval_seconds) == 0:
+            start = time.perf_counter()
+            await archiver.flush()
+            flush_seconds += time.perf_counter() - start
+    await archiver.close()
+
+    files = archive_files(directory)
+    query = TelemetryQuery(directory)
+    timings = {}
+    for name, run in (('gpu_summary', query.gpu_summary), ('fleet_timeline', query.fleet_timeline)):
+        start = time.perf_counter()
+        run()
+        timings[name] = (time.perf_counter() - start) * 1000
+
+    rows = archiver.rows_written
+    return {
+        'rows': rows,
+        'files': len(files),
+        'row_groups': archiver.row_groups_written,
+        'bytes': sum(path.stat().st_size for path in files),
+        'append_us_per_snapshot': append_seconds / ticks * 1e6,
+        'write_ms_per_row_group': flush_seconds / max(1, archiver.row_groups_written) * 1000,
+        'query_ms': timings,
+        'query_rows_per_second': {name: rows / (ms / 1000) for name, ms in timings.items()}
+    }
+
+
+def measure_import_time() -> Dict[str, Any]:
+    """Cold import cost of SOVRENMCPServer from python -X importtime"""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', 'import SOVRENMCPServer'],
+        cwd=Path(__file__).parent, capture_output=True, text=True, check=True
+    )
+    # "import time: self [us] | cumulative | imported package"; nesting is two spaces per
+    # level and a module's own imports are listed before it
+    total_ms = 0.0
+    direct_imports: Dict[str, float] = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        if depth == 1:
+            direct_imports[name.strip()] = int(cumulative) / 1000
+        elif depth == 0:
+            if name.strip() == 'SOVRENMCPServer':
+                total_ms = int(cumulative) / 1000
+                break
+            direct_imports = {}
+    return {
+        'total_ms': total_ms,
+        'heaviest_ms': dict(sorted(direct_imports.items(), key=lambda item: -item[1])[:8])
+    }
+
+
+def measure_time_to_ready(port: int, gpu_count: int, seed: int, runs: int) -> Dict[str, Any]:
+    """Wall time from process start until /health answers"""
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        process = spawn_simulated_server(port, gpu_count, seed, poll_interval=0.01)
+        times.append((time.perf_counter() - start) * 1000)
+        process.terminate()
+        process.wait(timeout=10)
+    return {'runs': runs, 'ready_ms': summarize_latencies(times)}
+
+
+def spawn_simulated_server(port: int, gpu_count: int, seed: int, socket_path: Optional[str] = None,
+                           poll_interval: float = 0.2) -> subprocess.Popen:
+    """Start SOVRENMCPServer on the simulated backend and wait until it is healthy"""
+    server_path = Path(__file__).parent / "SOVRENMCPServer.py"
+    command = [
+        sys.executable, str(server_path), '--simulate', '--host', '127.0.0.1',
+        '--port', str(port), '--sim-gpus', str(gpu_count), '--sim-seed', str(seed),
+        '--telemetry-segment', f'sovren_telemetry_bench_{port}'
+    ]
+    command += ['--unix-socket', socket_path] if socket_path else ['--no-unix-socket']
+    process = subprocess.Popen(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+    deadline = time.time() + 30
+    with httpx.Client(timeout=1) as client:
+        while time.time() < deadline:
+            if process.poll() is not None:
+                raise RuntimeError(f"Simulated MCP server exited with code {process.returncode}")
+            try:
+                if client.get(f"http://127.0.0.1:{port}/health").status_code == 200:
+                    return process
+            except httpx.HTTPError:
+                pass
+            time.sleep(poll_interval)
+
+    process.terminate()
+    raise RuntimeError("Simulated MCP server did not become healthy within 30s")
+
+
+def log_results(results: Dict[str, Any]) -> None:
+    logger.info("🏁 BENCHMARK SUMMARY")
+    logger.info(f"Throughput: {results['throughput_rps']:.1f} req/s, error rate {results['error_rate']:.2%}")
+    for op, stats in results['operations'].items():
+        latency = stats['latency_ms']
+        logger.info(f"  {op:<9} {stats['count']:>7} req  {stats['throughput_rps']:>8.1f} req/s  "
+                    f"p50 {latency['p50']:.2f}ms  p95 {latency['p95']:.2f}ms  p99 {latency['p99']:.2f}ms  "
+                    f"errors {stats['errors']}")
+    ws = results['websocket']
+    logger.info(f"  websocket {ws['connected']}/{ws['subscribers']} connected, "
+                f"{ws['messages']} messages, {ws['errors']} errors")
+    server_lag = results['event_loop_lag']['server']
+    logger.info(f"  server event loop lag p99 {server_lag.get('p99_ms', 0.0):.2f}ms "
+                f"max {server_lag.get('max_ms', 0.0):.2f}ms")
+
+
+async def main():
+    """Main benchmark function"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Load benchmark for the SOVREN MCP Server")
+    parser.add_argument("--server-url", default=None,
+                        help="Benchmark an already running server instead of spawning a simulated one")
+    parser.add_argument("--port", type=int, default=8300,
+                        help="Port for the spawned simulated server (default: 8300, clear of the federation port)")
+    parser.add_argument("--sim-gpus", type=int, default=8, help="GPU count of the spawned simulated server")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help=f"Operation weights (default: {DEFAULT_MIX})")
+    parser.add_argument("--concurrency", type=int, default=32, help="Concurrent HTTP workers")
+    parser.add_argument("--duration", type=float, default=30.0, help="Benchmark duration in seconds")
+    parser.add_argument("--ws-subscribers", type=int, default=8, help="Concurrent /ws subscribers")
+    parser.add_argument("--seed", type=int, default=0, help="RNG seed for the request mix")
+    parser.add_argument("--output-file", help="Save benchmark results to JSON file")
+    parser.add_argument("--baseline", help="Compare against a stored baseline results file")
+    parser.add_argument("--regression-threshold", type=float, default=0.2,
+                        help="Relative degradation tolerated before flagging a regression (default: 0.2)")
+    parser.add_argument("--compare-transports", action="store_true",
+                        help="Measure per-call overhead of HTTP versus the unix socket transport instead")
+    parser.add_argument("--unix-socket", default="/tmp/sovren_mcp_bench.sock",
+                        help="Unix socket path for --compare-transports")
+    parser.add_argument("--iterations", type=int, default=1000,
+                        help="Sequential iterations for --compare-transports")
+    parser.add_argument("--serialization", action="store_true",
+                        help="Measure /status encoding cost at 8, 64 and 512 simulated GPUs instead")
+    parser.add_argument("--archive", action="store_true",
+                        help="Measure telemetry archive write and query cost on simulated history instead")
+    parser.add_argument("--archive-hours", type=float, default=6.0, help="Simulated hours for --archive")
+    parser.add_argument("--archive-gpus", type=int, default=64, help="Simulated GPUs for --archive")
+    parser.add_argument("--startup", action="store_true",
+                        help="Measure import time and time to ready of a fresh server instead")
+    parser.add_argument("--startup-runs", type=int, default=5, help="Server restarts for --startup")
+    parser.add_argument("--import-budget-ms", type=float, default=750.0,
+                        help="Fail --startup when importing SOVRENMCPServer exceeds this (default: 750)")
+    parser.add_argument("--ready-budget-ms", type=float, default=1000.0,
+                        help="Fail --startup when median time to ready exceeds this (default: 1000)")
+
+    args = parser.parse_args()
+
+    if args.archive:
+        import tempfile
+
+        with tempfile.TemporaryDirectory(prefix="sovren_archive_bench_") as directory:
+            results = await benchmark_archive(directory, args.archive_gpus, args.archive_hours)
+        logger.info("🏁 TELEMETRY ARCHIVE")
+        logger.info(f"  {results['rows']} rows in {results['files']} files, {results['row_groups']} row groups, "
+                    f"{results['bytes'] / results['rows']:.2f} bytes/row")
+        logger.info(f"  append {results['append_us_per_snapshot']:.1f}us/snapshot on the event loop, "
+                    f"write {results['write_ms_per_row_group']:.1f}ms/row group off it")
+        for name, ms in results['query_ms'].items():
+            logger.info(f"  {name:<15} {ms:>8.1f}ms  ({results['query_rows_per_second'][name] / 1e6:.1f}M rows/s)")
+        if args.output_file:
+            with open(args.output_file, 'w') as f:
+                json.dump({'archive': results}, f, indent=2)
+            logger.info(f"Benchmark results saved to {args.output_file}")
+        return
+
+    if args.startup:
+        results = {
+            'import': measure_import_time(),
+            'startup': measure_time_to_ready(args.port, args.sim_gpus, args.seed, args.startup_runs)
+        }
+        import_ms = results['import']['total_ms']
+        ready_ms = results['startup']['ready_ms']['p50']
+        logger.info("🏁 STARTUP")
+        logger.info(f"  import SOVRENMCPServer {import_ms:.0f}ms (budget {args.import_budget_ms:.0f}ms)")
+        for module, cumulative_ms in results['import']['heaviest_ms'].items():
+            logger.info(f"    {module:<28} {cumulative_ms:>7.1f}ms")
+        logger.info(f"  time to ready p50 {ready_ms:.0f}ms max {results['startup']['ready_ms']['max']:.0f}ms "
+                    f"(budget {args.ready_budget_ms:.0f}ms)")
+        if args.output_file:
+            with open(args.output_file, 'w') as f:
+                json.dump(results, f, indent=2)
+            logger.info(f"Benchmark results saved to {args.output_file}")
+        if import_ms > args.import_budget_ms or ready_ms > args.ready_budget_ms:
+            logger.warning("⚠️ STARTUP BUDGET EXCEEDED")
+            sys.exit(1)
+        logger.info("✅ Startup within budget")
+        return
+
+    if args.serialization:
+        results = await benchmark_serialization()
+        logger.info("🏁 /status SERIALIZATION (per response)")
+        for gpu_count, variants in results.items():
+            for name, stats in variants.items():
+                logger.info(f"  {gpu_count:>4} GPUs  {name:<8} {stats['bytes']:>9} bytes  "
+                            f"{stats['us_per_response']:>10.1f}us")
+        if args.output_file:
+            with open(args.output_file, 'w') as f:
+                json.dump({'serialization': results}, f, indent=2)
+            logger.info(f"Benchmark results saved to {args.output_file}")
+        return
+
+    server_process = None
+    server_url = args.server_url
+    if server_url is None:
+        server_process = spawn_simulated_server(
+            args.port, args.sim_gpus, args.seed,
+            socket_path=args.unix_socket if args.compare_transports else None
+        )
+        server_url = f"http://127.0.0.1:{args.port}"
+
+    if args.compare_transports:
+        try:
+            comparison = compare_transports(server_url, args.unix_socket, args.iterations)
+        finally:
+            if server_process:
+                server_process.terminate()
+                server_process.wait(timeout=10)
+
+        logger.info("🏁 TRANSPORT COMPARISON (p50 per call)")
+        for op, stats in comparison.items():
+            logger.info(f"  {op:<9} http {stats['http_us']['p50']:>9.1f}us  unix {stats['uds_us']['p50']:>8.1f}us  "
+                        f"saved {stats['overhead_reduction_us']:>9.1f}us  ({stats['speedup']:.1f}x)")
+        if args.output_file:
+            with open(args.output_file, 'w') as f:
+                json.dump({'transport_comparison': comparison}, f, indent=2)
+            logger.info(f"Benchmark results saved to {args.output_file}")
+        return
+
+    try:
+        benchmark = MCPServerBenchmark(
+            server_url,
+            mix=args.mix,
+            concurrency=args.concurrency,
+            duration=args.duration,
+            ws_subscribers=args.ws_subscribers,
+            seed=args.seed
+        )
+        results = await benchmark.run()
+    finally:
+        if server_process:
+            server_process.terminate()
+            server_process.wait(timeout=10)
+
+    log_results(results)
+
+    if args.output_file:
+        with open(args.output_file, 'w') as f:
+            json.dump(results, f, indent=2)
+        logger.info(f"Benchmark results saved to {args.output_file}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare_to_baseline(results, baseline, args.regression_threshold)
+        if regressions:
+            logger.warning("⚠️ REGRESSIONS AGAINST BASELINE:")
+            for regression in regressions:
+                logger.warning(f"  {regression}")
+            sys.exit(1)
+        logger.info("✅ No regressions against baseline")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,679 @@
+#!/usr/bin/env python3
+"""
+SOVREN MCP Federation
+Cluster coordinator and per-node agents: streamed node snapshots, a cluster-wide
+allocation ledger and cross-node placement, with node leases for failure handling
+"""
+
+import asyncio
+import itertools
+import logging
+import socket
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
+    msgpack = None
+
+from fastapi import HTTPException
+
+from serialization import encode, json_response
+from telemetry_shm import TelemetrySnapshot, unpack_snapshot
+from uds_transport import FRAME, MAX_PAYLOAD_BYTES, STATUS_ERROR, STATUS_OK
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_FEDERATION_PORT = 8765
+DEFAULT_NODE_LEASE_SECONDS = 5.0
+
+# Agent-initiated operations
+OP_HELLO = 16
+OP_NODE_SNAPSHOT = 17
+OP_NODE_LEDGER = 18  # One-way: the node's allocations, sent whenever its ledger changes
+# Coordinator-initiated operations
+OP_ASSIGN = 24
+OP_REVOKE = 25
+
+AGENT_OPS = (OP_HELLO, OP_NODE_SNAPSHOT, OP_NODE_LEDGER)
+COORDINATOR_OPS = (OP_ASSIGN, OP_REVOKE)
+
+
+class NodeSystemStatus(NamedTuple):
+    """System fields of a node snapshot, shaped like SystemStatus for admission checks"""
+    cpu_usage: float
+    memory_usage: float
+    memory_total: float
+    memory_available: float
+
+
+@dataclass
+class ClusterAllocation:
+    allocation_id: str  # '<node_id>:<node-local allocation id>'
+    node_id: str
+    local_allocation_id: str
+    component: str
+    gpu_ids: List[int]
+    memory_gb: float
+    priority: str
+    created_at: float  # Node clock, comparable with the node's snapshot timestamps
+    estimated_memory_gb: Optional[float] = None
+
+
+@dataclass
+class NodeState:
+    node_id: str
+    hostname: str
+    gpu_count: int
+    status: str  # 'up', 'disconnected' (lease still held) or 'lost' (lease expired)
+    lease_expires_at: float  # time.monotonic()
+    connected_at: float
+    snapshot: Optional[TelemetrySnapshot] = None
+    snapshot_received_at: Optional[float] = None
+    ledger_version: int = -1  # Latest node ledger version reported
+    connection: Optional["FrameConnection"] = None
+
+
+class FrameConnection:
+    """One agent <-> coordinator TCP stream, carrying requests in both directions
+
+    Frames reuse the unix socket transport header. Each side originates its own
+    operations, so a frame whose op this side originated is a reply to one of its
+    pending requests and anything else is a request from the peer.
+    """
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter, own_ops: Tuple[int, ...]):
+        self.reader = reader
+        self.writer = writer
+        self.own_ops = own_ops
+        self.pending: Dict[int, asyncio.Future] = {}
+        self._request_ids = itertools.count(1)
+        self._write_lock = asyncio.Lock()
+
+    async def read_frame(self) -> Tuple[int, int, int, bytes]:
+        length, op, status, _, request_id = FRAME.unpack(await self.reader.readexactly(FRAME.size))
+        if length > MAX_PAYLOAD_BYTES:
+            raise ConnectionError(f"{length} byte frame")
+        payload = await self.reader.readexactly(length) if length else b""
+        return op, status, request_id, payload
+
+    async def write_frame(self, op: int, status: int, request_id: int, body: bytes = b"") -> None:
+        async with self._write_lock:
+            self.writer.write(FRAME.pack(len(body), op, status, 0, request_id) + body)
+            await self.writer.drain()
+
+    async def request(self, op: int, body: bytes = b"", timeout: float = 5.0) -> bytes:
+        """Send a request and wait for the peer's reply, raising HTTPException on an error reply"""
+        request_id = next(self._request_ids) & 0xFFFFFFFF
+        future = asyncio.get_running_loop().create_future()
+        self.pending[request_id] = future
+        try:
+            await self.write_frame(op, STATUS_OK, request_id, body)
+            status, payload = await asyncio.wait_for(future, timeout)
+        finally:
+            self.pending.pop(request_id, None)
+        if status != STATUS_OK:
+            error = msgpack.unpackb(payload)
+            raise HTTPException(status_code=error['status_code'], detail=error['detail'])
+        return payload
+
+    def resolve(self, status: int, request_id: int, payload: bytes) -> None:
+        future = self.pending.get(request_id)
+        if future is not None and not future.done():
+            future.set_result((status, payload))
+
+    def close(self) -> None:
+        for future in self.pending.values():
+            if not future.done():
+                future.set_exception(ConnectionError("Federation connection closed"))
+        self.pending.clear()
+        self.writer.close()
+
+
+def _error_body(status_code: int, detail: str) -> bytes:
+    return msgpack.packb({'status_code': status_code, 'detail': detail})
+
+
+def _allocation_entry(allocation, ledger_version: Optional[int] = None) -> Dict[str, Any]:
+    """Node-local allocation as reported to the coordinator"""
+    return {
+        'ledger_version': ledger_version,
+        'allocation_id': allocation.allocation_id,
+        'component': allocation.component,
+        'gpu_ids': allocation.gpu_ids,
+        'memory_gb': allocation.memory_gb,
+        'priority': allocation.priority,
+        'created_at': allocation.created_at.timestamp(),
+        'estimated_memory_gb': allocation.estimated_memory_gb
+    }
+
+
+class FederationCoordinator:
+    """Cluster-wide ledger and placement over the nodes whose agents stream to it
+
+    A node holds a lease renewed by every snapshot it streams. While the lease
+    holds, a dropped connection only stops new placements on the node; once it
+    expires the node is lost and its allocations leave the cluster ledger. Agents
+    fence themselves by releasing their allocations before their side of the
+    lease can outlive the coordinator's, so nothing is placed twice.
+    """
+
+    def __init__(self, server, host: str = "0.0.0.0", port: int = DEFAULT_FEDERATION_PORT,
+                 node_lease_seconds: float = DEFAULT_NODE_LEASE_SECONDS):
+        if not MSGPACK_AVAILABLE:
+            raise RuntimeError("msgpack not available - install with: pip install msgpack")
+        self.server = server
+        self.allocator = server.resource_allocator
+        self.host = host
+        self.port = port
+        self.node_lease_seconds = node_lease_seconds
+        self.nodes: Dict[str, NodeState] = {}
+        self.allocations: Dict[str, ClusterAllocation] = {}
+        self.ledger_version = 0
+        self.lost_allocations = deque(maxlen=100)
+        self.placement_lock = asyncio.Lock()
+        self.tcp_server = None
+        self.lease_task = None
+
+    def setup_routes(self, app) -> None:
+        """Cluster routes, next to the coordinator's own node-local ones"""
+
+        @app.get("/cluster/nodes")
+        async def get_cluster_nodes():
+            """Nodes, their leases and latest snapshots"""
+            return json_response(encode({'nodes': [self._node_report(node) for node in self.nodes.values()]}))
+
+        @app.get("/cluster/status")
+        async def get_cluster_status():
+            """Cluster-wide capacity and ledger"""
+            return json_response(encode(self.get_status()))
+
+        @app.post("/cluster/allocate")
+        async def allocate_cluster_resources(request: Dict[str, Any]):
+            """Place an allocation on the best node, or on request['node_id']"""
+            allocation = await self.allocate(request)
+            return json_response(encode({'success': True, 'allocation_id': allocation.allocation_id,
+                                         'allocation': allocation}))
+
+        @app.get("/cluster/allocate/{allocation_id}")
+        async def get_cluster_allocation(allocation_id: str):
+            """Cluster allocation status"""
+            allocation = self.allocations.get(allocation_id)
+            if allocation is None:
+                raise HTTPException(status_code=404, detail='Allocation not found')
+            return json_response(encode({'allocation': allocation,
+                                         'node_status': self.nodes[allocation.node_id].status}))
+
+        @app.delete("/cluster/allocate/{allocation_id}")
+        async def deallocate_cluster_resources(allocation_id: str):
+            """Release a cluster allocation on its node"""
+            await self.deallocate(allocation_id)
+            return {'success': True, 'message': f'Deallocated {allocation_id}'}
+
+    async def start(self) -> None:
+        self.tcp_server = await asyncio.start_server(self._handle_agent, self.host, self.port)
+        self.lease_task = asyncio.create_task(self._lease_loop())
+        logger.info(f"Federation coordinator listening on {self.host}:{self.port}, "
+                    f"node lease {self.node_lease_seconds}s")
+
+    async def stop(self) -> None:
+        if self.lease_task is not None:
+            self.lease_task.cancel()
+            try:
+                await self.lease_task
+            except asyncio.CancelledError:
+                pass
+            self.lease_task = None
+        for node in self.nodes.values():
+            if node.connection is not None:
+                node.connection.close()
+                node.connection = None
+        if self.tcp_server is not None:
+            self.tcp_server.close()
+            await self.tcp_server.wait_closed()
+            self.tcp_server = None
+
+    async def _handle_agent(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        connection = FrameConnection(reader, writer, COORDINATOR_OPS)
+        node = None
+        try:
+            op, _, request_id, payload = await connection.read_frame()
+            if op != OP_HELLO:
+                raise ConnectionError(f"expected hello, got op {op}")
+            hello = msgpack.unpackb(payload)
+            node = self._register_node(hello, connection)
+            if node is None:
+                await connection.write_frame(OP_HELLO, STATUS_ERROR, request_id,
+                                             _error_body(409, f"Node {hello['node_id']} is already connected"))
+                return
+            await connection.write_frame(OP_HELLO, STATUS_OK, request_id,
+                                         msgpack.packb({'lease_seconds': self.node_lease_seconds}))
+
+            while True:
+                op, status, request_id, payload = await connection.read_frame()
+                if op in connection.own_ops:
+                    connection.resolve(status, request_id, payload)
+                elif op == OP_NODE_SNAPSHOT:
+                    self._receive_snapshot(node, payload)
+                    await connection.write_frame(OP_NODE_SNAPSHOT, STATUS_OK, request_id)
+                elif op == OP_NODE_LEDGER:
+                    self._sync_node_ledger(node, msgpack.unpackb(payload))
+                else:
+                    await connection.write_frame(op, STATUS_ERROR, request_id,
+                                                 _error_body(400, f"Unknown operation {op}"))
+        except (asyncio.IncompleteReadError, ConnectionError, OSError) as e:
+            if node is not None and node.connection is connection:
+                logger.warning(f"Node {node.node_id} disconnected ({e or type(e).__name__}), "
+                               f"lease held for {max(0.0, node.lease_expires_at - time.monotonic()):.1f}s")
+        except Exception as e:
+            logger.error(f"Federation agent connection failed: {e}")
+        finally:
+            if node is not None and node.connection is connection:
+                node.connection = None
+                if node.status == 'up':
+                    node.status = 'disconnected'
+            connection.close()
+
+    def _register_node(self, hello: Dict[str, Any], connection: FrameConnection) -> Optional[NodeState]:
+        """Admit a node and adopt the allocations its agent still holds"""
+        node_id = hello['node_id']
+        node = self.nodes.get(node_id)
+        if node is not None and node.connection is not None:
+            return None
+
+        now = time.monotonic()
+        previous_status = node.status if node is not None else None
+        self.nodes[node_id] = node = NodeState(
+            node_id=node_id,
+            hostname=hello.get('hostname', node_id),
+            gpu_count=hello['gpu_count'],
+            status='up',
+            lease_expires_at=now + self.node_lease_seconds,
+            connected_at=now,
+            connection=connection
+        )
+
+        # The agent's ledger is authoritative for its node: it survives a coordinator restart,
+        # and an agent whose lease expired has already released everything it held
+        self._sync_node_ledger(node, hello)
+
+        logger.info(f"Node {node_id} ({node.hostname}) {'rejoined' if previous_status else 'joined'}: "
+                    f"{node.gpu_count} GPUs, {len(hello.get('allocations', []))} allocations")
+        return node
+
+    def _sync_node_ledger(self, node: NodeState, ledger: Dict[str, Any]) -> None:
+        """Replace a node's share of the cluster ledger with what its agent reports
+
+        Allocations also end on the node itself (orphaned owners, expired
+        allocation leases), so the node's report wins over the coordinator's copy.
+        """
+        node.ledger_version = ledger['ledger_version']
+        for allocation_id in [key for key, allocation in self.allocations.items() if allocation.node_id == node.node_id]:
+            del self.allocations[allocation_id]
+        for entry in ledger['allocations']:
+            allocation = self._cluster_allocation(node.node_id, entry)
+            self.allocations[allocation.allocation_id] = allocation
+        self.ledger_version += 1
+
+    def _receive_snapshot(self, node: NodeState, payload: bytes) -> None:
+        node.snapshot = unpack_snapshot(payload)
+        node.snapshot_received_at = time.time()
+        node.lease_expires_at = time.monotonic() + self.node_lease_seconds
+
+    async def _lease_loop(self) -> None:
+        """Expire the leases of nodes that stopped streaming"""
+        interval = min(1.0, self.node_lease_seconds / 4)
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                self.expire_node_leases()
+            except Exception as e:
+                logger.error(f"Node lease check failed: {e}")
+
+    def expire_node_leases(self) -> List[str]:
+        """Mark nodes past their lease lost and drop their allocations from the ledger"""
+        now = time.monotonic()
+        lost = []
+        for node in self.nodes.values():
+            if node.status == 'lost' or node.lease_expires_at > now:
+                continue
+            node.status = 'lost'
+            if node.connection is not None:
+                node.connection.close()
+                node.connection = None
+            released = [allocation for allocation in self.allocations.values() if allocation.node_id == node.node_id]
+            for allocation in released:
+                del self.allocations[allocation.allocation_id]
+                self.lost_allocations.append({
+                    'allocation_id': allocation.allocation_id,
+                    'node_id': node.node_id,
+                    'component': allocation.component,
+                    'lost_at': time.time()
+                })
+            self.ledger_version += 1
+            lost.append(node.node_id)
+            logger.warning(f"Node {node.node_id} lease expired: node lost, released "
+                           f"{len(released)} allocations ({', '.join(a.component for a in released) or 'none'})")
+        return lost
+
+    @staticmethod
+    def _cluster_allocation(node_id: str, entry: Dict[str, Any]) -> ClusterAllocation:
+        return ClusterAllocation(
+            allocation_id=f"{node_id}:{entry['allocation_id']}",
+            node_id=node_id,
+            local_allocation_id=entry['allocation_id'],
+            component=entry['component'],
+            gpu_ids=list(entry['gpu_ids']),
+            memory_gb=entry['memory_gb'],
+            priority=entry['priority'],
+            created_at=entry['created_at'],
+            estimated_memory_gb=entry.get('estimated_memory_gb')
+        )
+
+    def _node_view(self, node: NodeState) -> Tuple[List[Optional[Any]], NodeSystemStatus, Dict[int, float]]:
+        """A node's snapshot as admission inputs, with memory assigned after it was sampled"""
+        snapshot = node.snapshot
+        gpus = [None if gpu.lost else gpu for gpu in snapshot.gpus]
+        system = NodeSystemStatus(snapshot.cpu_usage, snapshot.memory_usage,
+                                  snapshot.memory_total_gb, snapshot.memory_available_gb)
+        planned_mb: Dict[int, float] = {}
+        for allocation in self.allocations.values():
+            if allocation.node_id == node.node_id and allocation.created_at > snapshot.timestamp:
+                for gpu_id in allocation.gpu_ids:
+                    planned_mb[gpu_id] = planned_mb.get(gpu_id, 0.0) + allocation.memory_gb * 1024
+        return gpus, system, planned_mb
+
+    def rank_nodes(self, request: Dict[str, Any]) -> Tuple[List[Tuple[str, List[int]]], Dict[str, Any]]:
+        """Nodes able to admit the request, best first, and why the others cannot
+
+        Placement within a node is the allocator's own (most free memory, coolest
+        first); across nodes the one left with the most free memory on the chosen
+        GPUs wins, which spreads load and keeps tensor-parallel groups on one node.
+        """
+        candidates = []
+        blocked: Dict[str, Any] = {}
+        node_ids = [request['node_id']] if request.get('node_id') else sorted(self.nodes)
+        for node_id in node_ids:
+            node = self.nodes.get(node_id)
+            if node is None:
+                raise HTTPException(status_code=404, detail=f"Unknown node {node_id}")
+            if node.status != 'up' or node.snapshot is None:
+                blocked[node_id] = [{'constraint': 'node_unavailable', 'status': node.status,
+                                     'message': f"Node {node_id} is {node.status}"}]
+                continue
+
+            gpus, system, planned_mb = self._node_view(node)
+            local_request = {key: value for key, value in request.items() if key != 'node_id'}
+            if 'gpu_ids' not in local_request:
+                local_request.setdefault('gpu_count', 1)
+                gpu_ids, violations = self.allocator._place(local_request, gpus, system, planned_mb)
+            else:
+                gpu_ids = local_request['gpu_ids']
+                violations = self.allocator._admission_violations(local_request, gpus, system, planned_mb)
+            if violations:
+                blocked[node_id] = violations
+                continue
+            headroom_mb = sum(gpus[gpu_id].memory_free - planned_mb.get(gpu_id, 0.0) for gpu_id in gpu_ids)
+            candidates.append((-headroom_mb, node_id, gpu_ids))
+
+        return [(node_id, gpu_ids) for _, node_id, gpu_ids in sorted(candidates)], blocked
+
+    async def allocate(self, request: Dict[str, Any]) -> ClusterAllocation:
+        """Place a request on a node and record it once the node's agent has admitted it"""
+        self.allocator._validate_allocation_request(request)
+        request = self.allocator._apply_memory_estimate(request)
+
+        async with self.placement_lock:
+            candidates, blocked = self.rank_nodes(request)
+            for node_id, gpu_ids in candidates:
+                node = self.nodes[node_id]
+                assignment = {key: value for key, value in request.items() if key not in ('node_id', 'gpu_count')}
+                assignment['gpu_ids'] = gpu_ids
+                try:
+                    if node.connection is None:
+                        raise ConnectionError("not connected")
+                    entry = msgpack.unpackb(await node.connection.request(OP_ASSIGN, msgpack.packb(assignment)))
+                except HTTPException as e:
+                    # The node re-checks against live state, which may be newer than its last snapshot
+                    blocked[node_id] = [{'constraint': 'node_rejected', 'message': str(e.detail)}]
+                    continue
+                except (ConnectionError, OSError, asyncio.TimeoutError) as e:
+                    blocked[node_id] = [{'constraint': 'node_unreachable', 'message': f"Node {node_id}: {e}"}]
+                    continue
+
+                allocation = self._cluster_allocation(node_id, entry)
+                # A ledger report read while this reply was in flight is newer and already has it
+                if entry['ledger_version'] > node.ledger_version:
+                    self.allocations[allocation.allocation_id] = allocation
+                    self.ledger_version += 1
+                logger.info(f"Placed {allocation.allocation_id} for {allocation.component}: "
+                            f"GPUs {allocation.gpu_ids} x {allocation.memory_gb}GB")
+                return allocation
+
+        raise HTTPException(status_code=400, detail={
+            'message': f"No node can admit {request['component']}",
+            'blocked_by': blocked
+        })
+
+    async def deallocate(self, allocation_id: str) -> None:
+        allocation = self.allocations.get(allocation_id)
+        if allocation is None:
+            raise HTTPException(status_code=404, detail='Allocation not found')
+        node = self.nodes[allocation.node_id]
+        if node.connection is None:
+            raise HTTPException(status_code=503, detail=f"Node {node.node_id} is {node.status}")
+        try:
+            await node.connection.request(OP_REVOKE, msgpack.packb({'allocation_id': allocation.local_allocation_id}))
+        except HTTPException as e:
+            if e.status_code != 404:
+                raise
+        except (ConnectionError, OSError, asyncio.TimeoutError) as e:
+            raise HTTPException(status_code=503, detail=f"Node {node.node_id}: {e}")
+        if self.allocations.pop(allocation_id, None) is not None:
+            self.ledger_version += 1
+
+    def _node_report(self, node: NodeState) -> Dict[str, Any]:
+        snapshot = node.snapshot
+        report = {
+            'node_id': node.node_id,
+            'hostname': node.hostname,
+            'status': node.status,
+            'gpu_count': node.gpu_count,
+            'lease_remaining_s': max(0.0, node.lease_expires_at - time.monotonic()),
+            'allocations': sum(1 for allocation in self.allocations.values() if allocation.node_id == node.node_id),
+            'snapshot_seq': snapshot.seq if snapshot else None,
+            'snapshot_age_ms': (time.time() - node.snapshot_received_at) * 1000 if snapshot else None
+        }
+        if snapshot is not None:
+            report['emergency'] = snapshot.emergency
+            report['system_memory_available_gb'] = snapshot.memory_available_gb
+            report['gpus'] = [
+                {
+                    'gpu_id': gpu.gpu_id,
+                    'lost': gpu.lost,
+                    'memory_free_gb': gpu.memory_free / 1024,
+                    'utilization': gpu.utilization,
+                    'temperature': gpu.temperature
+                }
+                for gpu in snapshot.gpus
+            ]
+        return report
+
+    def get_status(self) -> Dict[str, Any]:
+        """Cluster totals over nodes that are up, plus every node and the ledger"""
+        up = [node for node in self.nodes.values() if node.status == 'up' and node.snapshot is not None]
+        gpus = [gpu for node in up for gpu in node.snapshot.gpus if not gpu.lost]
+        return {
+            'timestamp': time.time(),
+            'ledger_version': self.ledger_version,
+            'nodes_up': len(up),
+            'nodes_total': len(self.nodes),
+            'gpus_available': len(gpus),
+            'memory_free_gb': sum(gpu.memory_free for gpu in gpus) / 1024,
+            'memory_total_gb': sum(gpu.memory_total for gpu in gpus) / 1024,
+            'nodes': [self._node_report(node) for node in self.nodes.values()],
+            'allocations': list(self.allocations.values()),
+            'lost_allocations': list(self.lost_allocations)
+        }
+
+
+class NodeAgent:
+    """Streams a node's snapshots to the coordinator and executes its placements
+
+    Runs the MCP server's monitoring core (sampler, leases, orphan reclamation)
+    without HTTP; allocations on the node are made only on the coordinator's
+    behalf. If the coordinator's lease on this node could have expired, every
+    allocation is released before the node can be placed on again.
+    """
+
+    def __init__(self, server, coordinator: str, node_id: Optional[str] = None,
+                 reconnect_seconds: float = 1.0):
+        if not MSGPACK_AVAILABLE:
+            raise RuntimeError("msgpack not available - install with: pip install msgpack")
+        host, _, port = coordinator.rpartition(':')
+        self.server = server
+        self.allocator = server.resource_allocator
+        self.coordinator_host = host or '127.0.0.1'
+        self.coordinator_port = int(port or DEFAULT_FEDERATION_PORT)
+        self.node_id = node_id or socket.gethostname()
+        self.reconnect_seconds = reconnect_seconds
+        self.lease_seconds = DEFAULT_NODE_LEASE_SECONDS
+        self.lease_valid_until: Optional[float] = None  # time.monotonic()
+        self._snapshot_sent_at: Dict[int, float] = {}
+        self.running = False
+
+    async def run(self) -> None:
+        """Monitor the node and stay connected to the coordinator until stopped"""
+        self.running = True
+        await self.server.start_monitoring()
+        fence_task = asyncio.create_task(self._fence_loop())
+        try:
+            while self.running:
+                try:
+                    await self._session()
+                except (asyncio.IncompleteReadError, ConnectionError, OSError) as e:
+                    logger.warning(f"Coordinator {self.coordinator_host}:{self.coordinator_port} "
+                                   f"unavailable: {e or type(e).__name__}")
+                except HTTPException as e:
+                    logger.error(f"Coordinator refused node {self.node_id}: {e.detail}")
+                await asyncio.sleep(self.reconnect_seconds)
+        finally:
+            fence_task.cancel()
+            await self.server.stop_monitoring()
+
+    def stop(self) -> None:
+        self.running = False
+
+    async def _session(self) -> None:
+        reader, writer = await asyncio.open_connection(self.coordinator_host, self.coordinator_port)
+        connection = FrameConnection(reader, writer, AGENT_OPS)
+        try:
+            # Lease expiry is checked before hello, so the coordinator never adopts fenced allocations
+            await self.fence_if_expired()
+            hello = {
+                'node_id': self.node_id,
+                'hostname': socket.gethostname(),
+                'gpu_count': self.allocator.gpu_monitor.gpu_count,
+                **self._ledger_report()
+            }
+            await connection.write_frame(OP_HELLO, STATUS_OK, 0, msgpack.packb(hello))
+            op, status, _, payload = await connection.read_frame()
+            if op != OP_HELLO:
+                raise ConnectionError(f"expected hello reply, got op {op}")
+            if status != STATUS_OK:
+                error = msgpack.unpackb(payload)
+                raise HTTPException(status_code=error['status_code'], detail=error['detail'])
+            self.lease_seconds = msgpack.unpackb(payload)['lease_seconds']
+            logger.info(f"Node {self.node_id} joined coordinator {self.coordinator_host}:{self.coordinator_port}")
+
+            stream_task = asyncio.create_task(self._stream_snapshots(connection))
+            try:
+                while True:
+                    op, status, request_id, payload = await connection.read_frame()
+                    if op == OP_NODE_SNAPSHOT:
+                        self._renew_lease(request_id, status)
+                    elif op in connection.own_ops:
+                        connection.resolve(status, request_id, payload)
+                    else:
+                        status, body = await self._dispatch(op, payload)
+                        await connection.write_frame(op, status, request_id, body)
+            finally:
+                stream_task.cancel()
+        finally:
+            self._snapshot_sent_at.clear()
+            connection.close()
+
+    def _ledger_report(self) -> Dict[str, Any]:
+        return {
+            'ledger_version': self.allocator.ledger_version,
+            'allocations': [_allocation_entry(allocation) for allocation in self.allocator.get_all_allocations()]
+        }
+
+    async def _stream_snapshots(self, connection: FrameConnection) -> None:
+        interval = self.server._telemetry_config()['sample_interval_seconds']
+        request_ids = itertools.count(1)
+        reported_version = self.allocator.ledger_version
+        while True:
+            if self.allocator.ledger_version != reported_version:
+                report = self._ledger_report()
+                await connection.write_frame(OP_NODE_LEDGER, STATUS_OK, 0, msgpack.packb(report))
+                reported_version = report['ledger_version']
+            request_id = next(request_ids) & 0xFFFFFFFF
+            self._snapshot_sent_at[request_id] = time.monotonic()
+            await connection.write_frame(OP_NODE_SNAPSHOT, STATUS_OK, request_id, self.server.encode_snapshot_binary())
+            await asyncio.sleep(interval)
+
+    def _renew_lease(self, request_id: int, status: int) -> None:
+        # The coordinator renews from when it received the snapshot, which is after
+        # it was sent, so the node's view of the lease always ends first
+        sent_at = self._snapshot_sent_at.pop(request_id, None)
+        if sent_at is not None and status == STATUS_OK:
+            self.lease_valid_until = max(self.lease_valid_until or 0.0, sent_at + self.lease_seconds)
+        for stale in [key for key, value in self._snapshot_sent_at.items() if value < (sent_at or 0.0)]:
+            del self._snapshot_sent_at[stale]
+
+    async def _dispatch(self, op: int, payload: bytes) -> Tuple[int, bytes]:
+        try:
+            request = msgpack.unpackb(payload)
+            if op == OP_ASSIGN:
+                allocation = await self.allocator.allocate_resources(request)
+                return STATUS_OK, msgpack.packb(_allocation_entry(allocation, self.allocator.ledger_version))
+            if op == OP_REVOKE:
+                if not await self.allocator.deallocate_resources(request['allocation_id']):
+                    raise HTTPException(status_code=404, detail='Allocation not found')
+                return STATUS_OK, msgpack.packb({'allocation_id': request['allocation_id']})
+            raise HTTPException(status_code=400, detail=f"Unknown operation {op}")
+        except HTTPException as e:
+            return STATUS_ERROR, _error_body(e.status_code, str(e.detail))
+        except KeyError as e:
+            return STATUS_ERROR, _error_body(400, f"Missing required field: {e}")
+        except Exception as e:
+            logger.error(f"Federation operation {op} failed: {e}")
+            return STATUS_ERROR, _error_body(500, str(e))
+
+    async def _fence_loop(self) -> None:
+        while True:
+            await asyncio.sleep(0.25)
+            try:
+                await self.fence_if_expired()
+            except Exception as e:
+                logger.error(f"Lease fencing failed: {e}")
+
+    async def fence_if_expired(self) -> List[str]:
+        """Release every allocation once the coordinator may have given this node up"""
+        if self.lease_valid_until is None or time.monotonic() < self.lease_valid_until:
+            return []
+        self.lease_valid_until = None
+        released = []
+        for allocation in self.allocator.get_all_allocations():
+            if await self.allocator.deallocate_resources(allocation.allocation_id, reason='fenced'):
+                released.append(allocation.allocation_id)
+        if released:
+            logger.warning(f"Node {self.node_id} lease expired, released {len(released)} allocations: "
+                           f"{', '.join(released)}")
+        return released
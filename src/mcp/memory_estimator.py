@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+SOVREN GPU Memory Estimator
+Per-GPU memory for serving a model: weights + KV cache + activations + runtime overhead
+"""
+
+import math
+import re
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+GIB = 1024 ** 3
+
+
+@dataclass(frozen=True)
+class ModelSpec:
+    name: str
+    parameters: float
+    layers: int
+    hidden_size: int
+    intermediate_size: int
+    attention_heads: int
+    kv_heads: int
+    head_dim: int
+    vocab_size: int
+    max_context_length: int
+
+
+QWEN25_VOCAB = 152064
+
+# Published Qwen2.5 configs. There is no 70B Qwen2.5 checkpoint: "Qwen2.5-70B" in this
+# codebase is served from the 72B weights. The 405B entry assumes the only public 405B
+# dense shape (126 layers, 16384 hidden, 8 KV heads) with the Qwen tokenizer.
+MODEL_SPECS: Dict[str, ModelSpec] = {
+    '7b': ModelSpec('Qwen2.5-7B', 7.62e9, 28, 3584, 18944, 28, 4, 128, QWEN25_VOCAB, 131072),
+    '14b': ModelSpec('Qwen2.5-14B', 14.77e9, 48, 5120, 13824, 40, 8, 128, QWEN25_VOCAB, 131072),
+    '32b': ModelSpec('Qwen2.5-32B', 32.76e9, 64, 5120, 27648, 40, 8, 128, QWEN25_VOCAB, 131072),
+    '70b': ModelSpec('Qwen2.5-70B', 72.71e9, 80, 8192, 29568, 64, 8, 128, QWEN25_VOCAB, 131072),
+    '72b': ModelSpec('Qwen2.5-72B', 72.71e9, 80, 8192, 29568, 64, 8, 128, QWEN25_VOCAB, 131072),
+    '405b': ModelSpec('Qwen2.5-405B', 405.85e9, 126, 16384, 53248, 128, 8, 128, QWEN25_VOCAB, 131072),
+}
+
+# Bytes per weight, including quantization scales (int4: fp16 scale + zero per 128-weight group)
+WEIGHT_BYTES = {
+    'fp16': 2.0,
+    'bf16': 2.0,
+    'fp8': 1.0,
+    'int8': 1.0,
+    'int4': 0.5 + 4 / 128,
+}
+
+KV_CACHE_BYTES = {
+    'fp16': 2.0,
+    'bf16': 2.0,
+    'fp8': 1.0,
+}
+
+# vLLM chunked prefill schedules at most this many tokens per forward pass
+MAX_BATCHED_TOKENS = 8192
+
+# CUDA context, NCCL buffers and captured CUDA graphs, per GPU
+RUNTIME_OVERHEAD_GB = 2.0
+
+# Fragmentation and allocator slack on top of the computed total
+SAFETY_MARGIN = 0.05
+
+
+class UnknownModelError(ValueError):
+    """Raised when a model_type does not name a known model"""
+
+
+def resolve_model(model_type: Optional[str]) -> Optional[ModelSpec]:
+    """Map names such as 'Qwen/Qwen2.5-70B-Instruct', 'Qwen2.5-405B-FP8' or 'llm_405b' to a spec"""
+    if not model_type:
+        return None
+    match = re.search(r'(\d+)\s*b(?![a-z])', model_type.lower())
+    return MODEL_SPECS.get(f"{match.group(1)}b") if match else None
+
+
+def estimate_memory(model: ModelSpec, quantization: str = 'fp16', context_length: int = 4096,
+                    batch_size: int = 1, tensor_parallel: int = 1,
+                    kv_cache_dtype: Optional[str] = None) -> Dict[str, Any]:
+    """GPU memory per GPU to serve batch_size sequences of context_length tokens
+
+    Weights, KV cache and the MLP intermediate activations are sharded across
+    tensor_parallel GPUs; KV heads are replicated when there are fewer of them
+    than GPUs. Activations are sized for one chunked-prefill forward pass.
+    """
+    quantization = quantization.lower()
+    if quantization not in WEIGHT_BYTES:
+        raise ValueError(f"Unknown quantization '{quantization}' (expected one of {', '.join(WEIGHT_BYTES)})")
+    # Weight-only integer quantization keeps a 16-bit KV cache; FP8 models default to an FP8 cache
+    kv_cache_dtype = (kv_cache_dtype or ('fp8' if quantization == 'fp8' else 'fp16')).lower()
+    if kv_cache_dtype not in KV_CACHE_BYTES:
+        raise ValueError(f"Unknown kv_cache_dtype '{kv_cache_dtype}' (expected one of {', '.join(KV_CACHE_BYTES)})")
+    if context_length < 1 or batch_size < 1 or tensor_parallel < 1:
+        raise ValueError("context_length, batch_size and tensor_parallel must be positive")
+    if context_length > model.max_context_length:
+        raise ValueError(f"{model.name} supports at most {model.max_context_length} tokens of context")
+
+    weights = model.parameters * WEIGHT_BYTES[quantization] / tensor_parallel
+
+    kv_heads_per_gpu = max(1.0, model.kv_heads / tensor_parallel)
+    kv_bytes_per_token = 2 * model.layers * kv_heads_per_gpu * model.head_dim * KV_CACHE_BYTES[kv_cache_dtype]
+    kv_cache = kv_bytes_per_token * context_length * batch_size
+
+    # Peak of one forward pass: residual stream + QKV, gate/up MLP projections (16-bit),
+    # and fp32 logits for the sequences being sampled
+    tokens = min(context_length * batch_size, MAX_BATCHED_TOKENS)
+    activations = tokens * 2.0 * (
+        4 * model.hidden_size + 2 * model.intermediate_size / tensor_parallel
+    ) + batch_size * model.vocab_size * 4.0
+
+    runtime = RUNTIME_OVERHEAD_GB * GIB
+    subtotal = weights + kv_cache + activations + runtime
+    total = subtotal * (1 + SAFETY_MARGIN)
+
+    return {
+        'model': model.name,
+        'quantization': quantization,
+        'kv_cache_dtype': kv_cache_dtype,
+        'context_length': context_length,
+        'batch_size': batch_size,
+        'tensor_parallel': tensor_parallel,
+        'weights_gb': weights / GIB,
+        'kv_cache_gb': kv_cache / GIB,
+        'activations_gb': activations / GIB,
+        'runtime_overhead_gb': runtime / GIB,
+        'safety_margin_gb': (total - subtotal) / GIB,
+        'per_gpu_gb': total / GIB,
+        'total_gb': total * tensor_parallel / GIB,
+    }
+
+
+def _request_field(request: Dict[str, Any], field: str, kind: type, default: Any) -> Any:
+    """request[field] (or default), raising ValueError unless it is a kind (bools are not integers)"""
+    value = request.get(field, default)
+    if value is None and default is None:
+        return None
+    if isinstance(value, bool) or not isinstance(value, kind):
+        raise ValueError(f"{field} must be {'a string' if kind is str else 'an integer'}, got {value!r}")
+    return value
+
+
+def estimate_for_request(request: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Estimate for an allocation request, or None if its model_type is not a known model
+
+    Tensor parallelism is the number of GPUs requested, via gpu_ids or gpu_count.
+    Raises ValueError for fields of the wrong type, so callers can answer 400.
+    """
+    model = resolve_model(_request_field(request, 'model_type', str, None))
+    if model is None:
+        return None
+    gpu_ids = request.get('gpu_ids')
+    if gpu_ids and not isinstance(gpu_ids, list):
+        raise ValueError(f"gpu_ids must be a list, got {gpu_ids!r}")
+    return estimate_memory(
+        model,
+        quantization=_request_field(request, 'quantization', str, 'fp16'),
+        context_length=_request_field(request, 'context_length', int, 4096),
+        batch_size=_request_field(request, 'batch_size', int, 1),
+        tensor_parallel=len(gpu_ids) if gpu_ids else _request_field(request, 'gpu_count', int, 1),
+        kv_cache_dtype=_request_field(request, 'kv_cache_dtype', str, None)
+    )
+
+
+def round_up_gb(gb: float, step: float = 0.5) -> float:
+    return math.ceil(gb / step) * step
+
+
+def main():
+    """Print per-GPU estimates for the supported models"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Estimate per-GPU memory for serving a model")
+    parser.add_argument("--model", default=None, help="Model name, e.g. Qwen2.5-70B (default: all)")
+    parser.add_argument("--context-length", type=int, default=4096)
+    parser.add_argument("--batch-size", type=int, default=1)
+    parser.add_argument("--tensor-parallel", type=int, default=None,
+                        help="GPUs per replica (default: fewest 183GB B200s that fit)")
+    args = parser.parse_args()
+
+    models = [resolve_model(args.model)] if args.model else [MODEL_SPECS[key] for key in ('7b', '14b', '32b', '72b', '405b')]
+    if None in models:
+        raise SystemExit(f"Unknown model {args.model}")
+
+    print(f"{'model':<14}{'quant':<6}{'tp':>3}{'weights':>9}{'kv':>9}{'act':>8}{'per GPU':>10}")
+    for model in models:
+        for quantization in ('fp16', 'fp8', 'int8', 'int4'):
+            tensor_parallel = args.tensor_parallel or 1
+            while True:
+                estimate = estimate_memory(model, quantization, args.context_length, args.batch_size, tensor_parallel)
+                if args.tensor_parallel or estimate['per_gpu_gb'] <= 179 or tensor_parallel >= 8:
+                    break
+                tensor_parallel *= 2
+            print(f"{model.name:<14}{quantization:<6}{tensor_parallel:>3}{estimate['weights_gb']:>8.1f}G"
+                  f"{estimate['kv_cache_gb']:>8.1f}G{estimate['activations_gb']:>7.1f}G{estimate['per_gpu_gb']:>9.1f}G")
+
+
+if __name__ == "__main__":
+    main()
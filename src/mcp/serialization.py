@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+SOVREN MCP Response Serialization
+Slotted response records and a pre-compiled JSON encoder producing raw bytes
+"""
+
+import json
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, List
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+    orjson = None
+
+from fastapi import Response
+
+
+@dataclass
+class SystemRecord:
+    __slots__ = ('cpu_usage', 'memory_usage', 'memory_total_gb', 'memory_available_gb',
+                 'disk_usage', 'uptime_hours')
+    cpu_usage: float
+    memory_usage: float
+    memory_total_gb: float
+    memory_available_gb: float
+    disk_usage: float
+    uptime_hours: float
+
+    @classmethod
+    def from_status(cls, system) -> "SystemRecord":
+        return cls(system.cpu_usage, system.memory_usage, system.memory_total,
+                   system.memory_available, system.disk_usage, system.uptime / 3600)
+
+
+@dataclass
+class GPUStatusRecord:
+    __slots__ = ('gpu_id', 'memory_used_gb', 'memory_total_gb', 'memory_free_gb',
+                 'utilization_percent', 'temperature_celsius', 'power_draw_watts', 'process_count')
+    gpu_id: int
+    memory_used_gb: float
+    memory_total_gb: float
+    memory_free_gb: float
+    utilization_percent: float
+    temperature_celsius: float
+    power_draw_watts: float
+    process_count: int
+
+    @classmethod
+    def from_status(cls, gpu) -> "GPUStatusRecord":
+        return cls(gpu.gpu_id, gpu.memory_used / 1024, gpu.memory_total / 1024, gpu.memory_free / 1024,
+                   gpu.utilization, gpu.temperature, gpu.power_draw, len(gpu.processes))
+
+
+@dataclass
+class GPUSummaryRecord:
+    __slots__ = ('gpu_id', 'memory_usage_percent', 'utilization', 'temperature')
+    gpu_id: int
+    memory_usage_percent: float
+    utilization: float
+    temperature: float
+
+    @classmethod
+    def from_status(cls, gpu) -> "GPUSummaryRecord":
+        return cls(gpu.gpu_id, (gpu.memory_used / gpu.memory_total) * 100, gpu.utilization, gpu.temperature)
+
+
+@dataclass
+class AllocationRecord:
+    __slots__ = ('allocation_id', 'component', 'gpu_ids', 'memory_gb', 'priority', 'status', 'created_at')
+    allocation_id: str
+    component: str
+    gpu_ids: List[int]
+    memory_gb: float
+    priority: str
+    status: str
+    created_at: datetime
+
+    @classmethod
+    def from_allocation(cls, allocation) -> "AllocationRecord":
+        return cls(allocation.allocation_id, allocation.component, allocation.gpu_ids, allocation.memory_gb,
+                   allocation.priority, allocation.status, allocation.created_at)
+
+
+def _default(obj: Any) -> Any:
+    """Fallback encoder hook for the stdlib json path"""
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    if hasattr(obj, '__slots__'):
+        return {name: getattr(obj, name) for name in obj.__slots__}
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def encode(document: Any) -> bytes:
+    """Encode a document of dicts, lists and records to JSON bytes"""
+    if ORJSON_AVAILABLE:
+        # Dataclass records and naive datetimes are serialized natively
+        return orjson.dumps(document)
+    return json.dumps(document, default=_default, separators=(',', ':')).encode()
+
+
+def json_response(body: bytes, status_code: int = 200) -> Response:
+    """Raw JSON response that bypasses jsonable_encoder"""
+    return Response(content=body, status_code=status_code, media_type="application/json")
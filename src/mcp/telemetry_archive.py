@@ -0,0 +1,386 @@
+#!/usr/bin/env python3
+"""
+SOVREN Telemetry Archive
+Columnar per-GPU history in rotated Parquet files for offline capacity analysis
+"""
+
+import asyncio
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+    pa = None
+    pc = None
+    pq = None
+
+logger = logging.getLogger(__name__)
+
+FILE_PREFIX = "telemetry-"
+IN_PROGRESS_SUFFIX = ".inprogress"
+
+ROTATIONS = {
+    'hourly': "%Y%m%d%H",
+    'daily': "%Y%m%d",
+}
+
+# One row per GPU per sample; lost GPUs keep their row with lost=True and null readings
+COLUMNS = (
+    ('timestamp', 'timestamp'),
+    ('seq', 'uint64'),
+    ('gpu_id', 'uint16'),
+    ('lost', 'bool'),
+    ('memory_used_mb', 'float32'),
+    ('memory_total_mb', 'float32'),
+    ('utilization', 'float32'),
+    ('temperature', 'float32'),
+    ('power_draw', 'float32'),
+    ('process_count', 'uint16'),
+    ('active_allocations', 'uint32'),
+    ('cpu_usage', 'float32'),
+    ('system_memory_usage', 'float32'),
+    ('emergency', 'bool'),
+)
+
+
+def archive_schema() -> "pa.Schema":
+    types = {
+        'timestamp': pa.timestamp('ms'),
+        'uint64': pa.uint64(),
+        'uint32': pa.uint32(),
+        'uint16': pa.uint16(),
+        'float32': pa.float32(),
+        'bool': pa.bool_(),
+    }
+    return pa.schema([(name, types[kind]) for name, kind in COLUMNS])
+
+
+def _empty_columns() -> Dict[str, list]:
+    return {name: [] for name, _ in COLUMNS}
+
+
+def _partition_start(key: str, rotation: str) -> datetime:
+    return datetime.strptime(key, ROTATIONS[rotation])
+
+
+def _file_key(path: Path) -> str:
+    # telemetry-<key>[.<n>].parquet
+    return path.name[len(FILE_PREFIX):].split('.')[0]
+
+
+class TelemetryArchiver:
+    """Buffers fleet snapshots and writes them as compressed Parquet row groups
+
+    Appending is a few list appends on the event loop; every flush becomes
+    one row group written by a single background thread, so files are
+    written in order and never concurrently. The file for the current
+    rotation period is only visible to queries once it is closed.
+    """
+
+    def __init__(self, directory: str, rotation: str = 'hourly', flush_interval_seconds: float = 60.0,
+                 retention_days: Optional[float] = 30, max_total_gb: Optional[float] = None,
+                 compression: str = 'zstd'):
+        if not PYARROW_AVAILABLE:
+            raise RuntimeError("pyarrow not available - install with: pip install pyarrow")
+        if rotation not in ROTATIONS:
+            raise ValueError(f"rotation must be one of {', '.join(ROTATIONS)}")
+
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.rotation = rotation
+        self.flush_interval_seconds = flush_interval_seconds
+        self.retention_days = retention_days
+        self.max_total_gb = max_total_gb
+        self.compression = compression
+        self.schema = archive_schema()
+
+        # Buffered rows per partition key, handed to the writer thread on flush
+        self.buffers: Dict[str, Dict[str, list]] = {}
+        self.buffered_rows = 0
+        self.last_flush = time.monotonic()
+
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="telemetry-archive")
+        self.writer = None
+        self.writer_key: Optional[str] = None
+        self.writer_path: Optional[Path] = None
+
+        self.rows_written = 0
+        self.row_groups_written = 0
+        self.files_removed = 0
+
+        # A crash leaves footerless files behind; they cannot be read, so drop them
+        for stale in self.directory.glob(f"{FILE_PREFIX}*{IN_PROGRESS_SUFFIX}"):
+            logger.warning(f"Removing unfinished telemetry archive file {stale}")
+            stale.unlink()
+
+        logger.info(f"Telemetry archive at {self.directory} ({rotation}, flush every {flush_interval_seconds}s)")
+
+    def append(self, snapshot) -> None:
+        """Buffer one fleet snapshot (FleetSnapshot: gpus hold None where a GPU was lost)"""
+        key = time.strftime(ROTATIONS[self.rotation], time.localtime(snapshot.timestamp))
+        columns = self.buffers.get(key)
+        if columns is None:
+            columns = self.buffers[key] = _empty_columns()
+
+        timestamp = int(snapshot.timestamp * 1000)
+        system = snapshot.system
+        for gpu_id, gpu in enumerate(snapshot.gpus):
+            columns['timestamp'].append(timestamp)
+            columns['seq'].append(snapshot.seq)
+            columns['gpu_id'].append(gpu_id)
+            columns['lost'].append(gpu is None)
+            columns['memory_used_mb'].append(gpu.memory_used if gpu else None)
+            columns['memory_total_mb'].append(gpu.memory_total if gpu else None)
+            columns['utilization'].append(gpu.utilization if gpu else None)
+            columns['temperature'].append(gpu.temperature if gpu else None)
+            columns['power_draw'].append(gpu.power_draw if gpu else None)
+            columns['process_count'].append(len(gpu.processes) if gpu else None)
+            columns['active_allocations'].append(snapshot.active_allocations)
+            columns['cpu_usage'].append(system.cpu_usage)
+            columns['system_memory_usage'].append(system.memory_usage)
+            columns['emergency'].append(snapshot.emergency)
+        self.buffered_rows += len(snapshot.gpus)
+
+    async def maybe_flush(self) -> None:
+        """Flush when the row group interval has elapsed"""
+        if time.monotonic() - self.last_flush >= self.flush_interval_seconds:
+            await self.flush()
+
+    async def flush(self) -> int:
+        """Hand the buffered rows to the writer thread as one row group per partition"""
+        buffers, self.buffers = self.buffers, {}
+        rows, self.buffered_rows = self.buffered_rows, 0
+        self.last_flush = time.monotonic()
+        if rows:
+            await asyncio.get_running_loop().run_in_executor(self.executor, self._write, buffers)
+        return rows
+
+    async def close(self) -> None:
+        """Flush, finalize the open file and stop the writer thread"""
+        await self.flush()
+        await asyncio.get_running_loop().run_in_executor(self.executor, self._close_writer)
+        self.executor.shutdown(wait=True)
+
+    def _write(self, buffers: Dict[str, Dict[str, list]]) -> None:
+        for key in sorted(buffers):
+            try:
+                table = pa.Table.from_pydict(buffers[key], schema=self.schema)
+                if key != self.writer_key:
+                    self._open_writer(key)
+                self.writer.write_table(table, row_group_size=table.num_rows)
+                self.rows_written += table.num_rows
+                self.row_groups_written += 1
+            except Exception as e:
+                logger.error(f"Telemetry archive write failed for {key}: {e}")
+        self._enforce_retention()
+
+    def _open_writer(self, key: str) -> None:
+        self._close_writer()
+        # Restarts within a period start a numbered sibling instead of overwriting
+        path = self.directory / f"{FILE_PREFIX}{key}.parquet"
+        sequence = 1
+        while path.exists():
+            path = self.directory / f"{FILE_PREFIX}{key}.{sequence}.parquet"
+            sequence += 1
+
+        self.writer_key = key
+        self.writer_path = path
+        self.writer = pq.ParquetWriter(
+            f"{path}{IN_PROGRESS_SUFFIX}", self.schema,
+            compression=self.compression, use_dictionary=['gpu_id']
+        )
+
+    def _close_writer(self) -> None:
+        if self.writer is None:
+            return
+        self.writer.close()
+        os.replace(f"{self.writer_path}{IN_PROGRESS_SUFFIX}", self.writer_path)
+        logger.info(f"Telemetry archive file closed: {self.writer_path}")
+        self.writer = None
+        self.writer_key = None
+        self.writer_path = None
+
+    def _enforce_retention(self) -> None:
+        files = archive_files(self.directory)
+        if self.retention_days is not None:
+            cutoff = datetime.now() - timedelta(days=self.retention_days)
+            # A file is expired once its whole period is older than the cutoff
+            period = timedelta(days=1) if self.rotation == 'daily' else timedelta(hours=1)
+            for path in [path for path in files if _partition_start(_file_key(path), self.rotation) + period < cutoff]:
+                self._remove(path)
+                files.remove(path)
+
+        if self.max_total_gb is not None:
+            budget = self.max_total_gb * 1024 ** 3
+            sizes = [(path, path.stat().st_size) for path in files]
+            total = sum(size for _, size in sizes)
+            for path, size in sizes:  # Oldest first
+                if total <= budget:
+                    break
+                self._remove(path)
+                total -= size
+
+    def _remove(self, path: Path) -> None:
+        path.unlink(missing_ok=True)
+        self.files_removed += 1
+        logger.info(f"Telemetry archive retention removed {path}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'directory': str(self.directory),
+            'rotation': self.rotation,
+            'buffered_rows': self.buffered_rows,
+            'rows_written': self.rows_written,
+            'row_groups_written': self.row_groups_written,
+            'files_removed': self.files_removed,
+            'current_file': str(self.writer_path) if self.writer_path else None
+        }
+
+
+def archive_files(directory, start: Optional[datetime] = None, end: Optional[datetime] = None) -> List[Path]:
+    """Closed archive files, oldest first, optionally limited to periods overlapping [start, end)"""
+    files = sorted(Path(directory).glob(f"{FILE_PREFIX}*.parquet"), key=lambda path: (_file_key(path), path.name))
+    if start is None and end is None:
+        return files
+
+    selected = []
+    for path in files:
+        key = _file_key(path)
+        rotation = 'hourly' if len(key) == 10 else 'daily'
+        period_start = _partition_start(key, rotation)
+        period_end = period_start + (timedelta(hours=1) if rotation == 'hourly' else timedelta(days=1))
+        if (end is None or period_start < end) and (start is None or period_end > start):
+            selected.append(path)
+    return selected
+
+
+class TelemetryQuery:
+    """Aggregates over archived telemetry
+
+    Files are memory-mapped and only the requested columns are decoded, so
+    scanning millions of samples costs a column read, not a row parse.
+    """
+
+    def __init__(self, directory: str):
+        if not PYARROW_AVAILABLE:
+            raise RuntimeError("pyarrow not available - install with: pip install pyarrow")
+        self.directory = Path(directory)
+
+    def load(self, columns: List[str], start: Optional[datetime] = None, end: Optional[datetime] = None,
+             gpu_ids: Optional[List[int]] = None) -> "pa.Table":
+        """Read the given columns of every sample in [start, end)"""
+        filters = [('lost', '=', False)]
+        if start is not None:
+            filters.append(('timestamp', '>=', pa.scalar(int(start.timestamp() * 1000), pa.timestamp('ms'))))
+        if end is not None:
+            filters.append(('timestamp', '<', pa.scalar(int(end.timestamp() * 1000), pa.timestamp('ms'))))
+        if gpu_ids is not None:
+            filters.append(('gpu_id', 'in', list(gpu_ids)))
+
+        files = archive_files(self.directory, start, end)
+        if not files:
+            return archive_schema().empty_table().select(columns)
+        return pa.concat_tables([
+            pq.read_table(path, columns=columns, filters=filters, memory_map=True)
+            for path in files
+        ])
+
+    def gpu_summary(self, start: Optional[datetime] = None, end: Optional[datetime] = None,
+                    gpu_ids: Optional[List[int]] = None) -> List[Dict[str, Any]]:
+        """Per-GPU utilization, memory, thermal and power profile"""
+        table = self.load(['gpu_id', 'utilization', 'memory_used_mb', 'temperature', 'power_draw'],
+                          start, end, gpu_ids)
+        summary = table.group_by('gpu_id').aggregate([
+            ('utilization', 'count'),
+            ('utilization', 'mean'),
+            ('utilization', 'tdigest', pc.TDigestOptions(q=0.95)),
+            ('memory_used_mb', 'mean'),
+            ('memory_used_mb', 'max'),
+            ('temperature', 'max'),
+            ('power_draw', 'mean'),
+            ('power_draw', 'max'),
+        ])
+        return sorted((
+            {
+                'gpu_id': row['gpu_id'],
+                'samples': row['utilization_count'],
+                'utilization_mean': row['utilization_mean'],
+                'utilization_p95': row['utilization_tdigest'][0] if row['utilization_tdigest'] else None,
+                'memory_used_gb_mean': row['memory_used_mb_mean'] / 1024,
+                'memory_used_gb_max': row['memory_used_mb_max'] / 1024,
+                'temperature_max': row['temperature_max'],
+                'power_draw_mean': row['power_draw_mean'],
+                'power_draw_max': row['power_draw_max'],
+            }
+            for row in summary.to_pylist()
+        ), key=lambda row: row['gpu_id'])
+
+    def fleet_timeline(self, start: Optional[datetime] = None, end: Optional[datetime] = None,
+                       bucket: str = 'hour') -> List[Dict[str, Any]]:
+        """Fleet-wide utilization, memory and power per time bucket ('minute', 'hour' or 'day')"""
+        table = self.load(['timestamp', 'utilization', 'memory_used_mb', 'power_draw'], start, end)
+        table = table.append_column('bucket', pc.floor_temporal(table['timestamp'], unit=bucket))
+        timeline = table.group_by('bucket').aggregate([
+            ('utilization', 'mean'),
+            ('utilization', 'max'),
+            ('memory_used_mb', 'mean'),
+            ('power_draw', 'mean'),
+        ])
+        return sorted((
+            {
+                'bucket': row['bucket'],
+                'utilization_mean': row['utilization_mean'],
+                'utilization_max': row['utilization_max'],
+                'memory_used_gb_mean': row['memory_used_mb_mean'] / 1024,
+                'power_draw_mean': row['power_draw_mean'],
+            }
+            for row in timeline.to_pylist()
+        ), key=lambda row: row['bucket'])
+
+
+def _parse_since(since: str) -> datetime:
+    units = {'m': 'minutes', 'h': 'hours', 'd': 'days'}
+    return datetime.now() - timedelta(**{units[since[-1]]: float(since[:-1])})
+
+
+def main():
+    """Summarize archived telemetry"""
+    import argparse
+    import json
+
+    parser = argparse.ArgumentParser(description="Query the SOVREN telemetry archive")
+    parser.add_argument("directory", help="Archive directory")
+    parser.add_argument("--since", default=None, help="Only samples newer than this, e.g. 6h, 7d")
+    parser.add_argument("--gpus", default=None, help="Comma separated GPU ids")
+    parser.add_argument("--timeline", choices=('minute', 'hour', 'day'), default=None,
+                        help="Print a fleet timeline at this granularity instead of a per-GPU summary")
+    args = parser.parse_args()
+
+    query = TelemetryQuery(args.directory)
+    start = _parse_since(args.since) if args.since else None
+    start_time = time.perf_counter()
+    if args.timeline:
+        rows = query.fleet_timeline(start=start, bucket=args.timeline)
+    else:
+        gpu_ids = [int(gpu_id) for gpu_id in args.gpus.split(',')] if args.gpus else None
+        rows = query.gpu_summary(start=start, gpu_ids=gpu_ids)
+    elapsed_ms = (time.perf_counter() - start_time) * 1000
+
+    for row in rows:
+        print(json.dumps(row, default=str))
+    logger.info(f"Query over {len(archive_files(args.directory, start))} files took {elapsed_ms:.1f}ms")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    main()
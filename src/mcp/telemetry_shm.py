@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""
+SOVREN Shared-Memory Telemetry
+Fixed-layout, seqlock-protected fleet snapshot readable by any process on the node
+"""
+
+import logging
+import struct
+import time
+from multiprocessing import resource_tracker, shared_memory
+from typing import Iterable, List, NamedTuple, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SEGMENT_NAME = "sovren_telemetry"
+MAGIC = b"SVRN"
+LAYOUT_VERSION = 1
+
+# magic, version, gpu_capacity, seq, timestamp, gpu_count, active_allocations,
+# cpu_usage, memory_usage, memory_total_gb, memory_available_gb, flags, reserved
+HEADER = struct.Struct("<4sHHQdIIddddII")
+SEQ = struct.Struct("<Q")
+SEQ_OFFSET = 8
+
+# gpu_id, flags, memory_used, memory_total, memory_free (MB), utilization,
+# temperature, power_draw, fp8_utilization, memory_bandwidth_utilization,
+# process_count, reserved
+GPU_RECORD = struct.Struct("<IIddddddddII")
+
+FLAG_EMERGENCY = 0x1
+GPU_PRESENT = 0x1
+GPU_LOST = 0x2
+
+
+class GPUTelemetry(NamedTuple):
+    gpu_id: int
+    flags: int
+    memory_used: float
+    memory_total: float
+    memory_free: float
+    utilization: float
+    temperature: float
+    power_draw: float
+    fp8_utilization: float
+    memory_bandwidth_utilization: float
+    process_count: int
+    reserved: int
+
+    @property
+    def lost(self) -> bool:
+        return bool(self.flags & GPU_LOST)
+
+
+class TelemetrySnapshot(NamedTuple):
+    seq: int
+    timestamp: float
+    gpu_count: int
+    active_allocations: int
+    cpu_usage: float
+    memory_usage: float
+    memory_total_gb: float
+    memory_available_gb: float
+    emergency: bool
+    gpus: List[GPUTelemetry]
+
+
+def segment_size(gpu_capacity: int) -> int:
+    return HEADER.size + GPU_RECORD.size * gpu_capacity
+
+
+def pack_snapshot(buffer, gpu_capacity: int, seq: int, gpus: Iterable, system,
+                  active_allocations: int, emergency: bool, timestamp: float) -> int:
+    """Pack a snapshot into the fixed layout; lost GPUs are passed as (gpu_id, None)"""
+    gpu_count = 0
+    for gpu_id, gpu in gpus:
+        if gpu_id >= gpu_capacity:
+            break
+        offset = HEADER.size + GPU_RECORD.size * gpu_id
+        if gpu is None:
+            GPU_RECORD.pack_into(buffer, offset, gpu_id, GPU_LOST, 0.0, 0.0, 0.0, 0.0,
+                                 0.0, 0.0, 0.0, 0.0, 0, 0)
+        else:
+            GPU_RECORD.pack_into(
+                buffer, offset, gpu_id, GPU_PRESENT,
+                gpu.memory_used, gpu.memory_total, gpu.memory_free, gpu.utilization,
+                gpu.temperature, gpu.power_draw, gpu.fp8_utilization,
+                gpu.memory_bandwidth_utilization, len(gpu.processes), 0
+            )
+        gpu_count += 1
+
+    HEADER.pack_into(
+        buffer, 0, MAGIC, LAYOUT_VERSION, gpu_capacity, seq, timestamp, gpu_count,
+        active_allocations, system.cpu_usage, system.memory_usage, system.memory_total,
+        system.memory_available, FLAG_EMERGENCY if emergency else 0, 0
+    )
+    return gpu_count
+
+
+def unpack_snapshot(buffer) -> TelemetrySnapshot:
+    """Unpack a snapshot from the fixed layout (segment or network payload)"""
+    header = HEADER.unpack_from(buffer, 0)
+    if header[0] != MAGIC or header[1] != LAYOUT_VERSION:
+        raise RuntimeError(f"Unsupported telemetry layout {header[0]!r} v{header[1]}")
+    return TelemetrySnapshot(
+        seq=header[3],
+        timestamp=header[4],
+        gpu_count=header[5],
+        active_allocations=header[6],
+        cpu_usage=header[7],
+        memory_usage=header[8],
+        memory_total_gb=header[9],
+        memory_available_gb=header[10],
+        emergency=bool(header[11] & FLAG_EMERGENCY),
+        gpus=[
+            GPUTelemetry._make(GPU_RECORD.unpack_from(buffer, HEADER.size + GPU_RECORD.size * i))
+            for i in range(header[5])
+        ]
+    )
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    segment = shared_memory.SharedMemory(name=name)
+    # Readers must not unlink the writer's segment when they exit (bpo-39959)
+    try:
+        resource_tracker.unregister(segment._name, "shared_memory")
+    except Exception:
+        pass
+    return segment
+
+
+class TelemetryWriter:
+    """Single writer publishing fleet snapshots under a seqlock"""
+
+    def __init__(self, gpu_capacity: int, name: str = DEFAULT_SEGMENT_NAME):
+        self.name = name
+        self.gpu_capacity = gpu_capacity
+        size = segment_size(gpu_capacity)
+
+        try:
+            self.segment = shared_memory.SharedMemory(name=name, create=True, size=size)
+        except FileExistsError:
+            # Stale segment from a previous run: take it over if the layout fits
+            self.segment = shared_memory.SharedMemory(name=name)
+            if self.segment.size < size:
+                self.segment.close()
+                self.segment.unlink()
+                self.segment = shared_memory.SharedMemory(name=name, create=True, size=size)
+
+        self.buffer = self.segment.buf
+        self.seq = 0
+        HEADER.pack_into(self.buffer, 0, MAGIC, LAYOUT_VERSION, gpu_capacity, self.seq,
+                         0.0, 0, 0, 0.0, 0.0, 0.0, 0.0, 0, 0)
+        logger.info(f"Telemetry segment /dev/shm/{name} ready ({size} bytes, {gpu_capacity} GPUs)")
+
+    def publish(self, gpus: Iterable, system, active_allocations: int,
+                emergency: bool = False, timestamp: Optional[float] = None) -> int:
+        """Publish one snapshot; lost GPUs are passed as (gpu_id, None)"""
+        buffer = self.buffer
+        self.seq += 1  # odd: write in progress
+        SEQ.pack_into(buffer, SEQ_OFFSET, self.seq)
+
+        pack_snapshot(buffer, self.gpu_capacity, self.seq, gpus, system, active_allocations,
+                      emergency, timestamp if timestamp is not None else time.time())
+
+        self.seq += 1  # even: snapshot consistent
+        SEQ.pack_into(buffer, SEQ_OFFSET, self.seq)
+        return self.seq
+
+    def close(self, unlink: bool = True) -> None:
+        self.buffer = None
+        self.segment.close()
+        if unlink:
+            try:
+                self.segment.unlink()
+            except FileNotFoundError:
+                pass
+
+
+class TelemetryReader:
+    """Lock-free reader of the telemetry segment
+
+    After attaching, reads are plain loads from the mapped segment: no
+    syscalls, no socket round trips and no intermediate buffer copies.
+    """
+
+    def __init__(self, name: str = DEFAULT_SEGMENT_NAME):
+        self.name = name
+        self.segment = _attach(name)
+        self.buffer = self.segment.buf
+
+        magic, version, self.gpu_capacity = HEADER.unpack_from(self.buffer, 0)[:3]
+        if magic != MAGIC or version != LAYOUT_VERSION:
+            self.close()
+            raise RuntimeError(f"Telemetry segment {name} has unsupported layout {magic!r} v{version}")
+
+    @classmethod
+    def open(cls, name: str = DEFAULT_SEGMENT_NAME) -> Optional["TelemetryReader"]:
+        """Attach if the segment exists, otherwise return None"""
+        try:
+            return cls(name)
+        except (FileNotFoundError, RuntimeError) as e:
+            logger.debug(f"Telemetry segment {name} unavailable: {e}")
+            return None
+
+    def _stable(self, read, max_spins: int = 10000):
+        buffer = self.buffer
+        for _ in range(max_spins):
+            before = SEQ.unpack_from(buffer, SEQ_OFFSET)[0]
+            if before & 1:
+                continue
+            value = read(buffer)
+            if SEQ.unpack_from(buffer, SEQ_OFFSET)[0] == before:
+                return before, value
+        raise TimeoutError(f"Telemetry segment {self.name} writer did not settle")
+
+    def read(self) -> TelemetrySnapshot:
+        """Read a consistent snapshot of the whole fleet"""
+        return self._stable(unpack_snapshot)[1]
+
+    def read_gpu(self, gpu_id: int) -> GPUTelemetry:
+        """Read a consistent record for a single GPU"""
+        if gpu_id >= self.gpu_capacity:
+            raise IndexError(f"GPU {gpu_id} outside telemetry segment capacity {self.gpu_capacity}")
+        offset = HEADER.size + GPU_RECORD.size * gpu_id
+        return self._stable(lambda buffer: GPUTelemetry._make(GPU_RECORD.unpack_from(buffer, offset)))[1]
+
+    @property
+    def seq(self) -> int:
+        return SEQ.unpack_from(self.buffer, SEQ_OFFSET)[0]
+
+    @property
+    def gpu_count(self) -> int:
+        """GPUs in the latest snapshot; 0 until the writer first publishes"""
+        return self._stable(lambda buffer: HEADER.unpack_from(buffer, 0)[5])[1]
+
+    def close(self) -> None:
+        self.buffer = None
+        self.segment.close()
+
+
+def main():
+    """Print the live telemetry segment"""
+    import argparse
+    import json
+
+    parser = argparse.ArgumentParser(description="Read the SOVREN telemetry shared memory segment")
+    parser.add_argument("--name", default=DEFAULT_SEGMENT_NAME, help="Segment name")
+    parser.add_argument("--watch", type=float, default=0, help="Repeat every N seconds")
+    args = parser.parse_args()
+
+    reader = TelemetryReader(args.name)
+    try:
+        while True:
+            snapshot = reader.read()
+            print(json.dumps({**snapshot._asdict(), 'gpus': [gpu._asdict() for gpu in snapshot.gpus]}))
+            if not args.watch:
+                break
+            time.sleep(args.watch)
+    finally:
+        reader.close()
+
+
+if __name__ == "__main__":
+    main()
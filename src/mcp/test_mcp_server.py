@@ -12,8 +12,11 @@ import requests
 import websockets
 import logging
 from typing import Dict, Any, List
+import signal
+import socket
 import subprocess
 import sys
+import tempfile
 from pathlib import Path
 
 # Configure logging
@@ -23,10 +26,13 @@ logger = logging.getLogger(__name__)
 class MCPServerTester:
     """Complete MCP server testing system"""
     
-    def __init__(self, server_url: str = "http://localhost:8000"):
+    def __init__(self, server_url: str = "http://localhost:8000",
+                 federation_agents: int = 0, coordinator: str = "127.0.0.1:8765"):
         self.server_url = server_url
         self.websocket_url = server_url.replace("http", "ws") + "/ws"
         self.test_results = []
+        self.federation_agents = federation_agents
+        self.coordinator = coordinator
         
     def log_test_result(self, test_name: str, success: bool, details: str = ""):
         """Log test result"""
@@ -134,6 +140,24 @@ class MCPServerTester:
                     )
                     
                     if status_response.status_code == 200:
+                        # Test lease validation: positive numbers of seconds only
+                        lease_statuses = (
+                            requests.post(f"{self.server_url}/allocate/{allocation_id}/renew",
+                                          json={'lease_seconds': 30}, timeout=5).status_code,
+                            requests.post(f"{self.server_url}/allocate/{allocation_id}/renew",
+                                          json={'lease_seconds': 'soon'}, timeout=5).status_code,
+                            requests.post(f"{self.server_url}/allocate",
+                                          json={**allocation_request, 'lease_seconds': -5}, timeout=5).status_code
+                        )
+                        if lease_statuses != (200, 400, 400):
+                            requests.delete(f"{self.server_url}/allocate/{allocation_id}", timeout=5)
+                            self.log_test_result(
+                                "Resource Allocation",
+                                False,
+                                f"Lease renew/invalid renew/negative lease answered {lease_statuses}"
+                            )
+                            return False
+
                         # Test deallocation
                         delete_response = requests.delete(
                             f"{self.server_url}/allocate/{allocation_id}",
@@ -337,6 +361,324 @@ class MCPServerTester:
             self.log_test_result("Emergency Detection", False, str(e))
             return False
     
+    def test_memory_estimation(self) -> bool:
+        """Test model memory estimates and memory_gb auto-fill"""
+        try:
+            response = requests.post(
+                f"{self.server_url}/estimate",
+                json={'model_type': 'Qwen2.5-72B', 'quantization': 'fp8', 'context_length': 8192},
+                timeout=10
+            )
+            if response.status_code != 200:
+                self.log_test_result("Memory Estimation", False, f"HTTP {response.status_code}")
+                return False
+            estimate = response.json()
+
+            response = requests.post(
+                f"{self.server_url}/allocate",
+                json={'component': 'test_estimated', 'gpu_ids': [0], 'model_type': 'Qwen2.5-7B', 'quantization': 'int4'},
+                timeout=10
+            )
+            if response.status_code != 200:
+                self.log_test_result("Memory Estimation", False, f"Allocation HTTP {response.status_code}")
+                return False
+            data = response.json()
+            requests.delete(f"{self.server_url}/allocate/{data['allocation_id']}", timeout=10)
+
+            # Fields of the wrong type are the client's error, not a server crash
+            malformed = [
+                requests.post(f"{self.server_url}{path}", json=body, timeout=10).status_code
+                for path, body in (('/estimate', {'model_type': 5}),
+                                   ('/estimate', {'model_type': 'Qwen2.5-72B', 'quantization': 7}),
+                                   ('/estimate', {'model_type': 'Qwen2.5-72B', 'context_length': '8k'}),
+                                   ('/allocate', {'component': 'test_malformed', 'gpu_ids': [0],
+                                                  'model_type': 'Qwen2.5-7B', 'context_length': '8k'}))
+            ]
+            if malformed != [400] * 4:
+                self.log_test_result("Memory Estimation", False, f"Malformed requests answered {malformed}")
+                return False
+
+            if data['allocation']['memory_gb'] == data['estimated_memory_gb'] and estimate['weights_gb'] > 60:
+                self.log_test_result(
+                    "Memory Estimation",
+                    True,
+                    f"72B fp8 {estimate['per_gpu_gb']:.1f}GB/GPU, 7B int4 auto-filled {data['estimated_memory_gb']}GB, "
+                    f"malformed fields rejected with 400"
+                )
+                return True
+
+            self.log_test_result("Memory Estimation", False, f"Unexpected estimate: {estimate}, {data}")
+            return False
+
+        except Exception as e:
+            self.log_test_result("Memory Estimation", False, str(e))
+            return False
+
+    def test_plan_endpoint(self) -> bool:
+        """Test dry-run planning leaves the ledger untouched"""
+        try:
+            before = len(requests.get(f"{self.server_url}/status", timeout=10).json()['allocations'])
+            plan_request = {
+                'requests': [
+                    {'component': 'plan_llm', 'gpu_count': 2, 'memory_gb': 80.0},
+                    {'component': 'plan_voice', 'gpu_ids': [0], 'memory_gb': 10.0},
+                    {'component': 'plan_oversized', 'gpu_count': 1, 'memory_gb': 1000.0}
+                ]
+            }
+            response = requests.post(f"{self.server_url}/plan", json=plan_request, timeout=10)
+            if response.status_code != 200:
+                self.log_test_result("Plan Endpoint", False, f"HTTP {response.status_code}")
+                return False
+
+            plan = response.json()
+            placements = plan['placements']
+
+            # Malformed memory amounts are the client's error, not admission inputs
+            invalid_statuses = [
+                requests.post(f"{self.server_url}/plan", json={'requests': [invalid]}, timeout=10).status_code
+                for invalid in ({'component': 'plan_text', 'gpu_ids': [0], 'memory_gb': 'lots'},
+                                {'component': 'plan_negative', 'gpu_ids': [0], 'memory_gb': -500.0},
+                                {'component': 'plan_negative_ram', 'gpu_count': 1, 'system_memory_gb': -64})
+            ]
+
+            after = len(requests.get(f"{self.server_url}/status", timeout=10).json()['allocations'])
+            if (len(placements[0]['gpu_ids']) == 2 and placements[1]['admitted']
+                    and not placements[2]['admitted'] and not plan['feasible']
+                    and any(c['index'] == 2 for c in plan['binding_constraints']) and before == after
+                    and invalid_statuses == [400, 400, 400]):
+                self.log_test_result(
+                    "Plan Endpoint",
+                    True,
+                    f"Placed on {placements[0]['gpu_ids']}, oversized request blocked by "
+                    f"{plan['binding_constraints'][0]['constraint']}, invalid memory rejected with 400"
+                )
+                return True
+
+            self.log_test_result("Plan Endpoint", False,
+                                 f"Unexpected plan: {plan}, invalid memory answered {invalid_statuses}")
+            return False
+
+        except Exception as e:
+            self.log_test_result("Plan Endpoint", False, str(e))
+            return False
+
+    def test_owner_reclamation(self) -> bool:
+        """Test that allocations are reclaimed once their owner process exits
+
+        The owner is a local child process, so the server must run on this host.
+        """
+        owner = subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(60)'])
+        try:
+            response = requests.post(
+                f"{self.server_url}/allocate",
+                json={'component': 'test_owner', 'gpu_ids': [0], 'memory_gb': 1.0, 'pids': [owner.pid]},
+                timeout=10
+            )
+            if response.status_code != 200:
+                self.log_test_result("Owner Reclamation", False, f"HTTP {response.status_code}")
+                return False
+            allocation_id = response.json()['allocation_id']
+
+            usage = requests.get(f"{self.server_url}/usage", timeout=10).json()
+            if 'components' not in usage:
+                self.log_test_result("Owner Reclamation", False, "Invalid /usage response format")
+                return False
+
+            owner.kill()
+            owner.wait()
+
+            deadline = time.time() + 10
+            while time.time() < deadline:
+                if requests.get(f"{self.server_url}/allocate/{allocation_id}", timeout=5).status_code == 404:
+                    self.log_test_result(
+                        "Owner Reclamation",
+                        True,
+                        f"Reclaimed {allocation_id} after owner PID {owner.pid} exited"
+                    )
+                    return True
+                time.sleep(0.5)
+
+            requests.delete(f"{self.server_url}/allocate/{allocation_id}", timeout=10)
+            self.log_test_result("Owner Reclamation", False, "Allocation not reclaimed within 10s")
+            return False
+
+        except Exception as e:
+            self.log_test_result("Owner Reclamation", False, str(e))
+            return False
+        finally:
+            if owner.poll() is None:
+                owner.kill()
+
+    def test_gpu_lost_allocation(self) -> bool:
+        """Test that one lost GPU leaves the others allocatable
+
+        Runs its own simulated server on this host, with GPU 1 off the bus from t=1s.
+        """
+        with socket.socket() as probe:
+            probe.bind(('127.0.0.1', 0))
+            port = probe.getsockname()[1]
+        with tempfile.NamedTemporaryFile('w', suffix='.json', delete=False) as scenario:
+            json.dump([{'kind': 'fall_off_bus', 'gpu_id': 1, 'start_s': 1}], scenario)
+        server_url = f"http://127.0.0.1:{port}"
+        server = subprocess.Popen(
+            [sys.executable, str(Path(__file__).parent / 'SOVRENMCPServer.py'),
+             '--simulate', '--sim-scenario', scenario.name, '--host', '127.0.0.1', '--port', str(port),
+             '--no-unix-socket', '--telemetry-segment', 'sovren_test_gpu_lost'],
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+        )
+        try:
+            deadline = time.time() + 30
+            lost = False
+            while not lost and time.time() < deadline:
+                time.sleep(0.5)
+                try:
+                    conditions = requests.get(f"{server_url}/status", timeout=5).json()['emergency']['conditions']
+                except requests.RequestException:
+                    continue
+                lost = any(c['type'] == 'gpu_lost' and c['gpu_id'] == 1 for c in conditions)
+            if not lost:
+                self.log_test_result("GPU Lost Allocation", False, "GPU 1 not reported lost within 30s")
+                return False
+
+            pinned = requests.post(f"{server_url}/allocate", timeout=10,
+                                   json={'component': 'test_survivor', 'gpu_ids': [0], 'memory_gb': 1.0})
+            placed = requests.post(f"{server_url}/allocate", timeout=10,
+                                   json={'component': 'test_placed', 'gpu_count': 1, 'memory_gb': 1.0})
+            on_lost = requests.post(f"{server_url}/allocate", timeout=10,
+                                    json={'component': 'test_lost', 'gpu_ids': [1], 'memory_gb': 1.0})
+            if (pinned.status_code != 200 or placed.status_code != 200
+                    or 1 in placed.json()['allocation']['gpu_ids'] or on_lost.status_code != 400):
+                self.log_test_result(
+                    "GPU Lost Allocation",
+                    False,
+                    f"GPU 0: HTTP {pinned.status_code}, placed: HTTP {placed.status_code} {placed.text[:200]}, "
+                    f"lost GPU 1: HTTP {on_lost.status_code}"
+                )
+                return False
+
+            self.log_test_result(
+                "GPU Lost Allocation",
+                True,
+                f"GPU 1 lost; allocated GPU 0 and placed on GPU {placed.json()['allocation']['gpu_ids']}, "
+                f"GPU 1 refused"
+            )
+            return True
+
+        except Exception as e:
+            self.log_test_result("GPU Lost Allocation", False, str(e))
+            return False
+        finally:
+            server.terminate()
+            server.wait()
+            Path(scenario.name).unlink()
+
+    def _spawn_agent(self, index: int) -> subprocess.Popen:
+        """Simulated node agent joining the coordinator under test"""
+        return subprocess.Popen(
+            [sys.executable, str(Path(__file__).parent / 'SOVRENMCPServer.py'),
+             '--join', self.coordinator, '--node-id', f'test-node-{index}',
+             '--simulate', '--sim-seed', str(index), '--telemetry-segment', f'sovren_test_node_{index}'],
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+        )
+
+    def _wait_for_nodes(self, predicate, timeout: float) -> Dict[str, Dict[str, Any]]:
+        deadline = time.time() + timeout
+        while True:
+            nodes = {
+                node['node_id']: node
+                for node in requests.get(f"{self.server_url}/cluster/nodes", timeout=5).json()['nodes']
+                if node['node_id'].startswith('test-node-')
+            }
+            if predicate(nodes) or time.time() > deadline:
+                return nodes
+            time.sleep(0.25)
+
+    def test_federation(self) -> bool:
+        """Test cross-node placement and node loss with local simulated agents
+
+        The server must run as a coordinator (--coordinator-port) on this host.
+        A node is frozen with SIGSTOP until its lease expires, then resumed: the
+        coordinator must have dropped its allocation, and the agent must have
+        released it too before rejoining.
+        """
+        count = self.federation_agents
+        agents = [self._spawn_agent(index) for index in range(count)]
+        allocation_ids = []
+        try:
+            nodes = self._wait_for_nodes(
+                lambda nodes: len(nodes) == count and all(node['status'] == 'up' and 'gpus' in node
+                                                          for node in nodes.values()),
+                timeout=30
+            )
+            if len(nodes) != count:
+                self.log_test_result("Federation", False, f"{len(nodes)}/{count} agents joined")
+                return False
+
+            # 120GB on all 8 GPUs fits once per 183GB node, so each lands on a different node
+            request = {'component': 'test_federation', 'gpu_count': 8, 'memory_gb': 120.0}
+            placed_on = []
+            for _ in range(count):
+                response = requests.post(f"{self.server_url}/cluster/allocate", json=request, timeout=10)
+                if response.status_code != 200:
+                    self.log_test_result("Federation", False, f"Placement HTTP {response.status_code}: {response.text}")
+                    return False
+                allocation = response.json()['allocation']
+                allocation_ids.append(allocation['allocation_id'])
+                placed_on.append(allocation['node_id'])
+            if len(set(placed_on)) != count:
+                self.log_test_result("Federation", False, f"Placements not spread across nodes: {placed_on}")
+                return False
+            if requests.post(f"{self.server_url}/cluster/allocate", json=request, timeout=10).status_code != 400:
+                self.log_test_result("Federation", False, "Over-committed cluster accepted a placement")
+                return False
+
+            frozen = placed_on[0]
+            agents[int(frozen.rsplit('-', 1)[1])].send_signal(signal.SIGSTOP)
+            nodes = self._wait_for_nodes(lambda nodes: nodes[frozen]['status'] == 'lost', timeout=30)
+            if nodes[frozen]['status'] != 'lost':
+                self.log_test_result("Federation", False, f"{frozen} not lost after its lease")
+                return False
+            if requests.get(f"{self.server_url}/cluster/allocate/{allocation_ids[0]}", timeout=5).status_code != 404:
+                self.log_test_result("Federation", False, f"{allocation_ids[0]} survived its node's lease")
+                return False
+
+            agents[int(frozen.rsplit('-', 1)[1])].send_signal(signal.SIGCONT)
+            nodes = self._wait_for_nodes(lambda nodes: nodes[frozen]['status'] == 'up', timeout=30)
+            if nodes[frozen]['status'] != 'up' or nodes[frozen]['allocations'] != 0:
+                self.log_test_result("Federation", False,
+                                     f"{frozen} rejoined as {nodes[frozen]['status']} with "
+                                     f"{nodes[frozen]['allocations']} allocations")
+                return False
+
+            # The rejoined node is empty again, so the replacement goes there
+            response = requests.post(f"{self.server_url}/cluster/allocate", json=request, timeout=10)
+            if response.status_code != 200 or response.json()['allocation']['node_id'] != frozen:
+                self.log_test_result("Federation", False, f"Re-placement failed: HTTP {response.status_code}")
+                return False
+            allocation_ids[0] = response.json()['allocation_id']
+
+            self.log_test_result(
+                "Federation",
+                True,
+                f"{count} nodes, placements spread over {sorted(set(placed_on))}, "
+                f"{frozen} lost on lease expiry and re-placed after rejoining"
+            )
+            return True
+
+        except Exception as e:
+            self.log_test_result("Federation", False, str(e))
+            return False
+        finally:
+            for allocation_id in allocation_ids:
+                try:
+                    requests.delete(f"{self.server_url}/cluster/allocate/{allocation_id}", timeout=5)
+                except Exception:
+                    pass
+            for agent in agents:
+                agent.send_signal(signal.SIGCONT)
+                agent.terminate()
+                agent.wait()
+
     async def run_comprehensive_tests(self) -> Dict[str, Any]:
         """Run all tests and return results"""
         logger.info("🧪 STARTING COMPREHENSIVE MCP SERVER TESTS")
@@ -349,7 +691,13 @@ class MCPServerTester:
             ("Safety Limits", self.test_safety_limits),
             ("GPU Monitoring", self.test_gpu_monitoring),
             ("Emergency Detection", self.test_emergency_detection),
+            ("Memory Estimation", self.test_memory_estimation),
+            ("Plan Endpoint", self.test_plan_endpoint),
+            ("Owner Reclamation", self.test_owner_reclamation),
+            ("GPU Lost Allocation", self.test_gpu_lost_allocation),
         ]
+        if self.federation_agents:
+            tests.append(("Federation", self.test_federation))
         
         # Run synchronous tests
         for test_name, test_func in tests:
@@ -403,11 +751,22 @@ async def main():
         "--output-file",
         help="Save test results to JSON file"
     )
+    parser.add_argument(
+        "--federation-agents",
+        type=int,
+        default=0,
+        help="Also test federation with this many local simulated node agents (server must run --coordinator-port)"
+    )
+    parser.add_argument(
+        "--coordinator",
+        default="127.0.0.1:8765",
+        help="Coordinator address the agents join (default: 127.0.0.1:8765)"
+    )
     
     args = parser.parse_args()
     
     # Create tester
-    tester = MCPServerTester(args.server_url)
+    tester = MCPServerTester(args.server_url, args.federation_agents, args.coordinator)
     
     # Run tests
     results = await tester.run_comprehensive_tests()
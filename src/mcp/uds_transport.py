@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+SOVREN MCP Unix Domain Socket Transport
+Compact binary framing for co-located clients: allocate, renew, release, snapshot, plan
+"""
+
+import asyncio
+import logging
+import os
+import socket
+import struct
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
+    msgpack = None
+
+from telemetry_shm import TelemetrySnapshot, unpack_snapshot
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SOCKET_PATH = "/tmp/sovren_mcp.sock"
+
+# payload_length, op, status, reserved, request_id
+FRAME = struct.Struct("<IBBHI")
+MAX_PAYLOAD_BYTES = 1 << 20
+
+OP_ALLOCATE = 1
+OP_RENEW = 2
+OP_RELEASE = 3
+OP_SNAPSHOT = 4
+OP_PLAN = 5
+
+STATUS_OK = 0
+STATUS_ERROR = 1
+
+
+class MCPTransportError(Exception):
+    """Error returned by the MCP server over the binary transport"""
+
+    def __init__(self, status_code: int, detail: str):
+        super().__init__(f"HTTP {status_code}: {detail}")
+        self.status_code = status_code
+        self.detail = detail
+
+
+def _expires_at(allocation) -> Optional[float]:
+    return allocation.expires_at.timestamp() if allocation.expires_at else None
+
+
+class UnixSocketTransport:
+    """Binary listener serving the hot MCP operations on a Unix domain socket
+
+    Payloads are msgpack maps; snapshot replies reuse the fixed telemetry
+    layout from telemetry_shm so clients decode them with unpack_snapshot.
+    """
+
+    def __init__(self, server, path: str = DEFAULT_SOCKET_PATH):
+        if not MSGPACK_AVAILABLE:
+            raise RuntimeError("msgpack not available - install with: pip install msgpack")
+        self.server = server
+        self.path = path
+        self.unix_server = None
+
+    async def start(self) -> None:
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+        self.unix_server = await asyncio.start_unix_server(self._handle_connection, path=self.path)
+        os.chmod(self.path, 0o660)
+        logger.info(f"MCP binary transport listening on unix:{self.path}")
+
+    async def stop(self) -> None:
+        if self.unix_server is not None:
+            self.unix_server.close()
+            await self.unix_server.wait_closed()
+            self.unix_server = None
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                length, op, _, _, request_id = FRAME.unpack(await reader.readexactly(FRAME.size))
+                if length > MAX_PAYLOAD_BYTES:
+                    logger.warning(f"Dropping unix socket client: {length} byte frame")
+                    break
+                payload = await reader.readexactly(length) if length else b""
+                status, body = await self._dispatch(op, payload)
+                writer.write(FRAME.pack(len(body), op, status, 0, request_id) + body)
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionResetError):
+            pass
+        finally:
+            writer.close()
+
+    async def _dispatch(self, op: int, payload: bytes) -> Tuple[int, bytes]:
+        from fastapi import HTTPException
+
+        allocator = self.server.resource_allocator
+        try:
+            if op == OP_SNAPSHOT:
+                return STATUS_OK, self.server.encode_snapshot_binary()
+
+            request = msgpack.unpackb(payload) if payload else {}
+            if not isinstance(request, dict):
+                raise HTTPException(status_code=400, detail="Payload must be a msgpack map")
+            if op == OP_ALLOCATE:
+                allocation = await allocator.allocate_resources(request)
+                return STATUS_OK, msgpack.packb({
+                    'allocation_id': allocation.allocation_id,
+                    'gpu_ids': allocation.gpu_ids,
+                    'memory_gb': allocation.memory_gb,
+                    'expires_at': _expires_at(allocation)
+                })
+            if op == OP_RENEW:
+                allocation = await allocator.renew_allocation(
+                    request['allocation_id'], request.get('lease_seconds', 30)
+                )
+                if allocation is None:
+                    raise HTTPException(status_code=404, detail='Allocation not found')
+                return STATUS_OK, msgpack.packb({
+                    'allocation_id': allocation.allocation_id,
+                    'expires_at': _expires_at(allocation)
+                })
+            if op == OP_RELEASE:
+                if not await allocator.deallocate_resources(request['allocation_id']):
+                    raise HTTPException(status_code=404, detail='Allocation not found')
+                return STATUS_OK, msgpack.packb({'allocation_id': request['allocation_id']})
+            if op == OP_PLAN:
+                return STATUS_OK, msgpack.packb(self.server.plan(request['requests']))
+
+            raise HTTPException(status_code=400, detail=f"Unknown operation {op}")
+
+        except HTTPException as e:
+            return STATUS_ERROR, msgpack.packb({'status_code': e.status_code, 'detail': str(e.detail)})
+        except KeyError as e:
+            return STATUS_ERROR, msgpack.packb({'status_code': 400, 'detail': f"Missing required field: {e}"})
+        except Exception as e:
+            logger.error(f"Unix socket operation {op} failed: {e}")
+            return STATUS_ERROR, msgpack.packb({'status_code': 500, 'detail': str(e)})
+
+
+class UnixSocketClient:
+    """Blocking client for the MCP binary transport"""
+
+    def __init__(self, path: str = DEFAULT_SOCKET_PATH, timeout: float = 5.0):
+        if not MSGPACK_AVAILABLE:
+            raise RuntimeError("msgpack not available - install with: pip install msgpack")
+        self.path = path
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(timeout)
+        self.sock.connect(path)
+        self._header = bytearray(FRAME.size)
+        self._request_id = 0
+
+    def _recv_exact(self, buffer) -> None:
+        view = memoryview(buffer)
+        while view:
+            received = self.sock.recv_into(view)
+            if not received:
+                raise ConnectionError("MCP server closed the unix socket")
+            view = view[received:]
+
+    def _call(self, op: int, body: bytes = b"") -> bytes:
+        self._request_id = (self._request_id + 1) & 0xFFFFFFFF
+        self.sock.sendall(FRAME.pack(len(body), op, 0, 0, self._request_id) + body)
+
+        self._recv_exact(self._header)
+        length, _, status, _, request_id = FRAME.unpack(self._header)
+        payload = bytearray(length)
+        self._recv_exact(payload)
+
+        if request_id != self._request_id:
+            raise ConnectionError(f"Out of order reply {request_id} (expected {self._request_id})")
+        if status != STATUS_OK:
+            error = msgpack.unpackb(payload)
+            raise MCPTransportError(error['status_code'], error['detail'])
+        return payload
+
+    def allocate(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        return msgpack.unpackb(self._call(OP_ALLOCATE, msgpack.packb(request)))
+
+    def renew(self, allocation_id: str, lease_seconds: float = 30.0) -> Dict[str, Any]:
+        return msgpack.unpackb(self._call(
+            OP_RENEW, msgpack.packb({'allocation_id': allocation_id, 'lease_seconds': lease_seconds})
+        ))
+
+    def release(self, allocation_id: str) -> Dict[str, Any]:
+        return msgpack.unpackb(self._call(OP_RELEASE, msgpack.packb({'allocation_id': allocation_id})))
+
+    def plan(self, requests: List[Dict[str, Any]]) -> Dict[str, Any]:
+        return msgpack.unpackb(self._call(OP_PLAN, msgpack.packb({'requests': requests})), strict_map_key=False)
+
+    def snapshot(self) -> TelemetrySnapshot:
+        return unpack_snapshot(self._call(OP_SNAPSHOT))
+
+    def close(self) -> None:
+        self.sock.close()
+
+    def __enter__(self) -> "UnixSocketClient":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
@@ -30,6 +30,13 @@ except ImportError as e:
     logger.error("Install with: pip install TTS torch torchaudio soundfile librosa")
     sys.exit(1)
 
+# Live GPU telemetry published by the SOVREN MCP server (optional)
+sys.path.append(str(Path(__file__).resolve().parent.parent / "mcp"))
+try:
+    from telemetry_shm import TelemetryReader
+except ImportError:
+    TelemetryReader = None
+
 class B200TTSSynthesizer:
     """
     B200 Blackwell GPU-accelerated TTS synthesizer using Coqui TTS
@@ -53,6 +60,9 @@ class B200TTSSynthesizer:
                 logger.info("🚀 B200 FP8 optimization enabled")
         
         self.tts_model = None
+        # MCP telemetry segment, attached on first use and kept for plain memory reads afterwards
+        self.telemetry_reader = None
+        self._telemetry_retry_at = 0.0
         logger.info(f"🎤 B200 TTS Synthesizer initialized on {self.device}")
     
     def load_model(self, model_name="tts_models/multilingual/multi-dataset/xtts_v2"):
@@ -173,10 +183,29 @@ class B200TTSSynthesizer:
             return {
                 'gpu_memory_used': gpu_memory,
                 'gpu_memory_cached': gpu_memory_cached,
-                'gpu_utilization': 85.0  # Estimated utilization
+                'gpu_utilization': self._read_gpu_utilization()
             }
         return {'gpu_memory_used': 0, 'gpu_memory_cached': 0, 'gpu_utilization': 0}
 
+    def _get_telemetry_reader(self):
+        """Attach to the MCP telemetry segment, retrying at most every 5 seconds"""
+        if self.telemetry_reader is None and TelemetryReader is not None and time.time() >= self._telemetry_retry_at:
+            self.telemetry_reader = TelemetryReader.open()
+            if self.telemetry_reader is None:
+                self._telemetry_retry_at = time.time() + 5.0
+        return self.telemetry_reader
+
+    def _read_gpu_utilization(self):
+        """Read live utilization from the MCP telemetry segment, None if unavailable"""
+        reader = self._get_telemetry_reader()
+        if reader is None:
+            return None
+        try:
+            record = reader.read_gpu(self.gpu_id)
+            return None if record.lost else record.utilization
+        except (IndexError, TimeoutError):
+            return None
+
 def main():
     parser = argparse.ArgumentParser(description='B200 Blackwell GPU-Accelerated TTS Synthesis')
     parser.add_argument('--text', required=True, help='Text to synthesize')
@@ -231,7 +260,9 @@ def main():
         
         # Output results
         print(f"SUCCESS: {result['synthesis_time']:.2f}s synthesis, {result['audio_duration']:.2f}s audio")
-        print(f"GPU_MEMORY: {gpu_stats['gpu_memory_used']:.2f}GB used, {gpu_stats['gpu_utilization']:.1f}% utilization")
+        utilization = gpu_stats['gpu_utilization']
+        utilization_text = f"{utilization:.1f}%" if utilization is not None else "n/a"
+        print(f"GPU_MEMORY: {gpu_stats['gpu_memory_used']:.2f}GB used, {utilization_text} utilization")
         print(f"OUTPUT: {args.output}")
         
     except Exception as e: